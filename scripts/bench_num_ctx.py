@@ -0,0 +1,138 @@
+"""Benchmark: FIXED against ADAPTIVE context sizing, on a stub Ollama server.
+
+Plays a session that grows by --turn-tokens per turn through OllamaProvider,
+against a local server that answers /api/chat and models what a real one does
+with num_ctx: it reloads the model whenever num_ctx changes (a fixed cost plus
+KV cache allocation per token of the window) and holds a KV cache for the whole
+window. The costs are set with the flags below; the defaults are in the range
+of an 8B model on a CPU-only machine, scaled down to keep the run short.
+
+    python scripts/bench_num_ctx.py [--turns N] [--turn-tokens N] [--context-window N]
+"""
+
+import argparse
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from ocla import context_size
+from ocla.config import reload_config
+from ocla.context_size import context_window
+from ocla.providers.ollama_provider import OllamaProvider
+from ocla.tools import ALL as ALL_TOOLS
+
+
+class _StubOllama:
+    def __init__(self, args):
+        self.args = args
+        self.loaded_ctx = None
+        self.reloads = 0
+        self.kv_bytes_peak = 0
+        self.kv_byte_requests = 0
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *a):
+                pass
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                stub.serve(body["options"]["num_ctx"])
+                data = (
+                    json.dumps(
+                        {
+                            "model": body["model"],
+                            "message": {"role": "assistant", "content": "ok"},
+                            "done": True,
+                        }
+                    ).encode()
+                    + b"\n"
+                )
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def serve(self, num_ctx):
+        a = self.args
+        kv_bytes = num_ctx * a.kv_bytes_per_token
+        if num_ctx != self.loaded_ctx:
+            self.reloads += 1
+            self.loaded_ctx = num_ctx
+            time.sleep(a.load_ms / 1000 + num_ctx * a.alloc_us_per_token / 1e6)
+        self.kv_bytes_peak = max(self.kv_bytes_peak, kv_bytes)
+        self.kv_byte_requests += kv_bytes
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def _run(mode, args):
+    stub = _StubOllama(args)
+    os.environ.update(
+        OCLA_OLLAMA_HOST=stub.url,
+        OCLA_CONTEXT_SIZING=mode,
+        OCLA_CONTEXT_WINDOW=str(args.context_window),
+    )
+    reload_config()
+    context_size._chosen.clear()
+    provider = OllamaProvider()
+    tools = list(ALL_TOOLS.values())
+    messages = [{"role": "user", "content": "hi"}]
+    sizes = []
+
+    start = time.perf_counter()
+    for turn in range(1, args.turns + 1):
+        num_ctx = context_window("bench", turn * args.turn_tokens, tools)
+        sizes.append(num_ctx)
+        for _ in provider.chat(messages, tools, False, "bench", num_ctx):
+            pass
+    elapsed = time.perf_counter() - start
+    stub.close()
+    return {
+        "elapsed": elapsed,
+        "reloads": stub.reloads,
+        "peak_mb": stub.kv_bytes_peak / 2**20,
+        "avg_mb": stub.kv_byte_requests / args.turns / 2**20,
+        "sizes": sorted(set(sizes)),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--turns", type=int, default=40)
+    parser.add_argument("--turn-tokens", type=int, default=300)
+    parser.add_argument("--context-window", type=int, default=16384)
+    parser.add_argument("--load-ms", type=float, default=50)
+    parser.add_argument("--alloc-us-per-token", type=float, default=5)
+    # 8B model with grouped-query attention, f16 cache: 32 layers * 2 * 8 * 128 * 2 bytes.
+    parser.add_argument("--kv-bytes-per-token", type=int, default=131072)
+    args = parser.parse_args()
+
+    print(
+        f"{args.turns} turns, +{args.turn_tokens} tokens each, "
+        f"CONTEXT_WINDOW {args.context_window}"
+    )
+    results = {mode: _run(mode, args) for mode in ("FIXED", "ADAPTIVE")}
+    for mode, r in results.items():
+        print(
+            f"  {mode:<8}  {r['elapsed']:.2f}s  {r['reloads']} reloads  "
+            f"KV cache peak {r['peak_mb']:.0f} MiB, mean {r['avg_mb']:.0f} MiB/request  "
+            f"num_ctx {r['sizes']}"
+        )
+    fixed, adaptive = results["FIXED"], results["ADAPTIVE"]
+    print(
+        f"  mean KV cache per request: {adaptive['avg_mb'] / fixed['avg_mb']:.0%} of FIXED"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Microbenchmark: PathPolicy against a plain resolve() per path.
+
+Builds a throwaway tree, then checks the same 100k relative paths with both.
+
+    python scripts/bench_path_policy.py [--paths N]
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from ocla.path_policy import PathPolicy
+
+
+def _uncached(path) -> bool:
+    # What can_access_path did before PathPolicy.
+    cwd = Path.cwd().resolve()
+    try:
+        original = Path(path).expanduser()
+        resolved = (original if original.is_absolute() else cwd / original).resolve()
+    except OSError:
+        return False
+    if cwd not in resolved.parents and resolved != cwd:
+        return False
+    return not any(p.startswith(".") and p not in (".", "..") for p in original.parts)
+
+
+def _build_tree(root: Path, rng: random.Random) -> list[str]:
+    files = []
+    for d in range(50):
+        directory = root / f"pkg{d}" / "src" / f"mod{d % 7}"
+        directory.mkdir(parents=True)
+        for f in range(20):
+            (directory / f"file{f}.py").write_text("")
+            files.append(f"pkg{d}/src/mod{d % 7}/file{f}.py")
+    (root / "link").symlink_to(root / "pkg0", target_is_directory=True)
+    files += [f"link/src/mod0/file{f}.py" for f in range(20)]
+    return files
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--paths", type=int, default=100_000)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        files = _build_tree(Path(tmp), rng)
+        paths = [rng.choice(files) for _ in range(args.paths)]
+
+        start = time.perf_counter()
+        expected = [_uncached(p) for p in paths]
+        uncached = time.perf_counter() - start
+
+        policy = PathPolicy(tmp)
+        start = time.perf_counter()
+        actual = [policy.allows(p) for p in paths]
+        cached = time.perf_counter() - start
+
+    assert actual == expected, "verdicts differ"
+    print(f"{args.paths} paths")
+    print(
+        f"  resolve() per path: {uncached:.3f}s ({uncached / args.paths * 1e6:.1f}us/path)"
+    )
+    print(
+        f"  PathPolicy:         {cached:.3f}s ({cached / args.paths * 1e6:.1f}us/path)"
+    )
+    print(f"  speedup:            {uncached / cached:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""Benchmark: time to first token of the first prompt, without and with prefetching.
+
+Runs `ocla` against a stub Ollama server, with the prompt typed at the prompt
+input, and measures from the moment it is entered to the first token printed.
+"Before" has PREFETCH and WARM_UP disabled; "after" has both enabled. The user
+takes --typing seconds to type the prompt.
+
+The stub models what the first prompt waits for: a connection handshake
+(--handshake-ms, as for TLS to a remote host), a /api/show lookup (--show-ms)
+and the model load on the first chat (--load-ms). Each run starts cold, with
+a fresh workspace and cache, and a session of --session-messages messages.
+
+    python scripts/bench_ttft.py [--runs N] [--typing S] [--load-ms MS]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import StringIO
+
+import ocla.cli
+import ocla.providers
+from ocla import context_size
+from ocla.config import reload_config
+from ocla.session import Session, _get_token_encoder, set_current_session_name
+
+
+class _StubOllama:
+    def __init__(self, args):
+        self.loaded = False
+        load_lock = threading.Lock()
+
+        def load():
+            with load_lock:
+                if not self.loaded:
+                    time.sleep(args.load_ms / 1000)
+                    self.loaded = True
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *a):
+                pass
+
+            def setup(self):
+                super().setup()
+                time.sleep(args.handshake_ms / 1000)  # once per connection
+
+            def _send(self, reply):
+                data = json.dumps(reply).encode() + b"\n"
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                self._send({"models": []})
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                if self.path == "/api/show":
+                    time.sleep(args.show_ms / 1000)
+                    self._send({"model_info": {"num_ctx": 32768}, "capabilities": []})
+                    return
+                load()
+                if self.path == "/api/generate":
+                    self._send({"model": body["model"], "response": "", "done": True})
+                else:
+                    message = {"role": "assistant", "content": "ok"}
+                    self._send(
+                        {"model": body["model"], "message": message, "done": True}
+                    )
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def _run(prefetch, args):
+    stub = _StubOllama(args)
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        mode = "ENABLED" if prefetch else "DISABLED"
+        os.environ.update(
+            OCLA_OLLAMA_HOST=stub.url,
+            OCLA_MODEL="bench",
+            OCLA_CACHE_DIR=os.path.join(tmp, "cache"),
+            OCLA_DISABLE_INIT_CHECK="1",
+            OCLA_PROMPT_MODE="ONESHOT",
+            OCLA_PREFETCH=mode,
+            OCLA_WARM_UP=mode,
+        )
+        reload_config()
+        session = Session("bench")
+        for i in range(args.session_messages // 2):
+            session.messages += [
+                {"role": "user", "content": f"question {i} " * 5},
+                {"role": "assistant", "content": f"answer {i} " * 15},
+            ]
+        session.save()
+        set_current_session_name("bench")
+
+        # Start cold: nothing loaded, looked up or connected yet.
+        ocla.providers._INSTANCES.clear()
+        _get_token_encoder.cache_clear()
+        context_size._chosen.clear()
+
+        times = {}
+
+        def prompt(message):
+            time.sleep(args.typing)
+            times["entered"] = time.perf_counter()
+            return "hello"
+
+        def output(text, thinking=False, end="\n"):
+            times.setdefault("first_token", time.perf_counter())
+
+        ocla.cli.interactive_prompt = prompt
+        ocla.cli.agent_output = output
+        sys.stdin = StringIO("")
+        ocla.cli.main([])
+        os.chdir("/")
+    stub.close()
+    return times["first_token"] - times["entered"]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--typing", type=float, default=2.0)
+    parser.add_argument("--handshake-ms", type=float, default=150)
+    parser.add_argument("--show-ms", type=float, default=100)
+    parser.add_argument("--load-ms", type=float, default=1500)
+    parser.add_argument("--session-messages", type=int, default=400)
+    args = parser.parse_args()
+
+    results = {False: [], True: []}
+    for _ in range(args.runs):
+        for prefetch in (False, True):
+            results[prefetch].append(_run(prefetch, args))
+
+    print(
+        f"{args.runs} runs, {args.typing:.1f}s typing, load {args.load_ms:.0f}ms, "
+        f"handshake {args.handshake_ms:.0f}ms, /api/show {args.show_ms:.0f}ms, "
+        f"{args.session_messages}-message session"
+    )
+    before, after = (statistics.median(results[p]) for p in (False, True))
+    print(f"  time to first token, prefetch off: {before * 1000:.0f}ms (median)")
+    print(f"  time to first token, prefetch on:  {after * 1000:.0f}ms (median)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,26 @@
 """Ocla - Ollama coding agent"""
 
-__all__ = ["Session", "do_chat"]
+import importlib
 
-from .session import Session
-from .cli import do_chat
-from .tools import *
-from .state import State, load_state, save_state
+__all__ = ["Session", "do_chat", "ado_chat"]
+
+# Imported on first access, so that importing a light submodule (as the
+# `ocla` command does before handing over to `ocla serve`) doesn't load the
+# whole agent.
+_EXPORTS = {
+    "Session": ".session",
+    "do_chat": ".cli",
+    "ado_chat": ".cli",
+    "State": ".state",
+    "load_state": ".state",
+    "save_state": ".state",
+    "ALL": ".tools",
+    "Tool": ".tools",
+    "ToolSecurity": ".tools",
+}
+
+
+def __getattr__(name: str):
+    if name in _EXPORTS:
+        return getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
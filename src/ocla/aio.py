@@ -0,0 +1,54 @@
+"""Bridge between ocla's synchronous entry points and its asyncio internals.
+
+Coroutines run on a single background event loop shared by the whole process,
+so async HTTP clients (and their pooled connections) survive across calls made
+from synchronous code.
+"""
+
+import asyncio
+import threading
+from typing import AsyncIterator, Awaitable, Iterator, Optional, TypeVar
+
+T = TypeVar("T")
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_thread: Optional[threading.Thread] = None
+_lock = threading.Lock()
+
+
+def background_loop() -> asyncio.AbstractEventLoop:
+    """The shared event loop, started on first use."""
+    global _loop, _loop_thread
+    with _lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            _loop_thread = threading.Thread(
+                target=_loop.run_forever, name="ocla-asyncio", daemon=True
+            )
+            _loop_thread.start()
+        return _loop
+
+
+async def _await(awaitable: Awaitable[T]) -> T:
+    return await awaitable
+
+
+def run_sync(awaitable: Awaitable[T]) -> T:
+    """Run *awaitable* on the shared loop and block until it completes."""
+    if threading.current_thread() is _loop_thread:
+        raise RuntimeError("run_sync() called from the ocla event loop; await instead")
+    future = asyncio.run_coroutine_threadsafe(_await(awaitable), background_loop())
+    return future.result()
+
+
+def iterate_sync(agen: AsyncIterator[T]) -> Iterator[T]:
+    """Consume an async iterator from synchronous code."""
+    try:
+        while True:
+            try:
+                yield run_sync(agen.__anext__())
+            except StopAsyncIteration:
+                return
+    finally:
+        if hasattr(agen, "aclose"):
+            run_sync(agen.aclose())
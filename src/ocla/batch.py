@@ -0,0 +1,210 @@
+"""`ocla batch`: run many prompts, each in its own session and working directory.
+
+Jobs are read from a JSONL file, one object per line:
+
+    {"prompt": "...", "session": "name", "model": "qwen3", "workdir": "path"}
+
+Only "prompt" is required. A job without a session gets a new one of its own;
+"workdir" defaults to the current directory and "model" to the configured
+model. Each job runs `do_chat` in a worker process, exactly as a ONESHOT
+`ocla` run in that directory would, so sessions are stored as usual and can be
+continued later. Jobs for the same session run one after another, in file
+order; others run concurrently, at most BATCH_CONCURRENCY at a time per
+provider.
+
+A result is written to stdout as a JSON line as soon as each job finishes:
+
+    {"job": 1, "session": "...", "workdir": "...", "model": "...",
+     "ok": true, "reply": "...", "waited": 0.0, "elapsed": 1.2,
+     "tokens": 1520, "tokens_added": 310}
+
+"job" is the job's line number; a failed job has "error" instead of "reply".
+Jobs have no one to ask for tool permissions, so tools that need permission
+are refused unless TOOL_PERMISSION_MODE allows them.
+"""
+
+from __future__ import annotations
+
+import atexit
+import dataclasses
+import io
+import json
+import multiprocessing
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, TextIO
+
+from ocla.config import (
+    BATCH_CONCURRENCY,
+    CONFIG_FILE,
+    MODEL,
+    PROVIDER,
+    reload_config,
+    resolve_config,
+)
+
+
+class BatchFileError(ValueError):
+    pass
+
+
+@dataclasses.dataclass
+class Job:
+    # Line number in the jobs file.
+    index: int
+    prompt: str
+    session: str
+    workdir: str
+    model: Optional[str] = None
+
+
+def read_jobs(lines: Sequence[str], batch_name: str) -> List[Job]:
+    """Parse JSONL *lines* into jobs, naming sessions for jobs without one."""
+    jobs = []
+    for index, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        try:
+            data = json.loads(line)
+        except ValueError as e:
+            raise BatchFileError(f"line {index}: not valid JSON: {e}")
+        if not isinstance(data, dict) or not isinstance(data.get("prompt"), str):
+            raise BatchFileError(f'line {index}: expected an object with a "prompt"')
+        jobs.append(
+            Job(
+                index=index,
+                prompt=data["prompt"],
+                session=str(data.get("session") or f"{batch_name}-{index}"),
+                workdir=os.path.abspath(str(data.get("workdir") or ".")),
+                model=data.get("model") or None,
+            )
+        )
+    return jobs
+
+
+def _job_environ(job: Job, argv: Sequence[str]) -> Dict[str, str]:
+    environ = dict(os.environ)
+    if job.model:
+        environ[MODEL.env] = job.model
+    # A relative config file is relative to the job's directory.
+    config_file = resolve_config(argv, environ).values[CONFIG_FILE.name]
+    if config_file and not os.path.isabs(config_file):
+        environ[CONFIG_FILE.env] = os.path.join(job.workdir, config_file)
+    return environ
+
+
+def _run_job(job: Job, argv: Sequence[str], environ: Dict[str, str]) -> Dict[str, Any]:
+    """Run *job* in this (worker) process and describe the outcome."""
+    from ocla import cli, cli_io
+    from ocla.session import ContextWindowExceededError, Session
+
+    os.chdir(job.workdir)
+    os.environ.clear()
+    os.environ.update(environ)
+    reload_config(argv, environ)
+
+    result: Dict[str, Any] = {"model": MODEL.get()}
+    session = None
+    # Console output is dropped and nobody answers permission prompts.
+    with cli_io.remote_terminal(
+        io.StringIO(), lambda prompt: None, terminal=False, width=None
+    ):
+        try:
+            session = Session(job.session)
+            before = session.tokens
+            result["reply"] = cli.do_chat(session, job.prompt)
+            result["ok"] = True
+        except ContextWindowExceededError as e:
+            result.update(ok=False, error=e.exceeds_message)
+        except Exception as e:
+            result.update(ok=False, error=f"{type(e).__name__}: {e}")
+    if session is not None:
+        result["tokens"] = session.tokens
+        result["tokens_added"] = session.tokens - before
+    return result
+
+
+class _Runner:
+    def __init__(self, jobs: List[Job], argv: Sequence[str], out: TextIO) -> None:
+        self.argv = list(argv)
+        self.out = out
+        self.failed = 0
+        self._out_lock = threading.Lock()
+
+        limit = int(BATCH_CONCURRENCY.get())
+        self.environ = {job.index: _job_environ(job, self.argv) for job in jobs}
+        self.provider = {
+            job.index: resolve_config(self.argv, self.environ[job.index]).values[
+                PROVIDER.name
+            ]
+            for job in jobs
+        }
+        self.limits = {
+            p: threading.BoundedSemaphore(limit) for p in self.provider.values()
+        }
+        self.pool = ProcessPoolExecutor(
+            max_workers=max(1, min(len(jobs), limit * len(self.limits))),
+            # The caller may have an event loop thread running; don't fork.
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+
+    def run_chain(self, chain: List[Job]) -> None:
+        """Run jobs that share a session, one at a time."""
+        for job in chain:
+            queued = time.monotonic()
+            with self.limits[self.provider[job.index]]:
+                waited = time.monotonic() - queued
+                started = time.monotonic()
+                try:
+                    outcome = self.pool.submit(
+                        _run_job, job, self.argv, self.environ[job.index]
+                    ).result()
+                except Exception as e:  # the worker process died
+                    outcome = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+                elapsed = time.monotonic() - started
+            self.emit(job, outcome, waited, elapsed)
+
+    def emit(
+        self, job: Job, outcome: Dict[str, Any], waited: float, elapsed: float
+    ) -> None:
+        result = {
+            "job": job.index,
+            "session": job.session,
+            "workdir": job.workdir,
+            "model": job.model,
+            **outcome,
+            "waited": round(waited, 3),
+            "elapsed": round(elapsed, 3),
+        }
+        with self._out_lock:
+            if not result.get("ok"):
+                self.failed += 1
+            self.out.write(json.dumps(result) + "\n")
+            self.out.flush()
+
+
+def run_batch(
+    jobs: List[Job], argv: Sequence[str], out: Optional[TextIO] = None
+) -> int:
+    """Run *jobs*, writing a JSON line per result to *out*; return how many failed."""
+    if not jobs:
+        return 0
+    runner = _Runner(jobs, argv, out or sys.stdout)
+    chains: Dict[tuple[str, str], List[Job]] = {}
+    for job in jobs:
+        chains.setdefault((job.workdir, job.session), []).append(job)
+
+    stop = atexit.register(runner.pool.shutdown, wait=False, cancel_futures=True)
+    try:
+        with ThreadPoolExecutor(max_workers=len(chains)) as threads:
+            for future in [
+                threads.submit(runner.run_chain, c) for c in chains.values()
+            ]:
+                future.result()
+    finally:
+        atexit.unregister(stop)
+        runner.pool.shutdown(cancel_futures=True)
+    return runner.failed
@@ -0,0 +1,73 @@
+"""Small on-disk JSON cache for results of slow provider calls.
+
+Entries are grouped into one file per namespace under CACHE_DIR and expire
+after a caller-supplied TTL. The cache is best effort: unreadable or unwritable
+files are treated as empty.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Optional
+
+from .config import CACHE_DIR
+
+# Serializes read-modify-write of cache files between threads.
+_lock = threading.Lock()
+
+
+def _path(namespace: str) -> str:
+    return os.path.join(CACHE_DIR.get(), f"{namespace}.json")
+
+
+def _load(namespace: str) -> dict[str, Any]:
+    try:
+        with open(_path(namespace), "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return data if isinstance(data, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+def _store(namespace: str, data: dict[str, Any]) -> None:
+    path = _path(namespace)
+    try:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logging.debug(f"could not write cache {path}: {e}")
+
+
+def cache_get(namespace: str, key: str, ttl: float) -> Optional[Any]:
+    """Return the value cached under *key* if it is younger than *ttl* seconds."""
+    if ttl <= 0:
+        return None
+
+    entry = _load(namespace).get(key)
+    if not isinstance(entry, dict):
+        return None
+
+    age = time.time() - entry.get("stored_at", 0)
+    if age < 0 or age > ttl:
+        return None
+
+    return entry.get("value")
+
+
+def cache_put(namespace: str, key: str, value: Any) -> None:
+    with _lock:
+        data = _load(namespace)
+        data[key] = {"stored_at": time.time(), "value": value}
+        _store(namespace, data)
+
+
+def cache_delete(namespace: str, key: str) -> None:
+    with _lock:
+        data = _load(namespace)
+        if data.pop(key, None) is not None:
+            _store(namespace, data)
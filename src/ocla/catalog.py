@@ -0,0 +1,162 @@
+"""SQLite index of the sessions in SESSION_DIR.
+
+The catalog mirrors the `.meta` file of every session so that listing and
+existence checks do not need to open each one. It is maintained by
+`Session.save`, and can always be rebuilt from the `.meta` files.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from .config import SESSION_DIR
+
+CATALOG_FILE_NAME = "catalog.sqlite3"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    name TEXT PRIMARY KEY,
+    created TEXT NOT NULL,
+    used TEXT NOT NULL,
+    used_ts REAL NOT NULL,
+    tokens INTEGER NOT NULL DEFAULT 0,
+    provider TEXT
+);
+CREATE INDEX IF NOT EXISTS sessions_used ON sessions (used_ts DESC);
+"""
+
+_local = threading.local()
+
+
+def catalog_path() -> str:
+    return os.path.join(SESSION_DIR.get(), CATALOG_FILE_NAME)
+
+
+def _timestamp(iso: str) -> float:
+    return datetime.fromisoformat(iso.replace("Z", "+00:00")).timestamp()
+
+
+def _connect() -> sqlite3.Connection:
+    """Return this thread's connection to the catalog, building it if new."""
+    # Absolute, since `ocla serve` changes directory between commands.
+    path = os.path.abspath(catalog_path())
+    conns = getattr(_local, "conns", None)
+    if conns is None:
+        conns = _local.conns = {}
+
+    conn = conns.get(path)
+    if conn is not None and os.path.exists(path):
+        return conn
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    is_new = not os.path.exists(path)
+    conn = sqlite3.connect(path, timeout=10)
+    conn.row_factory = sqlite3.Row
+    # The catalog can always be rebuilt, so trade durability for write speed.
+    conn.execute("PRAGMA synchronous=OFF")
+    conn.executescript(_SCHEMA)
+    conns[path] = conn
+
+    if is_new:
+        rebuild(conn)
+
+    return conn
+
+
+def _upsert(conn: sqlite3.Connection, name: str, meta: Dict[str, Any]) -> None:
+    conn.execute(
+        """
+        INSERT INTO sessions (name, created, used, used_ts, tokens, provider)
+        VALUES (?, ?, ?, ?, ?, ?)
+        ON CONFLICT (name) DO UPDATE SET
+            created = excluded.created,
+            used = excluded.used,
+            used_ts = excluded.used_ts,
+            tokens = excluded.tokens,
+            provider = excluded.provider
+        """,
+        (
+            name,
+            meta["created"],
+            meta["used"],
+            _timestamp(meta["used"]),
+            int(meta.get("tokens", 0)),
+            meta.get("provider"),
+        ),
+    )
+
+
+def record(name: str, meta: Dict[str, Any]) -> None:
+    """Insert or update the catalog entry for session *name*."""
+    try:
+        conn = _connect()
+        with conn:
+            _upsert(conn, name, meta)
+    except sqlite3.Error as e:
+        # The catalog is only an index; never fail a save because of it.
+        logging.warning(f"Failed to update session catalog: {e}")
+
+
+def get(name: str) -> Optional[sqlite3.Row]:
+    """The catalog entry for session *name*; None if there is none or it can't be read."""
+    try:
+        return (
+            _connect()
+            .execute("SELECT * FROM sessions WHERE name = ?", (name,))
+            .fetchone()
+        )
+    except sqlite3.Error as e:
+        logging.warning(f"Failed to read session catalog: {e}")
+        return None
+
+
+def forget(name: str) -> None:
+    """Drop the catalog entry for session *name*, if any."""
+    try:
+        conn = _connect()
+        with conn:
+            conn.execute("DELETE FROM sessions WHERE name = ?", (name,))
+    except sqlite3.Error as e:
+        logging.warning(f"Failed to update session catalog: {e}")
+
+
+def rows(limit: Optional[int] = None, offset: int = 0) -> List[sqlite3.Row]:
+    """Catalog entries, most recently used first."""
+    return (
+        _connect()
+        .execute(
+            "SELECT * FROM sessions ORDER BY used_ts DESC, name LIMIT ? OFFSET ?",
+            (-1 if limit is None else limit, offset),
+        )
+        .fetchall()
+    )
+
+
+def count() -> int:
+    return _connect().execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+
+
+def rebuild(conn: Optional[sqlite3.Connection] = None) -> int:
+    """Recreate the catalog from the `.meta` files in SESSION_DIR."""
+    conn = conn or _connect()
+    session_dir = SESSION_DIR.get() or "."
+    indexed = 0
+
+    with conn:
+        conn.execute("DELETE FROM sessions")
+        for f in os.listdir(session_dir):
+            if not f.endswith(".meta"):
+                continue
+            try:
+                with open(os.path.join(session_dir, f), "r", encoding="utf-8") as fp:
+                    meta = json.load(fp)
+                _upsert(conn, f.removesuffix(".meta"), meta)
+                indexed += 1
+            except (OSError, ValueError, KeyError) as e:
+                logging.warning(f"Skipping unreadable session metadata {f}: {e}")
+
+    return indexed
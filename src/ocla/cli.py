@@ -1,51 +1,71 @@
 import argparse
+import asyncio
 import os
 
-import humanize
 from datetime import datetime
 
 from typing import Any, Dict
 
-from tzlocal import get_localzone
-
-from rich.table import Table
-
 import logging
 import logging.config
 
+from ocla.aio import background_loop, run_sync
 from ocla.util import format_tool_arguments
 from ocla.cli_io import info, console, agent_output, error, interactive_prompt
 from ocla.config import (
+    CONTEXT_SIZING,
     CONTEXT_WINDOW,
     MODEL,
     LOG_LEVEL,
     CONFIG_VARS,
+    DAEMON_SOCKET,
+    SESSION_DIR,
     add_cli_args,
+    config_snapshot,
+    reload_config,
     TOOL_PERMISSION_MODE,
     THINKING,
     THINKING_DISABLED,
     THINKING_ENABLED,
     TOOL_PERMISSION_MODE_DEFAULT,
     TOOL_PERMISSION_MODE_ALWAYS_ALLOW,
+    TOOL_PERMISSION_MODE_ALWAYS_ASK,
+    TOOL_CONCURRENCY,
+    PRUNE_TOOL_RESULTS_AFTER,
     PROMPT_MODE,
+    INIT_CHECK_TTL,
+    WARM_UP,
+    PREFETCH,
 )
-from ocla.providers import get_provider, ModelInfo
+from ocla.cache import cache_get, cache_put
+from ocla.compaction import compact_session, high_water_mark, needs_compaction
+from ocla.context_size import context_window
+from ocla.pruning import prune_history
+from ocla.providers import get_provider, ModelInfo, transport
+from ocla.read_cache import session_cache
 from ocla.session import (
     Session,
     list_sessions,
+    count_sessions,
+    reindex_sessions,
     set_current_session_name,
     get_current_session_name,
     generate_session_name,
     session_exists,
     ContextWindowExceededError,
     load_session_meta, ProviderMismatchError,
+    _get_token_encoder,
 )
+from ocla.symbols import update_index
 from ocla.tools import ALL as ALL_TOOLS, ToolSecurity, Tool
+from ocla.tool_scheduler import run_tool_calls
 
 _LOG_LEVEL = LOG_LEVEL.get()
 
 import signal
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 
 # No python stacktrace.
@@ -95,9 +115,6 @@ if LOG_LEVEL.is_valid():
     )
 
 
-provider = get_provider()
-
-
 def execute_tool(call: Dict[str, Any]) -> str:
     fn = call.get("function", {}).get("name")
     entry = ALL_TOOLS.get(fn)
@@ -166,68 +183,159 @@ def _confirm_tool(call: Dict[str, Any]) -> bool:
     return False
 
 
+def _runs_unattended(call: Dict[str, Any]) -> bool:
+    """True if *call* is side-effect free and won't prompt the user."""
+    tool = ALL_TOOLS.get(call.get("function", {}).get("name"))
+    return (
+        tool is not None
+        and tool.security == ToolSecurity.PERMISSIBLE
+        and TOOL_PERMISSION_MODE.get() != TOOL_PERMISSION_MODE_ALWAYS_ASK
+    )
+
+
 def _current_model_info() -> ModelInfo:
-    return provider.model_info(MODEL.get())
+    return get_provider().model_info(MODEL.get())
 
 
-def _chat_stream(messages, tools: list[Tool]) -> tuple[str, Dict[str, Any]]:
-    full_content: str = ""
-    full_thinking: str = ""
-    tool_calls: list[Dict[str, Any]] = []  # gather all tool calls
-    last_role: str | None = None  # keep whatever role we see last
+class _StreamAccumulator:
+    """Collects streamed chunks into one assistant message, echoing them as they arrive."""
 
-    thinking_mode = THINKING.get()
-    enable_think = thinking_mode != THINKING_DISABLED and _current_model_info().supports_thinking
-    show_thinking = thinking_mode == THINKING_ENABLED
-    num_ctx = int(CONTEXT_WINDOW.get()) if CONTEXT_WINDOW.get() else None
+    def __init__(self, show_thinking: bool) -> None:
+        self.show_thinking = show_thinking
+        self.full_content: str = ""
+        self.full_thinking: str = ""
+        self.tool_calls: list[Dict[str, Any]] = []  # gather all tool calls
+        self.last_role: str | None = None  # keep whatever role we see last
 
-    for chunk in provider.chat(messages=messages, tools=tools, thinking=enable_think, model=MODEL.get(), context_window=num_ctx):
+    def feed(self, chunk) -> None:
         msg = chunk.get("message", {})
         if hasattr(msg, "model_dump"):
             msg = msg.model_dump(mode="python", by_alias=True)
-        last_role = msg.get("role", last_role)
+        self.last_role = msg.get("role", self.last_role)
 
         if part := msg.get("content"):
-            full_content += part
+            self.full_content += part
             agent_output(part, thinking=False, end="")
 
         if part := msg.get("thinking"):
-            full_thinking += part
-            if show_thinking:
+            self.full_thinking += part
+            if self.show_thinking:
                 agent_output(part, thinking=True, end="")
 
         if msg.get("tool_calls"):
             for tc in msg["tool_calls"]:
                 if hasattr(tc, "model_dump"):
-                    tool_calls.append(tc.model_dump(mode="python", by_alias=True))
+                    self.tool_calls.append(tc.model_dump(mode="python", by_alias=True))
                 else:
-                    tool_calls.append(tc)
+                    self.tool_calls.append(tc)
+
+    def result(self) -> tuple[str, Dict[str, Any]]:
+        assistant_msg: Dict[str, Any] = {
+            "role": self.last_role or "assistant",
+            "content": self.full_content,
+        }
+        if self.full_thinking:
+            assistant_msg["thinking"] = self.full_thinking
+        if self.tool_calls:
+            assistant_msg["tool_calls"] = self.tool_calls
 
-    assistant_msg: Dict[str, Any] = {
-        "role": last_role or "assistant",
-        "content": full_content,
-    }
-    if full_thinking:
-        assistant_msg["thinking"] = full_thinking
-    if tool_calls:
-        assistant_msg["tool_calls"] = tool_calls
+        return self.full_content, assistant_msg
 
-    return full_content, assistant_msg
 
+def _num_ctx(message_tokens: int, tools: list[Tool]) -> int | None:
+    return (
+        context_window(MODEL.get(), message_tokens, tools)
+        if CONTEXT_WINDOW.get()
+        else None
+    )
 
-def do_chat(session: Session, prompt: str) -> str:
-    session.add({"role": "user", "content": prompt})
-    model = MODEL.get()
+
+def _chat_options(message_tokens: int, tools: list[Tool]) -> Dict[str, Any]:
+    thinking_mode = THINKING.get()
+    enable_think = (
+        thinking_mode != THINKING_DISABLED and _current_model_info().supports_thinking
+    )
+    num_ctx = _num_ctx(message_tokens, tools)
+
+    return {"thinking": enable_think, "model": MODEL.get(), "context_window": num_ctx}
+
+
+async def _achat_stream(
+    messages, message_tokens: int, tools: list[Tool], prompted: float | None = None
+) -> tuple[str, Dict[str, Any]]:
+    """Stream the model's reply to *messages*.
+
+    *prompted* is the time.monotonic() the prompt was entered at, if this is
+    the first reply to it; the time to its first token is logged.
+    """
+    # Model info may need a network round trip; keep it off the event loop.
+    options = await asyncio.to_thread(_chat_options, message_tokens, tools)
+    stream = _StreamAccumulator(show_thinking=THINKING.get() == THINKING_ENABLED)
+
+    async for chunk in get_provider().achat(messages=messages, tools=tools, **options):
+        if prompted is not None:
+            logging.debug(f"Time to first token: {time.monotonic() - prompted:.3f}s")
+            prompted = None
+        stream.feed(chunk)
+
+    return stream.result()
+
+
+async def _compact(session: Session) -> bool:
+    result = await compact_session(session, get_provider(), MODEL.get())
+    if result is None:
+        return False
+
+    info(
+        f"Compacted {result.messages} earlier messages into a summary "
+        f"({result.tokens_before} → {result.tokens_after} tokens)"
+    )
+    return True
+
+
+async def _add_message(session: Session, message: Dict[str, Any]) -> None:
+    """Append *message* to the session, compacting it rather than overflowing."""
+    try:
+        session.add(message)
+    except ContextWindowExceededError:
+        if high_water_mark() is None or not await _compact(session):
+            raise
+        if session.token_count() > int(CONTEXT_WINDOW.get()):
+            raise
+
+
+def _retried() -> int:
+    return sum(s.retries + s.restarts for s in transport.stats().values())
+
+
+async def ado_chat(session: Session, prompt: str) -> str:
+    """Run one prompt through the model, executing tool calls until it is done."""
+    prompted = time.monotonic()
+    await _add_message(session, {"role": "user", "content": prompt})
 
     accumulated_text: list[str] = []
+    retried_before = _retried()
 
     while True:
         # --- 1️⃣  ask the model ------------------------------------------
-        content, msg = _chat_stream(
+        if needs_compaction(session):
+            await _compact(session)
+
+        # Only the copy sent to the model is pruned; the session keeps it all.
+        history = prune_history(
             session.messages,
-            tools=ALL_TOOLS.values(),
+            session.message_tokens,
+            int(PRUNE_TOOL_RESULTS_AFTER.get()),
+            MODEL.get(),
+        )
+        content, msg = await _achat_stream(
+            history.messages,
+            session.tokens - history.tokens_saved,
+            tools=list(ALL_TOOLS.values()),
+            prompted=prompted,
         )
-        session.add(msg)
+        prompted = None
+        await _add_message(session, msg)
         if content:
             accumulated_text.append(content)
 
@@ -236,31 +344,182 @@ def do_chat(session: Session, prompt: str) -> str:
         if not calls:
             break  # assistant is done, exit loop
 
-        # execute each call, append tool results, then loop again
-        for call in calls:
-            if _confirm_tool(call):
-                tool_output = execute_tool(call)
-            else:
-                tool_output = "skipped tool execution because the user did not allow it"
+        # execute the calls, append tool results in call order, then loop again
+        reads = session_cache(session.name)
+        hidden = set(history.pruned)
 
-            session.add(
-                {
-                    "role": "tool",
-                    "name": call.get("function", {}).get("name"),
-                    "content": tool_output,
-                    "tool_call_id": call.get("id", None), # OpenAI needs this.
-                }
+        def visible(index: int, message: Dict[str, Any]) -> bool:
+            return (
+                index not in hidden
+                and index < len(session.messages)
+                and session.messages[index] is message
             )
 
+        batch = await asyncio.to_thread(
+            run_tool_calls,
+            calls,
+            runs_unattended=_runs_unattended,
+            confirm=_confirm_tool,
+            execute=lambda call: reads.execute(call, execute_tool, visible),
+            max_workers=int(TOOL_CONCURRENCY.get()),
+        )
+        if sum(r.concurrent for r in batch.runs) > 1:
+            info(
+                f"Ran {len(batch.runs)} tool calls in {batch.elapsed:.2f}s "
+                f"({batch.sequential_elapsed:.2f}s if run one at a time)"
+            )
+
+        for run in batch.runs:
+            result = {
+                "role": "tool",
+                "name": run.call.get("function", {}).get("name"),
+                "content": run.output,
+                "tool_call_id": run.call.get("id", None),  # OpenAI needs this.
+            }
+            await _add_message(session, result)
+            reads.record(run.call, len(session.messages) - 1, result)
+
     session.save()
     info("")
 
     info("")
     info(f"[ session context usage {load_session_meta(session.name).usage_pct()} ]")
+    if history.pruned:
+        info(
+            f"[ pruned {len(history.pruned)} stale tool results, "
+            f"{history.tokens_saved} tokens not sent ]"
+        )
+    if retried := _retried() - retried_before:
+        info(f"[ retried {retried} provider requests after transient failures ]")
+    logging.debug(f"Provider transport stats: {transport.stats()}")
 
     return "".join(accumulated_text)
 
 
+def do_chat(session: Session, prompt: str) -> str:
+    """Synchronous wrapper around :func:`ado_chat`."""
+    return run_sync(ado_chat(session, prompt))
+
+
+def _start_warm_up(session: Session) -> None:
+    """Start loading the model in the background, sized for *session*."""
+    if WARM_UP.get() != "ENABLED":
+        return
+    model = MODEL.get()
+    started = time.monotonic()
+    future = asyncio.run_coroutine_threadsafe(
+        get_provider().aload(model, _num_ctx(session.tokens, list(ALL_TOOLS.values()))),
+        background_loop(),
+    )
+
+    def done(f) -> None:
+        if f.cancelled():
+            return
+        if (e := f.exception()) is not None:
+            # The first chat will load it, or report what is wrong.
+            logging.debug(f"warming up {model} failed: {type(e).__name__}: {e}")
+        elif f.result():
+            logging.debug(f"warmed up {model} in {time.monotonic() - started:.2f}s")
+
+    future.add_done_callback(done)
+
+
+class _Prefetch:
+    """Gets ready for the first prompt while it is being typed.
+
+    The session is loaded, then the model warmed up (if WARM_UP allows); a
+    connection to the provider is opened and the model info looked up; the
+    tokenizer is loaded and the symbol index brought up to date. Failures are
+    only logged: the chat does the same work again and reports them.
+    """
+
+    def __init__(self, session_name: str) -> None:
+        self._started = time.monotonic()
+        self._threads = ThreadPoolExecutor(
+            max_workers=3, thread_name_prefix="ocla-prefetch"
+        )
+        self._session = self._threads.submit(self._load_session, session_name)
+        self._threads.submit(self._run, "provider connection", self._connect)
+        self._threads.submit(self._run, "symbol index and tokenizer", self._workspace)
+
+    def _run(self, what: str, fn) -> None:
+        try:
+            fn()
+        except Exception as e:
+            logging.debug(f"prefetching {what} failed: {type(e).__name__}: {e}")
+        else:
+            logging.debug(
+                f"prefetched {what} in {time.monotonic() - self._started:.2f}s"
+            )
+
+    def _load_session(self, name: str) -> Session:
+        session = _open_session(name)
+        logging.debug(
+            f"prefetched session {name} in {time.monotonic() - self._started:.2f}s"
+        )
+        _start_warm_up(session)
+        return session
+
+    def _connect(self) -> None:
+        run_sync(get_provider().aconnect(MODEL.get()))
+        _current_model_info()
+
+    def _workspace(self) -> None:
+        update_index()
+        # Loading the session has most likely loaded it already.
+        _get_token_encoder(MODEL.get())
+
+    def session(self) -> Session:
+        return self._session.result()
+
+    def close(self) -> None:
+        # `ocla serve` changes directory between commands; finish in this one.
+        self._threads.shutdown(wait=True)
+
+
+# Sessions `ocla serve` keeps loaded between requests, with the size and
+# mtime of their files when last used. None when sessions are loaded afresh.
+_warm_sessions: Dict[tuple, tuple[Session, tuple]] | None = None
+
+
+def _file_signature(*paths: str) -> tuple:
+    signature = []
+    for path in paths:
+        try:
+            st = os.stat(path)
+        except OSError:
+            signature.append(None)
+        else:
+            signature.append((st.st_mtime_ns, st.st_size))
+    return tuple(signature)
+
+
+def _session_key(name: str) -> tuple:
+    # Loading a session depends on the config as well as its files.
+    settings = tuple(sorted(config_snapshot().values.items()))
+    return os.path.abspath(os.path.join(SESSION_DIR.get(), name)), settings
+
+
+def _open_session(name: str) -> Session:
+    """Load session *name*, reusing a warm copy if its files haven't changed."""
+    if _warm_sessions is not None:
+        warm = _warm_sessions.pop(_session_key(name), None)
+        if warm is not None and warm[1] == _file_signature(
+            warm[0].path, warm[0].meta_path
+        ):
+            logging.debug(f"Reusing loaded session {name}")
+            return warm[0]
+    return Session(name)
+
+
+def _keep_warm(session: Session) -> None:
+    if _warm_sessions is not None:
+        _warm_sessions[_session_key(session.name)] = (
+            session,
+            _file_signature(session.path, session.meta_path),
+        )
+
+
 def _build_arg_parser() -> argparse.ArgumentParser | None:
     parser = argparse.ArgumentParser(
         description="Interact with a language model",
@@ -280,30 +539,110 @@ def _build_arg_parser() -> argparse.ArgumentParser | None:
     session_sub = session_parser.add_subparsers(dest="session_cmd")
     session_new = session_sub.add_parser("new", help="Create a new session")
     session_new.add_argument("name", nargs="?")
-    session_sub.add_parser("list", help="List available sessions")
+    session_list = session_sub.add_parser("list", help="List available sessions")
+    session_list.add_argument(
+        "--limit", type=int, default=None, help="Show at most this many sessions"
+    )
+    session_list.add_argument(
+        "--offset", type=int, default=0, help="Skip this many sessions first"
+    )
     session_set = session_sub.add_parser("set", help="Set current session")
     session_set.add_argument("name")
+    session_sub.add_parser(
+        "reindex", help="Rebuild the session catalog from the session directory"
+    )
 
     subparsers.add_parser("config", help="Show config information")
     model = subparsers.add_parser("model", help="Show model information")
     subparsers.add_parser("tools", help="Display tools made available to the agent")
+    batch = subparsers.add_parser(
+        "batch", help="Run the prompts in a JSONL file of jobs, several at a time"
+    )
+    batch.add_argument(
+        "file",
+        help='JSONL file of {"prompt", "session", "model", "workdir"} jobs, or - to read stdin',
+    )
+    subparsers.add_parser(
+        "serve",
+        help="Keep ocla loaded in the background and hand later ocla commands to it",
+    )
 
     model_cmd = model.add_subparsers(dest="model_cmd")
     model_cmd.add_parser("list", help="Show available models")
     model_cmd.add_parser("info", help="Show information for the current model")
+    model_cmd.add_parser(
+        "warm",
+        help="Load the current model now, so the next prompt doesn't wait for it",
+    )
+    model_cmd.add_parser(
+        "unload", help="Unload the current model to free the memory it holds"
+    )
 
     return parser
 
 
+# Commands that never talk to the model provider.
+_LOCAL_COMMANDS = {"session", "config", "tools", "serve"}
+
+
+def _needs_initialization_check(args: argparse.Namespace) -> bool:
+    if args.command in _LOCAL_COMMANDS:
+        return False
+
+    # Listing models must work even if the configured model does not exist.
+    if args.command == "model" and args.model_cmd == "list":
+        return False
+
+    # Batch jobs may use other models, and report their own failures.
+    if args.command == "batch":
+        return False
+
+    return True
+
+
 def _initialization_check():
     if os.getenv("OCLA_DISABLE_INIT_CHECK"):
         return
 
-    try:
-        provider.initialization_check(MODEL.get())
-    except RuntimeError as e:
-        error(str(e))
-        raise SystemExit(1)
+    provider = get_provider()
+    model = MODEL.get()
+    ttl = int(INIT_CHECK_TTL.get())
+    cache_key = f"{provider.name}|{provider.endpoint()}|{model}"
+
+    digest = None
+    if ttl > 0:
+        try:
+            digest = provider.model_digest(model)
+        except Exception as e:  # pragma: no cover - network errors
+            logging.debug(f"failed to fetch digest for {model}: {e}")
+
+    cached = cache_get("init_check", cache_key, ttl)
+    if cached is not None and digest and cached.get("digest") != digest:
+        logging.debug(
+            f"initialization check for {cache_key} invalidated: digest changed"
+        )
+        cached = None
+
+    if cached is not None:
+        logging.debug(f"skipping initialization check for {cache_key}: cached")
+    else:
+        try:
+            provider.initialization_check(model)
+        except RuntimeError as e:
+            error(str(e))
+            raise SystemExit(1)
+
+        if ttl > 0:
+            cache_put(
+                "init_check",
+                cache_key,
+                {
+                    "provider": provider.name,
+                    "host": provider.endpoint(),
+                    "model": model,
+                    "digest": digest,
+                },
+            )
 
     model_ctx = _current_model_info().context_length
     if model_ctx is None:
@@ -325,13 +664,17 @@ def main(argv=None):
     parser = _build_arg_parser()
     args = parser.parse_args(argv)
 
+    # Resolve config exactly once for this invocation.
+    reload_config(argv)
+
     for var in CONFIG_VARS.values():
         if validation_err := var.validate():
             parser.error(
                 f"Invalid value for {var.name} ({var.get()}): {validation_err}"
             )
 
-    _initialization_check()
+    if _needs_initialization_check(args):
+        _initialization_check()
 
     if args.command == "session":
         if args.session_cmd == "new":
@@ -340,6 +683,10 @@ def main(argv=None):
             set_current_session_name(name)
             print(name)
         elif args.session_cmd == "list":
+            import humanize
+            from rich.table import Table
+            from tzlocal import get_localzone
+
             table = Table(show_header=True, header_style="bold")
 
             table.add_column("Session")
@@ -348,12 +695,13 @@ def main(argv=None):
             table.add_column("Tokens")
             table.add_column("% of Context")
             table.add_column("Provider")
-            for s in list_sessions():
+            current_session = get_current_session_name()
+            for s in list_sessions(limit=args.limit, offset=args.offset):
                 table.add_row(
                     *(
                         (
                             f"> {s.name}"
-                            if get_current_session_name() == s.name
+                            if current_session == s.name
                             else f"  {s.name}"
                         ),
                         humanize.naturaltime(datetime.now(get_localzone()) - s.created),
@@ -365,13 +713,22 @@ def main(argv=None):
                 )
 
             console.print(table)
+
+            shown = table.row_count
+            total = count_sessions()
+            if args.offset or shown < total:
+                info(f"Showing {shown} of {total} sessions")
         elif args.session_cmd == "set":
             if not session_exists(args.name):
                 parser.error(f"Unknown session: {args.name}")
             set_current_session_name(args.name)
+        elif args.session_cmd == "reindex":
+            info(f"Indexed {reindex_sessions()} sessions")
 
         return
     elif args.command == "config":
+        from rich.table import Table
+
         table = Table(title="Available Configuration Variables")
 
         table.add_column("Name", style="cyan", no_wrap=True)
@@ -409,6 +766,9 @@ def main(argv=None):
         console.print(table)
         return
     elif args.command == "model":
+        from rich.table import Table
+
+        provider = get_provider()
         if args.model_cmd == "info":
             table = Table(title="Model info", show_header=False)
 
@@ -422,7 +782,10 @@ def main(argv=None):
                 "Model maximum context window",
                 str(_current_model_info().context_length) or "N/A",
             )
-            table.add_row("Current configured context window", f"{CONTEXT_WINDOW.get()}")
+            table.add_row(
+                "Current configured context window", f"{CONTEXT_WINDOW.get()}"
+            )
+            table.add_row("Context sizing", CONTEXT_SIZING.get())
 
             table.add_section()
             supported = _current_model_info().supports_thinking
@@ -435,9 +798,7 @@ def main(argv=None):
             console.print(table)
             return
         elif args.model_cmd == "list":
-            if len(provider.available_models()) == 0:
-                console.print("No models available")
-                return
+            from rich.live import Live
 
             table = Table(title="Available models")
 
@@ -445,14 +806,55 @@ def main(argv=None):
             table.add_column("Supports thinking?")
             table.add_column("Context window")
 
-            for provider_model in provider.available_models():
-                table.add_row(
-                    provider_model.name,
-                    str(provider_model.supports_thinking) if provider_model.supports_thinking is not None else "Unknown",
-                    str(provider_model.context_length) if provider_model.context_length is not None else "Unknown",
-                )
+            # Rows are added as each model's details arrive.
+            live = None
+            try:
+                for provider_model in provider.iter_available_models():
+                    if live is None:
+                        live = Live(table, console=console, auto_refresh=False)
+                        live.start()
+                    table.add_row(
+                        provider_model.name,
+                        (
+                            str(provider_model.supports_thinking)
+                            if provider_model.supports_thinking is not None
+                            else "Unknown"
+                        ),
+                        (
+                            str(provider_model.context_length)
+                            if provider_model.context_length is not None
+                            else "Unknown"
+                        ),
+                    )
+                    live.refresh()
+            finally:
+                if live is not None:
+                    live.stop()
 
-            console.print(table)
+            if live is None:
+                console.print("No models available")
+            return
+        elif args.model_cmd == "warm":
+            # Size the context for the session the next prompt will go to.
+            tokens = 0
+            if name := get_current_session_name():
+                try:
+                    tokens = load_session_meta(name).tokens
+                except OSError:
+                    pass
+            started = time.monotonic()
+            if run_sync(
+                provider.aload(MODEL.get(), _num_ctx(tokens, list(ALL_TOOLS.values())))
+            ):
+                info(f"Loaded {MODEL.get()} in {time.monotonic() - started:.1f}s")
+            else:
+                info(f"{provider.name} has no models to load")
+            return
+        elif args.model_cmd == "unload":
+            if run_sync(provider.aunload(MODEL.get())):
+                info(f"Unloaded {MODEL.get()}")
+            else:
+                info(f"{provider.name} has no models to unload")
             return
         else:
             parser.error("Invalid model command")
@@ -460,6 +862,27 @@ def main(argv=None):
         for t in ALL_TOOLS.values():
             console.print(t.describe().model_dump(exclude_none=True))
         return
+    elif args.command == "batch":
+        from ocla.batch import BatchFileError, read_jobs, run_batch
+
+        try:
+            if args.file == "-":
+                lines = sys.stdin.read().splitlines()
+            else:
+                with open(args.file, "r", encoding="utf-8") as f:
+                    lines = f.read().splitlines()
+            jobs = read_jobs(lines, f"batch-{generate_session_name()}")
+        except (OSError, BatchFileError) as e:
+            parser.error(f"Cannot read batch jobs from {args.file}: {e}")
+
+        if run_batch(jobs, sys.argv[1:] if argv is None else argv):
+            sys.exit(1)
+        return
+    elif args.command == "serve":
+        from ocla.daemon import serve
+
+        serve(DAEMON_SOCKET.get())
+        return
 
     session_name = get_current_session_name() or generate_session_name()
     if args.new_session:
@@ -467,19 +890,45 @@ def main(argv=None):
         set_current_session_name(session_name)
         info(f"Created new session {session_name} and set it as the current session.")
 
+    # Take prompt from stdin if provided.
+    msg = None if sys.stdin.isatty() else sys.stdin.read().strip()
+
+    prefetch = None
+    if not msg and PREFETCH.get() == "ENABLED":
+        # Nothing happens until a prompt is typed; get ready for it meanwhile.
+        prefetch = _Prefetch(session_name)
+    try:
+        _chat_loop(session_name, msg, prefetch)
+    finally:
+        if prefetch is not None:
+            prefetch.close()
+
+
+def _use_session(name: str, prefetch: _Prefetch | None) -> Session | None:
+    """Session *name*, as loaded by *prefetch* if given; None if it can't be used."""
     try:
-        session = Session(session_name)
+        session = _open_session(name) if prefetch is None else prefetch.session()
     except ProviderMismatchError as e:
         error(str(e))
-        return
+        return None
     if get_current_session_name() is None:
-        set_current_session_name(session_name)
+        set_current_session_name(name)
+    return session
 
-    # Take prompt from stdin if provided.
-    msg = None if sys.stdin.isatty() else sys.stdin.read().strip()
 
+def _chat_loop(session_name: str, msg: str | None, prefetch: _Prefetch | None) -> None:
+    session = None
+    if prefetch is None and (session := _use_session(session_name, None)) is None:
+        return
+
+    # Prefetching starts the warm-up itself, once the session is loaded.
+    warming = prefetch is not None
     while True:
         if not msg or len(msg) == 0:
+            if not warming:
+                # Load the model while the first prompt is being typed.
+                _start_warm_up(session)
+                warming = True
             detect_quit = False
             if PROMPT_MODE.get() == "INTERACTIVE":
                 prompt_msg = "[bold cyan]prompt (q to quit) ❯[/bold cyan] "
@@ -492,6 +941,11 @@ def main(argv=None):
                 break
 
         if msg is not None and len(msg) > 0:
+            if (
+                session is None
+                and (session := _use_session(session_name, prefetch)) is None
+            ):
+                return
             try:
                 do_chat(session, msg)
             except ContextWindowExceededError as e:
@@ -503,6 +957,10 @@ def main(argv=None):
 
         msg = None
 
+    if session is None and (session := _use_session(session_name, prefetch)) is None:
+        return
+    _keep_warm(session)
+
 
 if __name__ == "__main__":
     main()
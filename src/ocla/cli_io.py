@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from typing import Optional
+import contextlib
+from typing import Callable, Iterator, Optional, TextIO
 
 from rich.console import Console
 from rich.text import Text
@@ -12,6 +13,37 @@ console = Console()
 _TTY_WIN = "CONIN$"  # Windows console device
 _TTY_NIX = "/dev/tty"  # POSIX console device
 
+# Asks the user on another terminal; set while `ocla serve` runs a request.
+_remote_prompt: Optional[Callable[[str], Optional[str]]] = None
+
+
+@contextlib.contextmanager
+def remote_terminal(
+    file: TextIO,
+    prompt: Callable[[str], Optional[str]],
+    *,
+    terminal: bool,
+    width: Optional[int],
+) -> Iterator[None]:
+    """Send console output to *file* and questions to *prompt* for a while.
+
+    Output is rendered for the remote terminal: *terminal* says whether it is
+    one (so whether to emit colours), and *width* is its width. The module's
+    ``console`` object stays the same one, so existing references to it follow.
+    """
+    global _remote_prompt
+    saved = dict(console.__dict__)
+    console.__dict__.update(
+        Console(file=file, force_terminal=terminal, width=width).__dict__
+    )
+    _remote_prompt = prompt
+    try:
+        yield
+    finally:
+        _remote_prompt = None
+        console.__dict__.clear()
+        console.__dict__.update(saved)
+
 
 def agent_output(text: str, thinking: bool, con=None, **kwargs) -> None:
     (con or console).print(
@@ -32,6 +64,9 @@ def error(text: str, con=None, **kwargs) -> None:
 
 
 def interactive_prompt(prompt: str) -> Optional[str]:
+    if _remote_prompt is not None:
+        return _remote_prompt(prompt)
+
     # 1. Fast path – stdin is already a TTY
     if sys.stdin.isatty():
         return console.input(prompt)
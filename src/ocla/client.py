@@ -0,0 +1,86 @@
+"""The `ocla` command.
+
+If `ocla serve` is running (see `ocla.daemon`), the invocation is handed to it
+and this process only relays input and output. Otherwise ocla runs here as
+usual. Only the config module is imported before that decision, so handing
+over stays cheap.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import socket
+import sys
+from typing import Optional, Sequence
+
+from ocla.config import DAEMON_SOCKET, resolve_config
+
+
+def _socket_path(argv: Sequence[str]) -> Optional[str]:
+    path = resolve_config(argv).values.get(DAEMON_SOCKET.name)
+    return path if path and os.path.exists(path) else None
+
+
+def forward(argv: Sequence[str]) -> Optional[int]:
+    """Run *argv* in a running `ocla serve` and return its exit code.
+
+    Returns None if no daemon is running, without having done anything.
+    """
+    path = _socket_path(argv)
+    if path is None:
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(path)
+    except OSError:
+        sock.close()
+        return None
+
+    with sock, sock.makefile("rwb") as conn:
+
+        def send(**message) -> None:
+            conn.write(json.dumps(message).encode("utf-8") + b"\n")
+            conn.flush()
+
+        send(
+            argv=list(argv),
+            cwd=os.getcwd(),
+            env=dict(os.environ),
+            stdin_tty=sys.stdin.isatty(),
+            terminal=sys.stdout.isatty(),
+            width=shutil.get_terminal_size().columns if sys.stdout.isatty() else None,
+        )
+        for line in conn:
+            message = json.loads(line)
+            if "output" in message:
+                out = sys.stderr if message.get("stream") == "stderr" else sys.stdout
+                out.write(message["output"])
+                out.flush()
+            elif "prompt" in message:
+                from ocla.cli_io import interactive_prompt
+
+                send(reply=interactive_prompt(message["prompt"]))
+            elif "stdin" in message:
+                send(stdin=sys.stdin.read())
+            elif "exit" in message:
+                return int(message["exit"])
+
+    print("ERROR: ocla serve stopped before finishing the command", file=sys.stderr)
+    return 1
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    argv = list(sys.argv[1:] if argv is None else argv)
+    try:
+        code = forward(argv)
+    except KeyboardInterrupt:
+        print()
+        sys.exit(130)
+    if code is not None:
+        sys.exit(code)
+
+    from ocla.cli import main as run_here
+
+    run_here(argv)
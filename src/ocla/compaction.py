@@ -0,0 +1,216 @@
+"""Summarize older turns of a session once it nears the context window.
+
+A session is compacted by replacing a run of older messages with a single
+summary written by the active model. The leading system messages, the most
+recent turns and any tool calls still waiting for their results are always
+kept verbatim. The replaced messages are archived next to the session (see
+`Session.compact`), so the full history remains on disk.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import json
+import logging
+from typing import Any, Dict, List, Optional
+
+from ocla.config import COMPACTION_THRESHOLD, COMPACTION_KEEP_TURNS, CONTEXT_WINDOW
+from ocla.context_size import context_window
+from ocla.providers import Provider
+from ocla.session import Session
+
+SUMMARY_PREFIX = (
+    "Summary of the earlier conversation, which was compacted to save space:\n\n"
+)
+
+_SUMMARY_INSTRUCTIONS = """
+You are compacting the history of a conversation between a user and a software
+development agent so that the agent can continue working with less context.
+Write a concise summary of the transcript you are given. Keep every fact the
+agent needs to carry on: the user's goals and instructions, decisions made,
+files and code that were read or changed, commands that were run and their
+outcome, and any open questions or unfinished work. Do not address the user
+and do not add commentary; output only the summary.
+"""
+
+# Rough number of characters per token, used to trim oversized messages.
+_CHARS_PER_TOKEN = 4
+
+
+@dataclasses.dataclass
+class CompactionPlan:
+    # messages[start:end] are summarized; everything else is kept.
+    start: int
+    end: int
+
+
+@dataclasses.dataclass
+class CompactionResult:
+    messages: int
+    tokens_before: int
+    tokens_after: int
+
+
+def high_water_mark() -> Optional[int]:
+    """Token count at which a session is compacted, or None if disabled."""
+    pct = int(COMPACTION_THRESHOLD.get())
+    if pct == 0:
+        return None
+    return int(CONTEXT_WINDOW.get()) * pct // 100
+
+
+def needs_compaction(session: Session) -> bool:
+    mark = high_water_mark()
+    return mark is not None and session.token_count() >= mark
+
+
+def _first_unresolved_tool_call(messages: List[Dict[str, Any]]) -> Optional[int]:
+    """Index of the first assistant message whose tool calls lack results."""
+    for i, m in enumerate(messages):
+        calls = m.get("tool_calls") or []
+        if m.get("role") != "assistant" or not calls:
+            continue
+        results = 0
+        for later in messages[i + 1 :]:
+            if later.get("role") != "tool":
+                break
+            results += 1
+        if results < len(calls):
+            return i
+    return None
+
+
+def plan_compaction(
+    messages: List[Dict[str, Any]], keep_turns: int
+) -> Optional[CompactionPlan]:
+    """Choose which messages to summarize, or None if nothing can be."""
+    start = 0
+    while start < len(messages) and messages[start].get("role") == "system":
+        start += 1
+
+    users = [
+        i for i in range(start, len(messages)) if messages[i].get("role") == "user"
+    ]
+    if len(users) > keep_turns:
+        end = users[-keep_turns]
+    else:
+        # Too few turns to drop a whole one: keep only the latest model step
+        # (and the tool results that answer it).
+        steps = [
+            i
+            for i in range(start, len(messages))
+            if messages[i].get("role") == "assistant"
+        ]
+        if not steps:
+            return None
+        end = steps[-1]
+
+    unresolved = _first_unresolved_tool_call(messages)
+    if unresolved is not None:
+        end = min(end, unresolved)
+
+    # Tool results must stay with the call that requested them.
+    while end > start and messages[end].get("role") == "tool":
+        end -= 1
+
+    # Summarizing a single message, or an earlier summary on its own, frees nothing.
+    if end - start < 2:
+        return None
+
+    return CompactionPlan(start=start, end=end)
+
+
+def _render(message: Dict[str, Any], max_chars: int) -> str:
+    role = message.get("role", "unknown")
+    if role == "tool":
+        role = f"tool result ({message.get('name') or 'unknown'})"
+
+    lines = []
+    content = str(message.get("content") or "")
+    if len(content) > max_chars:
+        content = content[:max_chars] + f"… ({len(content) - max_chars} chars omitted)"
+    if content:
+        lines.append(f"{role}: {content}")
+
+    for call in message.get("tool_calls") or []:
+        fn = call.get("function", {})
+        args = fn.get("arguments")
+        if not isinstance(args, str):
+            args = json.dumps(args)
+        lines.append(f"{role} called tool {fn.get('name')} with {args}")
+
+    return "\n".join(lines)
+
+
+def _chunks(session: Session, plan: CompactionPlan, budget: int) -> List[List[int]]:
+    """Split the planned range into runs of messages that fit *budget* tokens."""
+    chunks: List[List[int]] = [[]]
+    used = 0
+    for i in range(plan.start, plan.end):
+        tokens = session.message_tokens[i]
+        if chunks[-1] and used + tokens > budget:
+            chunks.append([])
+            used = 0
+        chunks[-1].append(i)
+        used += tokens
+    return chunks
+
+
+async def _summarize(
+    provider: Provider, model: str, transcript: str, previous: str
+) -> str:
+    prompt = ""
+    if previous:
+        prompt += f"Summary of the conversation so far:\n\n{previous}\n\nIt continued with:\n\n"
+    prompt += transcript
+
+    parts = []
+    async for chunk in provider.achat(
+        messages=[
+            {"role": "system", "content": _SUMMARY_INSTRUCTIONS},
+            {"role": "user", "content": prompt},
+        ],
+        tools=[],
+        thinking=False,
+        model=model,
+        context_window=context_window(model, len(prompt) // _CHARS_PER_TOKEN, []),
+    ):
+        msg = chunk.get("message", {})
+        if hasattr(msg, "model_dump"):
+            msg = msg.model_dump(mode="python", by_alias=True)
+        parts.append(msg.get("content") or "")
+
+    return "".join(parts).strip()
+
+
+async def compact_session(
+    session: Session, provider: Provider, model: str
+) -> Optional[CompactionResult]:
+    """Summarize older turns of *session* in place; None if nothing could be."""
+    plan = plan_compaction(session.messages, int(COMPACTION_KEEP_TURNS.get()))
+    if plan is None:
+        return None
+
+    # Leave room in the window for the instructions and the summary itself.
+    budget = max(int(CONTEXT_WINDOW.get()) // 2, 1)
+    max_chars = budget * _CHARS_PER_TOKEN
+
+    summary = ""
+    for chunk in _chunks(session, plan, budget):
+        transcript = "\n\n".join(_render(session.messages[i], max_chars) for i in chunk)
+        summary = await _summarize(provider, model, transcript, summary)
+
+    if not summary:
+        logging.warning("Model returned an empty summary; session was not compacted")
+        return None
+
+    before = session.token_count()
+    session.compact(
+        plan.start, plan.end, {"role": "system", "content": SUMMARY_PREFIX + summary}
+    )
+
+    return CompactionResult(
+        messages=plan.end - plan.start,
+        tokens_before=before,
+        tokens_after=session.token_count(),
+    )
@@ -1,16 +1,20 @@
 import argparse
 import logging
 import os
+import re
 import dataclasses
 import json
 import sys
-from typing import Optional, Callable
+import types
+from typing import Optional, Callable, Mapping, Sequence, Any
 
 _have_logged_invalid_config = False
 
-def _cli_value(args: tuple[str]) -> str | None:
-    argv = sys.argv[1:]  # drop the script name
+# Number of times the config file has been opened by this process.
+_config_file_reads = 0
 
+
+def _cli_value(args: tuple[str], argv: Sequence[str]) -> str | None:
     for i, tok in enumerate(argv):
         # Case 1 – "--flag=value" form
         for flag in args:
@@ -40,28 +44,25 @@ class ConfigVar:
     sensitive: bool = False
 
     def get(self) -> str:
-        global _have_logged_invalid_config
+        return config_snapshot().values[self.name]
 
+    def _resolve(self, sources: "_ConfigSources", provider: Optional[str]) -> str:
         value = None
 
         # Restrict provider-specific config vars for non-active providers.
-        if self.provider and PROVIDER.get() != self.provider:
+        if self.provider and provider != self.provider:
             return ""
 
-        if cli_value := _cli_value(self.cli or ()):
+        if cli_value := _cli_value(self.cli or (), sources.argv):
             value = cli_value
-        elif self.env and os.environ.get(self.env):
-            value = os.environ.get(self.env)
+        elif self.env and sources.environ.get(self.env):
+            value = sources.environ.get(self.env)
         elif self.config_file_property:
-            try:
-                with open(CONFIG_FILE.get(), "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                value = str(data.get(self.config_file_property, self.default))
-            except (json.JSONDecodeError, TypeError):
-                if not _have_logged_invalid_config:
-                    _have_logged_invalid_config = True
-                    logging.warning(f"Config file {CONFIG_FILE.get()} not valid JSON")
-            except FileNotFoundError:
+            if sources.file_data is not None:
+                value = str(
+                    sources.file_data.get(self.config_file_property, self.default)
+                )
+            elif not sources.file_invalid:
                 value = self.default
         else:
             value = self.default
@@ -71,23 +72,126 @@ class ConfigVar:
 
         return value
 
-    def validate(self) -> Optional[str]:
-        if self.provider and PROVIDER.get() != self.provider:
+    def _validate(self, value: Optional[str], provider: Optional[str]) -> Optional[str]:
+        if self.provider and provider != self.provider:
             return None
 
         if self.validator_fn:
-            return self.validator_fn(self.get())
+            try:
+                return self.validator_fn(value) or None
+            except (AttributeError, TypeError, ValueError):
+                return "invalid value"
 
         if self.allowed_values:
-            if self.get() not in self.allowed_values.keys():
+            if value not in self.allowed_values.keys():
                 return f"must be one of: {', '.join(self.allowed_values.keys())}"
 
         return None
 
+    def validate(self) -> Optional[str]:
+        return config_snapshot().errors.get(self.name)
+
     def is_valid(self) -> bool:
         return self.validate() is None
 
 
+@dataclasses.dataclass
+class _ConfigSources:
+    argv: Sequence[str]
+    environ: Mapping[str, str]
+    file_data: Optional[dict[str, Any]] = None
+    file_invalid: bool = False
+
+
+@dataclasses.dataclass(frozen=True)
+class ConfigSnapshot:
+    """Every config var resolved once from the CLI, environment and config file."""
+
+    values: Mapping[str, Optional[str]]
+    errors: Mapping[str, str]
+
+
+def _read_config_file(path: str, sources: _ConfigSources) -> None:
+    global _have_logged_invalid_config, _config_file_reads
+
+    try:
+        _config_file_reads += 1
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if not isinstance(data, dict):
+            raise TypeError("config must be a JSON object")
+        sources.file_data = data
+    except (json.JSONDecodeError, TypeError):
+        sources.file_invalid = True
+        if not _have_logged_invalid_config:
+            _have_logged_invalid_config = True
+            logging.warning(f"Config file {path} not valid JSON")
+    except FileNotFoundError:
+        pass
+
+
+def resolve_config(
+    argv: Optional[Sequence[str]] = None, environ: Optional[Mapping[str, str]] = None
+) -> ConfigSnapshot:
+    """Read every config source once and return the resolved values.
+
+    *argv* defaults to this process's arguments and *environ* to its environment.
+    """
+    sources = _ConfigSources(
+        argv=list(sys.argv[1:] if argv is None else argv),
+        environ=dict(os.environ if environ is None else environ),
+    )
+
+    # The config file's own location can't come from the config file.
+    config_file = CONFIG_FILE._resolve(sources, None)
+    _read_config_file(config_file, sources)
+
+    provider = PROVIDER._resolve(sources, None)
+
+    values = {}
+    errors = {}
+    for var in CONFIG_VARS.values():
+        if var is CONFIG_FILE:
+            value = config_file
+        elif var is PROVIDER:
+            value = provider
+        else:
+            value = var._resolve(sources, provider)
+        values[var.name] = value
+        if err := var._validate(value, provider):
+            errors[var.name] = err
+
+    return ConfigSnapshot(
+        values=types.MappingProxyType(values),
+        errors=types.MappingProxyType(errors),
+    )
+
+
+_snapshot: Optional[ConfigSnapshot] = None
+
+
+def config_snapshot() -> ConfigSnapshot:
+    """The current config snapshot, resolved on first use."""
+    global _snapshot
+    if _snapshot is None:
+        _snapshot = resolve_config()
+    return _snapshot
+
+
+def reload_config(
+    argv: Optional[Sequence[str]] = None, environ: Optional[Mapping[str, str]] = None
+) -> ConfigSnapshot:
+    """Re-read all config sources and make the result the current snapshot."""
+    global _snapshot
+    _snapshot = resolve_config(argv, environ)
+    return _snapshot
+
+
+def config_file_reads() -> int:
+    """How many times this process has read the config file."""
+    return _config_file_reads
+
+
 CONFIG_VARS: dict[str, ConfigVar] = {}
 
 
@@ -150,6 +254,80 @@ CONTEXT_WINDOW = _var(
     )
 )
 
+CONTEXT_SIZING_FIXED = "FIXED"
+CONTEXT_SIZING_ADAPTIVE = "ADAPTIVE"
+
+CONTEXT_SIZING = _var(
+    ConfigVar(
+        name="context_sizing",
+        description="How large a context window to ask an Ollama server for. The server sets aside memory for the whole window and reloads the model whenever the size changes.",
+        env="OCLA_CONTEXT_SIZING",
+        config_file_property="contextSizing",
+        default=CONTEXT_SIZING_FIXED,
+        normalizer=lambda x: x.upper(),
+        allowed_values={
+            CONTEXT_SIZING_FIXED: "Always ask for the configured context window",
+            CONTEXT_SIZING_ADAPTIVE: "Ask for the smallest of a few sizes, doubling up to the configured context window, that fits the session and a reply. The size never shrinks while ocla runs, so the model is reloaded only when the session outgrows it.",
+        },
+    )
+)
+
+COMPACTION_THRESHOLD = _var(
+    ConfigVar(
+        name="compaction_threshold",
+        description="Percentage of the context window at which older turns of a session are summarized to free up space. 0 disables compaction.",
+        env="OCLA_COMPACTION_THRESHOLD",
+        config_file_property="compactionThreshold",
+        default="80",
+        validator_fn=lambda x: (
+            ""
+            if x.isdigit() and int(x) <= 100
+            else "must be an integer between 0 and 100"
+        ),
+    )
+)
+
+COMPACTION_KEEP_TURNS = _var(
+    ConfigVar(
+        name="compaction_keep_turns",
+        description="How many of the most recent prompts, with everything that followed them, are kept verbatim when a session is compacted",
+        env="OCLA_COMPACTION_KEEP_TURNS",
+        config_file_property="compactionKeepTurns",
+        default="4",
+        validator_fn=lambda x: (
+            "" if x.isdigit() and int(x) > 0 else "must be a positive integer"
+        ),
+    )
+)
+
+PRUNE_TOOL_RESULTS_AFTER = _var(
+    ConfigVar(
+        name="prune_tool_results_after",
+        description="Tool results older than this many prompts are replaced by a short stub when the history is sent to the model. They stay in the stored session. 0 disables pruning.",
+        env="OCLA_PRUNE_TOOL_RESULTS_AFTER",
+        config_file_property="pruneToolResultsAfter",
+        default="3",
+        validator_fn=lambda x: (
+            "" if x.isdigit() else "must be a non-negative integer"
+        ),
+    )
+)
+
+DEDUPE_FILE_READS = _var(
+    ConfigVar(
+        name="dedupe_file_reads",
+        description="Whether re-reading a file the model has already seen in this session returns a short reference (or a diff, if it changed) instead of the whole content again",
+        env="OCLA_DEDUPE_FILE_READS",
+        config_file_property="dedupeFileReads",
+        default="ENABLED",
+        normalizer=lambda x: x.upper(),
+        allowed_values={
+            "ENABLED": "Unchanged re-reads refer back to the earlier result; changed files are sent as a diff when that is shorter",
+            "DISABLED": "Every read returns the full content",
+        },
+    )
+)
+
 MODEL = _var(
     ConfigVar(
         name="model",
@@ -164,11 +342,48 @@ MODEL = _var(
 OLLAMA_HOST_OVERRIDE = _var(
     ConfigVar(
         name="ollama_host",
-        description="Override the OLLAMA_HOST for the Ollama API",
+        description="Override the OLLAMA_HOST for the Ollama API. Several hosts separated by commas spread chats across them, preferring healthy hosts that have the model loaded and are least busy",
         env="OCLA_OLLAMA_HOST",
         config_file_property="ollamaHost",
         default="",
         provider="ollama",
+        validator_fn=lambda x: (
+            ""
+            if not x or any(h.strip() for h in x.split(","))
+            else "must name at least one host"
+        ),
+    )
+)
+
+KEEP_ALIVE = _var(
+    ConfigVar(
+        name="keep_alive",
+        description="How long Ollama keeps the model loaded after a request, e.g. 30m or 2h; a number is in seconds, 0 unloads straight away and -1 keeps it loaded. Empty leaves it to the server (5m unless OLLAMA_KEEP_ALIVE says otherwise).",
+        env="OCLA_KEEP_ALIVE",
+        config_file_property="keepAlive",
+        default="",
+        provider="ollama",
+        validator_fn=lambda x: (
+            ""
+            if not x or re.fullmatch(r"-?\d+(\.\d+)?(ms|s|m|h)?", x)
+            else "must be a number of seconds or a duration such as 30m"
+        ),
+    )
+)
+
+WARM_UP = _var(
+    ConfigVar(
+        name="warm_up",
+        description="Whether to start loading the model in the background while the first prompt is being typed",
+        env="OCLA_WARM_UP",
+        config_file_property="warmUp",
+        default="ENABLED",
+        provider="ollama",
+        normalizer=lambda x: x.upper(),
+        allowed_values={
+            "ENABLED": "Ask the server to load the model as soon as ocla is waiting for a prompt",
+            "DISABLED": "The model is loaded by the first chat request",
+        },
     )
 )
 
@@ -211,6 +426,16 @@ SESSION_DIR = _var(
     )
 )
 
+SYMBOL_INDEX_FILE = _var(
+    ConfigVar(
+        name="symbol_index_file",
+        description="Path to the index of functions, classes and methods in the project used by the find_symbol and file_outline tools",
+        env="OCLA_SYMBOL_INDEX_FILE",
+        config_file_property="symbolIndexFile",
+        default=os.path.join(".", ".ocla", "symbols.sqlite3"),
+    )
+)
+
 STATE_FILE = _var(
     ConfigVar(
         name="state_file",
@@ -221,6 +446,100 @@ STATE_FILE = _var(
     )
 )
 
+CACHE_DIR = _var(
+    ConfigVar(
+        name="cache_dir",
+        description="Path to the directory where ocla caches provider lookups",
+        env="OCLA_CACHE_DIR",
+        config_file_property="cacheDir",
+        default=os.path.join(".", ".ocla", "cache"),
+    )
+)
+
+DAEMON_SOCKET = _var(
+    ConfigVar(
+        name="daemon_socket",
+        description="Path to the Unix socket `ocla serve` listens on. While it is running, ocla commands are handed to it instead of starting up from scratch",
+        env="OCLA_DAEMON_SOCKET",
+        config_file_property="daemonSocket",
+        default=os.path.join(".", ".ocla", "daemon.sock"),
+    )
+)
+
+PREFETCH = _var(
+    ConfigVar(
+        name="prefetch",
+        description="Whether to load the session, tokenizer, model info and symbol index, and connect to the provider, in the background while the first prompt is being typed",
+        env="OCLA_PREFETCH",
+        config_file_property="prefetch",
+        default="ENABLED",
+        normalizer=lambda x: x.upper(),
+        allowed_values={
+            "ENABLED": "Do that work while waiting for the prompt",
+            "DISABLED": "Do it once the prompt has been entered",
+        },
+    )
+)
+
+INIT_CHECK_TTL = _var(
+    ConfigVar(
+        name="init_check_ttl",
+        description="How long, in seconds, a successful provider/model check is trusted before it is repeated. 0 checks on every run.",
+        env="OCLA_INIT_CHECK_TTL",
+        config_file_property="initCheckTtl",
+        default="3600",
+        validator_fn=lambda x: (
+            "" if x.isdigit() else "must be a non-negative integer"
+        ),
+    )
+)
+
+PROVIDER_RETRIES = _var(
+    ConfigVar(
+        name="provider_retries",
+        description="How many times a request to the model provider is retried after a dropped connection, a 429 or a 5xx response, backing off between attempts. 0 disables retries.",
+        env="OCLA_PROVIDER_RETRIES",
+        config_file_property="providerRetries",
+        default="3",
+        validator_fn=lambda x: (
+            "" if x.isdigit() else "must be a non-negative integer"
+        ),
+    )
+)
+
+MODEL_INFO_TTL = _var(
+    ConfigVar(
+        name="model_info_ttl",
+        description="How long, in seconds, model information fetched from the provider is cached on disk. 0 disables the disk cache.",
+        env="OCLA_MODEL_INFO_TTL",
+        config_file_property="modelInfoTtl",
+        default="3600",
+        validator_fn=lambda x: (
+            "" if x.isdigit() else "must be a non-negative integer"
+        ),
+    )
+)
+
+PATH_ALLOW = _var(
+    ConfigVar(
+        name="path_allow",
+        description="Comma separated globs, relative to the working directory, of hidden paths tools may still access (e.g. .github/*)",
+        env="OCLA_PATH_ALLOW",
+        config_file_property="pathAllow",
+        default="",
+    )
+)
+
+PATH_DENY = _var(
+    ConfigVar(
+        name="path_deny",
+        description="Comma separated globs, relative to the working directory, of paths tools may never access (e.g. secrets/*,*.pem). Takes precedence over path_allow.",
+        env="OCLA_PATH_DENY",
+        config_file_property="pathDeny",
+        default="",
+    )
+)
+
 TOOL_PERMISSION_MODE_DEFAULT = "DEFAULT"
 TOOL_PERMISSION_MODE_ALWAYS_ASK = "ALWAYS_ASK"
 TOOL_PERMISSION_MODE_ALWAYS_ALLOW = "ALWAYS_ALLOW"
@@ -245,6 +564,71 @@ TOOL_PERMISSION_MODE = _var(
     )
 )
 
+TOOL_CONCURRENCY = _var(
+    ConfigVar(
+        name="tool_concurrency",
+        description="How many read-only tool calls from a single model turn may run at once. 1 runs every call in turn.",
+        env="OCLA_TOOL_CONCURRENCY",
+        config_file_property="toolConcurrency",
+        default="4",
+        validator_fn=lambda x: (
+            "" if x.isdigit() and int(x) > 0 else "must be a positive integer"
+        ),
+    )
+)
+
+BATCH_CONCURRENCY = _var(
+    ConfigVar(
+        name="batch_concurrency",
+        description="How many `ocla batch` jobs may talk to the same provider at once",
+        env="OCLA_BATCH_CONCURRENCY",
+        config_file_property="batchConcurrency",
+        default="2",
+        validator_fn=lambda x: (
+            "" if x.isdigit() and int(x) > 0 else "must be a positive integer"
+        ),
+    )
+)
+
+LIST_FILES_MAX_ENTRIES = _var(
+    ConfigVar(
+        name="list_files_max_entries",
+        description="The most entries the list_files tool returns in one call",
+        env="OCLA_LIST_FILES_MAX_ENTRIES",
+        config_file_property="listFilesMaxEntries",
+        default="1000",
+        validator_fn=lambda x: (
+            "" if x.isdigit() and int(x) > 0 else "must be a positive integer"
+        ),
+    )
+)
+
+SEARCH_MAX_RESULTS = _var(
+    ConfigVar(
+        name="search_max_results",
+        description="The most matching lines the search_code tool returns in one call",
+        env="OCLA_SEARCH_MAX_RESULTS",
+        config_file_property="searchMaxResults",
+        default="100",
+        validator_fn=lambda x: (
+            "" if x.isdigit() and int(x) > 0 else "must be a positive integer"
+        ),
+    )
+)
+
+READ_FILE_MAX_BYTES = _var(
+    ConfigVar(
+        name="read_file_max_bytes",
+        description="The most bytes of a file the read_file tool returns in one call. Longer files are returned in windows the model can page through.",
+        env="OCLA_READ_FILE_MAX_BYTES",
+        config_file_property="readFileMaxBytes",
+        default="32768",
+        validator_fn=lambda x: (
+            "" if x.isdigit() and int(x) > 0 else "must be a positive integer"
+        ),
+    )
+)
+
 THINKING_DISABLED = "DISABLED"
 THINKING_HIDDEN = "HIDDEN"
 THINKING_ENABLED = "ENABLED"
@@ -279,10 +663,14 @@ PROJECT_CONTEXT_FILE = _var(
 
 SESSION_STORAGE_MODE_PLAIN = "PLAIN"
 SESSION_STORAGE_MODE_COMPRESS = "COMPRESS"
+SESSION_STORAGE_MODE_JOURNAL = "JOURNAL"
+SESSION_STORAGE_MODE_JOURNAL_COMPRESS = "JOURNAL_COMPRESS"
 # SESSION_STORAGE_MODE_ENCRYPT = "ENCRYPT" # TODO: Implement in the future?
 VALID_SESSION_STORAGE_MODE_MODES = [
     SESSION_STORAGE_MODE_PLAIN,
     SESSION_STORAGE_MODE_COMPRESS,
+    SESSION_STORAGE_MODE_JOURNAL,
+    SESSION_STORAGE_MODE_JOURNAL_COMPRESS,
     # SESSION_STORAGE_MODE_ENCRYPT,
 ]
 
@@ -297,6 +685,8 @@ SESSION_STORAGE_MODE = _var(
         allowed_values={
             SESSION_STORAGE_MODE_PLAIN: "Plain text (JSON). Can get large.",
             SESSION_STORAGE_MODE_COMPRESS: "Compressed via gzip",
+            SESSION_STORAGE_MODE_JOURNAL: "Append-only journal (JSON lines). Only new messages are written on save.",
+            SESSION_STORAGE_MODE_JOURNAL_COMPRESS: "Append-only journal with each record compressed via zlib",
         },
     )
 )
@@ -0,0 +1,75 @@
+"""Choosing the context window (Ollama's num_ctx) to send with a chat request.
+
+Ollama sets aside KV cache for the whole window it is asked for, so asking for
+CONTEXT_WINDOW on every request costs memory and prompt-processing time that a
+short session doesn't need. With CONTEXT_SIZING=ADAPTIVE the request asks for
+the smallest bucket that fits the history, the tool schemas and a reply.
+
+Changing num_ctx makes Ollama reload the model, so the buckets double, from
+`_MIN_BUCKET` up to CONTEXT_WINDOW, and the size chosen for a model never
+shrinks while ocla runs: a growing session reloads the model a few times at
+most, and compaction or pruning don't cause reloads at all.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import math
+import threading
+from typing import Any, Dict, List, Sequence
+
+from ocla.config import CONTEXT_SIZING, CONTEXT_SIZING_ADAPTIVE, CONTEXT_WINDOW
+
+_MIN_BUCKET = 2048
+# Tokens kept free for the model's reply.
+_RESPONSE_RESERVE = 1024
+# Message token counts are estimates (words, without a tokenizer); pad them.
+_ESTIMATE_MARGIN = 1.25
+# Characters per token, for the tool schemas.
+_SCHEMA_CHARS_PER_TOKEN = 4
+
+# The largest size asked for so far, per model.
+_chosen: Dict[str, int] = {}
+_lock = threading.Lock()
+
+
+def buckets(limit: int) -> List[int]:
+    """The sizes that may be asked for when the most allowed is *limit*."""
+    sizes = []
+    size = _MIN_BUCKET
+    while size < limit:
+        sizes.append(size)
+        size *= 2
+    return sizes + [limit]
+
+
+def _schema_tokens(tools: Sequence[Any]) -> int:
+    text = json.dumps([t.describe() for t in tools], default=str)
+    return len(text) // _SCHEMA_CHARS_PER_TOKEN
+
+
+def needed_tokens(message_tokens: int, tools: Sequence[Any]) -> int:
+    """Tokens a request with *message_tokens* of history and *tools* may fill."""
+    return (
+        math.ceil(message_tokens * _ESTIMATE_MARGIN)
+        + _schema_tokens(tools)
+        + _RESPONSE_RESERVE
+    )
+
+
+def context_window(model: str, message_tokens: int, tools: Sequence[Any]) -> int:
+    """The num_ctx to send for a request to *model*."""
+    limit = int(CONTEXT_WINDOW.get())
+    if CONTEXT_SIZING.get() != CONTEXT_SIZING_ADAPTIVE:
+        return limit
+
+    needed = needed_tokens(message_tokens, tools)
+    size = next(b for b in buckets(limit) if b >= needed or b == limit)
+    with _lock:
+        # A size from a larger, earlier CONTEXT_WINDOW no longer applies.
+        previous = min(_chosen.get(model, 0), limit)
+        size = _chosen[model] = max(size, previous)
+    if size > previous:
+        logging.debug(f"context size for {model}: {size} tokens ({needed} needed)")
+    return size
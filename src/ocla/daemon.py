@@ -0,0 +1,211 @@
+"""`ocla serve`: keep ocla loaded between invocations.
+
+Starting ocla means importing its dependencies, building HTTP clients, loading
+a tokenizer and parsing and re-counting the session, which is most of the time
+a short ONESHOT prompt takes. `ocla serve` does that once and then listens on a
+Unix socket (DAEMON_SOCKET). The `ocla` command (see `ocla.client`) hands its
+arguments, working directory and environment to the daemon, which runs them
+exactly as `ocla` would have and streams the output back. Providers, the
+tokenizer, the symbol index connection and loaded sessions stay warm from one
+request to the next.
+
+The protocol is one JSON object per line. The client opens with
+
+    {"argv": [...], "cwd": "...", "env": {...},
+     "stdin_tty": bool, "terminal": bool, "width": int | null}
+
+and the daemon answers with any number of
+
+    {"output": "text", "stream": "stdout" | "stderr"}
+    {"prompt": "rich markup"}  -> the client replies {"reply": "text" | null}
+    {"stdin": true}            -> the client replies {"stdin": "all of stdin"}
+
+followed by {"exit": code}.
+
+Requests run one at a time: the working directory, environment and config
+are process-wide, and each request sets its own. Logging goes to the daemon's
+stderr, at the daemon's log level.
+"""
+
+from __future__ import annotations
+
+import io
+import json
+import logging
+import os
+import signal
+import socket
+import socketserver
+import sys
+from typing import Any, BinaryIO, Dict, Optional
+
+from ocla.cli_io import error, info
+
+# Set while this process is serving.
+_server: Optional[socketserver.UnixStreamServer] = None
+
+
+class _Connection:
+    def __init__(self, rfile: BinaryIO, wfile: BinaryIO) -> None:
+        self._rfile = rfile
+        self._wfile = wfile
+
+    def send(self, **message: Any) -> None:
+        self._wfile.write(json.dumps(message).encode("utf-8") + b"\n")
+        self._wfile.flush()
+
+    def receive(self) -> Dict[str, Any]:
+        line = self._rfile.readline()
+        if not line:
+            raise ConnectionError("ocla client went away")
+        return json.loads(line)
+
+    def ask(self, prompt: str) -> Optional[str]:
+        self.send(prompt=prompt)
+        return self.receive().get("reply")
+
+
+class _Output(io.TextIOBase):
+    """A stdout or stderr that writes to the client."""
+
+    def __init__(self, connection: _Connection, stream: str, tty: bool) -> None:
+        self._connection = connection
+        self._stream = stream
+        self._tty = tty
+
+    def writable(self) -> bool:
+        return True
+
+    def isatty(self) -> bool:
+        return self._tty
+
+    def write(self, text: str) -> int:
+        if text:
+            self._connection.send(output=text, stream=self._stream)
+        return len(text)
+
+
+class _Input(io.TextIOBase):
+    """The client's stdin, fetched only if it is read."""
+
+    def __init__(self, connection: _Connection, tty: bool) -> None:
+        self._connection = connection
+        self._tty = tty
+
+    def readable(self) -> bool:
+        return True
+
+    def isatty(self) -> bool:
+        return self._tty
+
+    def read(self, size: Optional[int] = -1) -> str:
+        self._connection.send(stdin=True)
+        return self._connection.receive().get("stdin") or ""
+
+
+def _exit_code(e: SystemExit) -> int:
+    if e.code is None:
+        return 0
+    if isinstance(e.code, int):
+        return e.code
+    print(e.code, file=sys.stderr)
+    return 1
+
+
+def _run(connection: _Connection, request: Dict[str, Any]) -> int:
+    """Run one ocla invocation for a client, as if it had run in its terminal."""
+    from ocla import cli, cli_io
+
+    terminal = bool(request.get("terminal"))
+    saved_cwd = os.getcwd()
+    saved_env = dict(os.environ)
+    saved_stdio = sys.stdin, sys.stdout, sys.stderr
+    try:
+        os.chdir(request["cwd"])
+        os.environ.clear()
+        os.environ.update(request.get("env") or {})
+        sys.stdin = _Input(connection, bool(request.get("stdin_tty")))
+        sys.stdout = _Output(connection, "stdout", terminal)
+        sys.stderr = _Output(connection, "stderr", terminal)
+        with cli_io.remote_terminal(
+            sys.stdout, connection.ask, terminal=terminal, width=request.get("width")
+        ):
+            try:
+                cli.main(list(request.get("argv") or []))
+            except SystemExit as e:
+                return _exit_code(e)
+            except ConnectionError:
+                raise
+            except Exception as e:
+                logging.exception("request failed")
+                error(f"{type(e).__name__}: {e}")
+                return 1
+        return 0
+    finally:
+        sys.stdin, sys.stdout, sys.stderr = saved_stdio
+        os.environ.clear()
+        os.environ.update(saved_env)
+        os.chdir(saved_cwd)
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        connection = _Connection(self.rfile, self.wfile)
+        try:
+            code = _run(connection, connection.receive())
+            connection.send(exit=code)
+        except (ConnectionError, OSError) as e:
+            logging.debug(f"ocla client disconnected: {e}")
+        except ValueError as e:
+            logging.warning(f"bad request from ocla client: {e}")
+
+
+def is_serving(path: str) -> bool:
+    """Whether something accepts connections on the socket at *path*."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(path)
+        except OSError:
+            return False
+    return True
+
+
+def _warm_up() -> None:
+    # Load what the first request would otherwise pay for.
+    from ocla import cli
+    from ocla.providers import get_provider
+    from ocla.session import _get_token_encoder
+    from ocla.config import MODEL
+
+    cli._warm_sessions = {}
+    get_provider()
+    _get_token_encoder(MODEL.get())
+    for tool in cli.ALL_TOOLS.values():
+        tool.describe()
+
+
+def serve(path: str) -> None:
+    """Serve ocla requests on the Unix socket at *path* until interrupted."""
+    global _server
+    if _server is not None or is_serving(path):
+        error(f"ocla is already serving on {path}")
+        sys.exit(1)
+    if os.path.exists(path):
+        os.unlink(path)  # left behind by a daemon that didn't shut down cleanly
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+    _warm_up()
+    # Relative socket paths are relative to where the daemon started.
+    path = os.path.abspath(path)
+    _server = socketserver.UnixStreamServer(path, _Handler)
+    # Remove the socket when stopped with SIGTERM too, not just Ctrl-C.
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    try:
+        os.chmod(path, 0o600)
+        info(f"Serving ocla on {path}")
+        _server.serve_forever()
+    finally:
+        _server.server_close()
+        _server = None
+        if os.path.exists(path):
+            os.unlink(path)
@@ -0,0 +1,149 @@
+"""Append-only session journal.
+
+A journal file starts with a plain JSON header line, followed by one record per
+line. Records are JSON objects, optionally zlib-compressed and base64 encoded so
+that each record still occupies exactly one line:
+
+    {"journal": 1, "compress": false}
+    {"op": "append", "message": {...}, "tokens": 12}
+    {"op": "reset"}
+
+A record is only considered written once its trailing newline is on disk, so a
+crash mid-write leaves a torn tail that is discarded (and truncated) on load.
+"""
+
+import base64
+import json
+import logging
+import os
+import zlib
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+JOURNAL_VERSION = 1
+_HEADER_PREFIX = b'{"journal":'
+
+OP_APPEND = "append"
+OP_RESET = "reset"
+
+
+def is_journal(raw: bytes) -> bool:
+    """True if *raw* looks like the start of a journal file."""
+    return raw.startswith(_HEADER_PREFIX)
+
+
+def _header(compress: bool) -> bytes:
+    return (
+        json.dumps({"journal": JOURNAL_VERSION, "compress": compress}).encode("utf-8")
+        + b"\n"
+    )
+
+
+def _encode_record(record: Dict[str, Any], compress: bool) -> bytes:
+    data = json.dumps(record, separators=(",", ":")).encode("utf-8")
+    if compress:
+        data = base64.b64encode(zlib.compress(data))
+    return data + b"\n"
+
+
+def _decode_record(line: bytes, compress: bool) -> Dict[str, Any]:
+    if compress:
+        line = zlib.decompress(base64.b64decode(line, validate=True))
+    record = json.loads(line.decode("utf-8"))
+    if not isinstance(record, dict) or "op" not in record:
+        raise ValueError("malformed journal record")
+    return record
+
+
+def append_record(message: Dict[str, Any], tokens: int) -> Dict[str, Any]:
+    return {"op": OP_APPEND, "message": message, "tokens": tokens}
+
+
+def reset_record() -> Dict[str, Any]:
+    return {"op": OP_RESET}
+
+
+@dataclass
+class JournalState:
+    """The result of replaying a journal."""
+
+    compress: bool = False
+    messages: List[Dict[str, Any]] = field(default_factory=list)
+    message_tokens: List[Optional[int]] = field(default_factory=list)
+    # Number of records on disk (excluding the header).
+    records: int = 0
+    # True if a torn or corrupt tail was discarded while reading.
+    recovered: bool = False
+
+
+def read_journal(path: str, raw: Optional[bytes] = None) -> JournalState:
+    """Replay the journal at *path*, truncating any torn or corrupt tail.
+
+    *raw* may be passed if the caller has already read the file.
+    """
+    if raw is None:
+        with open(path, "rb") as f:
+            raw = f.read()
+
+    header_end = raw.find(b"\n")
+    if header_end < 0 or not is_journal(raw):
+        raise ValueError(f"{path} is not a session journal")
+
+    header = json.loads(raw[:header_end].decode("utf-8"))
+    state = JournalState(compress=bool(header.get("compress", False)))
+
+    offset = header_end + 1
+    valid_end = offset
+    while offset < len(raw):
+        end = raw.find(b"\n", offset)
+        if end < 0:
+            break  # torn tail: record was never fully written
+
+        try:
+            record = _decode_record(raw[offset:end], state.compress)
+        except Exception as e:
+            logging.warning(f"Discarding corrupt journal record in {path}: {e}")
+            break
+
+        if record["op"] == OP_APPEND:
+            state.messages.append(record.get("message", {}))
+            state.message_tokens.append(record.get("tokens"))
+        elif record["op"] == OP_RESET:
+            state.messages.clear()
+            state.message_tokens.clear()
+
+        state.records += 1
+        offset = valid_end = end + 1
+
+    if valid_end < len(raw):
+        logging.warning(
+            f"Recovered session journal {path}: dropped {len(raw) - valid_end} trailing bytes"
+        )
+        state.recovered = True
+        try:
+            with open(path, "r+b") as f:
+                f.truncate(valid_end)
+        except OSError as e:
+            logging.warning(f"Could not truncate session journal {path}: {e}")
+
+    return state
+
+
+def append_journal(path: str, records: List[Dict[str, Any]], compress: bool) -> None:
+    """Append *records* to an existing journal with a single write."""
+    if not records:
+        return
+    data = b"".join(_encode_record(r, compress) for r in records)
+    with open(path, "ab") as f:
+        f.write(data)
+
+
+def write_journal(path: str, records: List[Dict[str, Any]], compress: bool) -> None:
+    """Atomically replace *path* with a fresh journal containing *records*."""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_header(compress))
+        f.writelines(_encode_record(r, compress) for r in records)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
@@ -0,0 +1,140 @@
+"""Which paths the agent's tools may touch.
+
+A `PathPolicy` is bound to a workspace root (the working directory), which is
+resolved once. Paths are resolved one component at a time on top of their
+parent directory, and resolved directories are cached, so checking many paths
+in the same tree costs roughly one `lstat` each rather than a full `resolve()`.
+
+Cached directories are not invalidated if a symlink is later created in their
+place; the agent itself never creates symlinks.
+"""
+
+from __future__ import annotations
+
+import fnmatch
+import functools
+import os
+from pathlib import Path
+from typing import Optional, Sequence
+
+from ocla.config import PATH_ALLOW, PATH_DENY
+
+# How many resolved directories each policy remembers.
+_DIR_CACHE_SIZE = 4096
+
+
+def _globs(value: Optional[str]) -> tuple[str, ...]:
+    return tuple(g.strip() for g in (value or "").split(",") if g.strip())
+
+
+class PathPolicy:
+    """Allows paths inside *root* without hidden components, adjusted by globs.
+
+    *deny* globs reject a path even if it would otherwise be allowed, and
+    *allow* globs admit hidden paths. Both match the path relative to the
+    root, or any of its parent directories. Nothing outside the root is ever
+    allowed.
+    """
+
+    def __init__(
+        self,
+        root: str | os.PathLike,
+        allow: Sequence[str] = (),
+        deny: Sequence[str] = (),
+    ) -> None:
+        self.cwd = os.fspath(root)
+        self.root = Path(os.path.realpath(root))
+        self.allow = tuple(allow)
+        self.deny = tuple(deny)
+        self._root = str(self.root)
+        self._prefix = (
+            self._root if self._root.endswith(os.sep) else self._root + os.sep
+        )
+        self._resolve_dir = functools.lru_cache(maxsize=_DIR_CACHE_SIZE)(
+            os.path.realpath
+        )
+
+    def resolve(self, path: Path | str) -> str:
+        """Absolute, symlink-free form of *path*; relative paths start at the root."""
+        return self._resolve(Path(path).expanduser())
+
+    def _resolve(self, original: Path) -> str:
+        # str() of a Path is already normalised, so plain string operations
+        # give the same parent and name as pathlib without building new Paths.
+        text = str(original)
+        absolute = text if original.is_absolute() else os.path.join(self._root, text)
+
+        head, name = os.path.split(absolute)
+        parent = self._resolve_dir(head)
+        if not name or name == ".":
+            return parent
+        if name == "..":
+            return os.path.dirname(parent)
+
+        candidate = os.path.join(parent, name)
+        return os.path.realpath(candidate) if os.path.islink(candidate) else candidate
+
+    def _relative(self, resolved: str) -> Optional[str]:
+        if resolved == self._root:
+            return ""
+        if resolved.startswith(self._prefix):
+            return resolved[len(self._prefix) :].replace(os.sep, "/")
+        return None
+
+    @staticmethod
+    def _matches(globs: tuple[str, ...], rel: str) -> bool:
+        if not globs or not rel:
+            return False
+        parts = rel.split("/")
+        prefixes = ["/".join(parts[: i + 1]) for i in range(len(parts))]
+        return any(fnmatch.fnmatchcase(p, g) for g in globs for p in prefixes)
+
+    def allows(self, path: Path | str, *, for_write: bool = False) -> bool:
+        try:
+            original = Path(path).expanduser()
+            resolved = self._resolve(original)
+        except (
+            OSError,
+            RuntimeError,
+        ):  # bad symlink or permission error while resolving
+            return False
+
+        # 1. Must live under the root
+        rel = self._relative(resolved)
+        if rel is None:
+            return False
+
+        # 2. Explicit configuration
+        if self._matches(self.deny, rel):
+            return False
+        if self._matches(self.allow, rel):
+            return True
+
+        # 3. Reject hidden components anywhere in the *unresolved* path
+        if any(
+            part.startswith(".") and part not in (".", "..") for part in original.parts
+        ):
+            return False
+
+        # 4. Ignore existence so long as path stays within the root
+        return True
+
+
+_policy: Optional[PathPolicy] = None
+
+
+def current_policy() -> PathPolicy:
+    """The policy for the current working directory and configuration."""
+    global _policy
+    cwd = os.getcwd()
+    allow = _globs(PATH_ALLOW.get())
+    deny = _globs(PATH_DENY.get())
+    policy = _policy
+    if (
+        policy is None
+        or policy.cwd != cwd
+        or policy.allow != allow
+        or policy.deny != deny
+    ):
+        policy = _policy = PathPolicy(cwd, allow, deny)
+    return policy
@@ -1,10 +1,17 @@
 from __future__ import annotations
 
 import abc
+import asyncio
 import dataclasses
-from typing import Iterable, Any, Optional
+import importlib
+import logging
+import threading
+import weakref
+from typing import AsyncIterator, Callable, Iterable, Iterator, Any, Optional, TypeVar
 
-from ocla.config import PROVIDER
+from ocla.aio import iterate_sync
+from ocla.cache import cache_get, cache_put
+from ocla.config import PROVIDER, MODEL_INFO_TTL
 
 @dataclasses.dataclass
 class ModelInfo:
@@ -12,38 +19,182 @@ class ModelInfo:
     context_length: Optional[int] = None
     supports_thinking: Optional[bool] = None
 
+
+T = TypeVar("T")
+
+
 class Provider(abc.ABC):
     """Abstract base class for model providers."""
 
     name: str
 
+    def __init__(self) -> None:
+        self._model_info_memo: dict[tuple[str, str], dict[str, Any]] = {}
+        self._async_clients: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
     @abc.abstractmethod
     def initialization_check(self, model: str) -> None:
         """Optional provider specific initialization checks."""
 
+    @abc.abstractmethod
+    def endpoint(self) -> str:
+        """The API endpoint this provider talks to, without connecting to it."""
+
+    def connection_settings(self) -> tuple:
+        """Everything its clients were built from; a new provider is needed if it changes."""
+        return (self.endpoint(),)
+
+    def model_digest(self, model: str) -> Optional[str]:
+        """An identifier that changes whenever *model*'s weights change, if known."""
+        return None
+
     def model_info(self, model: str) -> ModelInfo:
-        """Get info for the given model."""
+        """Get info for the given model.
+
+        Results are memoized for the life of this provider, and cached on disk
+        for MODEL_INFO_TTL seconds. Once that expires, the cached info is reused
+        if the model's digest has not changed. Either way, info recorded for a
+        different digest than the model has now (e.g. it was pulled again) is
+        looked up afresh.
+        """
+        try:
+            digest = self.model_digest(model)
+        except Exception as e:  # pragma: no cover - network errors
+            logging.debug(f"failed to fetch digest for {model}: {e}")
+            digest = None
+
+        def current(entry) -> bool:
+            return not digest or entry.get("digest") in (None, digest)
+
+        endpoint = self.endpoint()
+        memo = self._model_info_memo.get((endpoint, model))
+        if memo is not None and current(memo):
+            return ModelInfo(**memo["info"])
+
+        key = f"{self.name}|{endpoint}|{model}"
+        ttl = int(MODEL_INFO_TTL.get())
+        cached = cache_get("model_info", key, ttl)
+        if cached is None and ttl > 0:
+            stale = cache_get("model_info", key, float("inf"))
+            if stale is not None and digest and stale.get("digest") == digest:
+                logging.debug(f"model info for {key} expired but digest unchanged")
+                cached = stale
+            elif stale is not None:
+                logging.debug(f"model info for {key} invalidated: digest changed")
+        elif cached is not None and not current(cached):
+            logging.debug(f"model info for {key} invalidated: digest changed")
+            cached = None
+
+        if cached is None:
+            cached = {
+                "digest": digest,
+                "info": dataclasses.asdict(self._fetch_model_info(model)),
+            }
+            if ttl > 0:
+                cache_put("model_info", key, cached)
+
+        self._model_info_memo[(endpoint, model)] = cached
+        return ModelInfo(**cached["info"])
+
+    def forget_model_info(self, model: str) -> None:
+        """Drop any memoized info for *model* so it is looked up again."""
+        self._model_info_memo.pop((self.endpoint(), model), None)
+
+    @abc.abstractmethod
+    def _fetch_model_info(self, model: str) -> ModelInfo:
+        """Query the provider for info about the given model."""
 
     @abc.abstractmethod
+    def achat(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[Tool],
+        thinking: bool,
+        model: str,
+        context_window: Optional[int],
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Stream a chat response as message chunks."""
+
     def chat(
-        self,messages: list[dict[str, Any]], tools: list[Tool], thinking: bool, model: str, context_window: Optional[int]
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[Tool],
+        thinking: bool,
+        model: str,
+        context_window: Optional[int],
     ) -> Iterable[dict[str, Any]]:
-        pass
+        """Synchronous version of :meth:`achat`."""
+        return iterate_sync(
+            self.achat(
+                messages=messages,
+                tools=tools,
+                thinking=thinking,
+                model=model,
+                context_window=context_window,
+            )
+        )
+
+    async def aconnect(self, model: str) -> None:
+        """Open a connection to the provider now, so the first chat doesn't wait for it."""
+
+    async def aload(self, model: str, context_window: Optional[int]) -> bool:
+        """Have *model* loaded, so the next chat doesn't wait for it.
+
+        False if the provider has nothing to load.
+        """
+        return False
+
+    async def aunload(self, model: str) -> bool:
+        """Free the memory *model* holds; False if the provider can't."""
+        return False
+
+    def _loop_local(self, factory: Callable[[], T]) -> T:
+        """An object created by *factory*, one per running event loop.
+
+        Async HTTP clients are tied to the loop they are first used on.
+        """
+        loop = asyncio.get_running_loop()
+        obj = self._async_clients.get(loop)
+        if obj is None:
+            obj = self._async_clients[loop] = factory()
+        return obj
 
     @abc.abstractmethod
     def available_models(self) -> list[ModelInfo]:
         """Return a list of available models."""
 
+    def iter_available_models(self) -> Iterator[ModelInfo]:
+        """Yield available models as their details become known."""
+        yield from self.available_models()
 
-from .ollama_provider import OllamaProvider  # noqa: E402
-from .openai_provider import OpenAIProvider  # noqa: E402
 
-_PROVIDERS: dict[str, Provider] = {
-    OllamaProvider.name: OllamaProvider(),
-    OpenAIProvider.name: OpenAIProvider(),
+# Providers are imported and constructed on first use, so commands that never
+# talk to a model don't pay for importing their client libraries.
+_PROVIDERS: dict[str, tuple[str, str]] = {
+    "ollama": (".ollama_provider", "OllamaProvider"),
+    "openai": (".openai_provider", "OpenAIProvider"),
 }
 
+_INSTANCES: dict[str, Provider] = {}
+# The connection settings each instance was created with.
+_SETTINGS: dict[str, tuple] = {}
+# Prefetching may ask for the provider from several threads at once.
+_instances_lock = threading.Lock()
+
+
+def get_provider(name: Optional[str] = None) -> Provider:
+    """Return the provider instance for *name*, or the configured provider.
 
-def get_provider() -> Provider:
-    """Return the active provider instance based on configuration."""
-    return _PROVIDERS[PROVIDER.get()]
+    Instances are reused for as long as their connection settings stay the
+    same, which matters for `ocla serve`, where they change between requests.
+    """
+    name = name or PROVIDER.get()
+    with _instances_lock:
+        instance = _INSTANCES.get(name)
+        if instance is None or instance.connection_settings() != _SETTINGS[name]:
+            module, cls = _PROVIDERS[name]
+            instance = _INSTANCES[name] = getattr(
+                importlib.import_module(module, __name__), cls
+            )()
+            _SETTINGS[name] = instance.connection_settings()
+        return instance
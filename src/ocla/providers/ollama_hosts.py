@@ -0,0 +1,139 @@
+"""Spreading chat requests over several Ollama hosts.
+
+OLLAMA_HOST_OVERRIDE may list several hosts, separated by commas. Before a
+chat is sent, hosts whose health is older than `_HEALTH_TTL` are checked by
+asking which models they have loaded (`/api/ps`). The chat then goes to a
+healthy host, preferring hosts that already have the model loaded, then the
+host with the fewest requests in flight from this process, then whichever was
+used least recently. A host that fails is marked down until it passes a
+health check again, and the request moves on to the next host if nothing had
+been streamed from the failed one yet. Requests about models (listing them,
+their details) go to any healthy host and fail over the same way.
+
+Every routing decision is logged at INFO level.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import dataclasses
+import logging
+import math
+import threading
+import time
+from typing import Iterable, Iterator, List, Optional, Sequence
+
+# Seconds a health check result is trusted for.
+_HEALTH_TTL = 15.0
+# Seconds to wait for a host to answer a health check.
+HEALTH_TIMEOUT = 2.0
+
+
+def parse_hosts(value: Optional[str]) -> List[str]:
+    """The hosts in a comma-separated OLLAMA_HOST_OVERRIDE value."""
+    return [h.strip() for h in (value or "").split(",") if h.strip()]
+
+
+def model_key(model: str) -> str:
+    """*model* as Ollama reports it, with the implied ":latest" tag."""
+    return model if ":" in model else f"{model}:latest"
+
+
+@dataclasses.dataclass
+class Host:
+    url: str
+    healthy: bool = True
+    # time.monotonic() of the last health check; never checked if -inf.
+    checked: float = -math.inf
+    # Models the host has loaded, as of the last health check or chat.
+    loaded: frozenset = frozenset()
+    in_flight: int = 0
+    # Sequence number of the last time this host was chosen.
+    last_chosen: int = 0
+
+
+class HostPool:
+    def __init__(self, urls: Sequence[str]) -> None:
+        self.hosts = [Host(url) for url in urls]
+        self._lock = threading.Lock()
+        self._choices = 0
+
+    def stale(self) -> List[Host]:
+        """Hosts whose health should be checked before routing."""
+        if len(self.hosts) < 2:
+            return []  # nothing to choose between
+        now = time.monotonic()
+        with self._lock:
+            return [h for h in self.hosts if now - h.checked > _HEALTH_TTL]
+
+    def checked(
+        self, host: Host, loaded: Optional[Iterable[str]], error: str = ""
+    ) -> None:
+        """Record a health check: the models *host* has loaded, or None if it failed."""
+        with self._lock:
+            host.checked = time.monotonic()
+            was_healthy = host.healthy
+            host.healthy = loaded is not None
+            if loaded is not None:
+                host.loaded = frozenset(loaded)
+        if was_healthy and not host.healthy:
+            logging.info(f"ollama routing: {host.url} is down ({error})")
+        elif host.healthy and not was_healthy:
+            logging.info(f"ollama routing: {host.url} is back up")
+
+    def failed(self, host: Host, error: str) -> None:
+        """Mark *host* down after a request to it failed."""
+        with self._lock:
+            host.healthy = False
+            host.checked = time.monotonic()
+        logging.info(f"ollama routing: {host.url} failed ({error}); marked down")
+
+    def choose(
+        self, model: Optional[str], exclude: Iterable[Host] = ()
+    ) -> Optional[Host]:
+        """The host to send the next request for *model* to, or None if none are left."""
+        excluded = {id(h) for h in exclude}
+        with self._lock:
+            candidates = [h for h in self.hosts if id(h) not in excluded]
+            if not candidates:
+                return None
+            # If every host looks down, try them anyway rather than give up.
+            healthy = [h for h in candidates if h.healthy] or candidates
+            key = model_key(model) if model else None
+            host = min(
+                healthy,
+                key=lambda h: (key not in h.loaded, h.in_flight, h.last_chosen),
+            )
+            self._choices += 1
+            host.last_chosen = self._choices
+
+        if len(self.hosts) > 1:
+            logging.info(
+                f"ollama routing: {model or 'request'} -> {host.url} ("
+                + ", ".join(
+                    f"{h.url}: {'up' if h.healthy else 'down'}, "
+                    f"{h.in_flight} in flight{', loaded' if key in h.loaded else ''}"
+                    for h in self.hosts
+                )
+                + ")"
+            )
+        return host
+
+    def unloaded(self, host: Host, model: str) -> None:
+        """Record that *host* no longer has *model* loaded."""
+        with self._lock:
+            host.loaded = host.loaded - {model_key(model)}
+
+    @contextlib.contextmanager
+    def busy(self, host: Host, model: str) -> Iterator[None]:
+        """Count a request to *host* as in flight for the duration."""
+        with self._lock:
+            host.in_flight += 1
+        try:
+            yield
+            # The host has the model loaded now.
+            with self._lock:
+                host.loaded = host.loaded | {model_key(model)}
+        finally:
+            with self._lock:
+                host.in_flight -= 1
@@ -1,19 +1,55 @@
 from __future__ import annotations
 
+import asyncio
 import logging
 import os
-from typing import Iterable, Any, Optional
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import AsyncIterator, Callable, Iterator, Any, Optional, TypeVar
+import httpx
 import ollama
 
-from ocla.config import OLLAMA_HOST_OVERRIDE
+from ocla.config import KEEP_ALIVE, OLLAMA_HOST_OVERRIDE
 from . import Provider, ModelInfo
+from .ollama_hosts import HEALTH_TIMEOUT, Host, HostPool, parse_hosts
+from .transport import async_transport, restart_until_first
+
+# Errors while reading a chat stream that are worth opening it again for.
+_RESTARTABLE = (httpx.ReadError, httpx.RemoteProtocolError)
+
+# How long a model listing is reused for digest lookups, in seconds.
+_LIST_MAX_AGE = 30
+
+# Upper bound on concurrent `show()` requests when listing models.
+_MODEL_INFO_WORKERS = 8
+
+T = TypeVar("T")
+
+
+def _keep_alive() -> float | str | None:
+    # Ollama reads a bare number as seconds, and anything else as a duration.
+    value = KEEP_ALIVE.get()
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return value
 
 
 class OllamaProvider(Provider):
     name = "ollama"
 
     def __init__(self) -> None:
-        self._client = None
+        super().__init__()
+        self._clients: dict[str, ollama.Client] = {}
+        self._listed = None
+        hosts = parse_hosts(self._resolve_host())
+        if not hosts:
+            raise RuntimeError(
+                f"No Ollama hosts in {self._resolve_host()!r}; set OCLA_OLLAMA_HOST to one or more URLs separated by commas"
+            )
+        self._pool = HostPool(hosts)
 
     def _resolve_host(self) -> str | None:
         return (
@@ -22,25 +58,96 @@ class OllamaProvider(Provider):
             or "http://localhost:11434"
         )
 
-    def _client_obj(self):
-        if self._client is None:
-            self._client = ollama.Client(host=self._resolve_host())
-        return self._client
+    def endpoint(self) -> str:
+        # The same hosts however they were written, in any order.
+        return ",".join(sorted(parse_hosts(self._resolve_host())))
+
+    def _sync_client(self, host: Host) -> ollama.Client:
+        if host.url not in self._clients:
+            self._clients.setdefault(host.url, ollama.Client(host=host.url))
+        return self._clients[host.url]
+
+    def _request(self, send: Callable[[ollama.Client], T]) -> T:
+        """Send a request about models, failing over between hosts like chats do.
+
+        Model details are the same everywhere, so any live host can answer.
+        """
+        tried: list[Host] = []
+        while True:
+            host = self._pool.choose(None, exclude=tried)
+            if host is None:
+                raise ConnectionError(
+                    f"No Ollama host could serve the request (tried {', '.join(h.url for h in tried)})"
+                )
+            try:
+                return send(self._sync_client(host))
+            except (ConnectionError, httpx.TransportError, ollama.ResponseError) as e:
+                server_error = (
+                    not isinstance(e, ollama.ResponseError) or e.status_code >= 500
+                )
+                if not server_error or len(self._pool.hosts) < 2:
+                    raise
+                self._pool.failed(host, f"{type(e).__name__}: {e}")
+                tried.append(host)
+
+    def _async_client(self, host: Host) -> ollama.AsyncClient:
+        clients = self._loop_local(dict)
+        if host.url not in clients:
+            # With several hosts, failing over beats retrying the same one.
+            retries = 0 if len(self._pool.hosts) > 1 else None
+            clients[host.url] = ollama.AsyncClient(
+                host=host.url, transport=async_transport(httpx, retries)
+            )
+        return clients[host.url]
+
+    async def _check_hosts(self) -> None:
+        async def check(host: Host) -> None:
+            try:
+                running = await asyncio.wait_for(
+                    self._async_client(host).ps(), HEALTH_TIMEOUT
+                )
+            except Exception as e:
+                self._pool.checked(host, None, f"{type(e).__name__}: {e}")
+            else:
+                self._pool.checked(host, [m.model for m in running.models or []])
+
+        await asyncio.gather(*(check(h) for h in self._pool.stale()))
 
     def initialization_check(self, model: str) -> None:
         import ollama
 
         try:
-            model = self._client_obj().show(model)
+            model = self._request(lambda client: client.show(model))
         except ConnectionError:
             raise RuntimeError(f"Cannot connect to Ollama at {self._resolve_host()}")
         except ollama.ResponseError:
             raise RuntimeError(
-                f"Failed to find ollama model info for '{model}'\nAvailable models: {', '.join([x.name for x in self.available_models()])}"
+                f"Failed to find ollama model info for '{model}'\nAvailable models: {', '.join(self._model_names())}"
             )
 
-    def model_info(self, model: str) -> ModelInfo:
-        info = self._client_obj().show(model)
+    def _list_models(self):
+        # Digest lookups for several models share one recent `list()` response.
+        now = time.monotonic()
+        if self._listed is None or now - self._listed[0] > _LIST_MAX_AGE:
+            self._listed = (now, self._request(lambda client: client.list()))
+        return self._listed[1]
+
+    def _model_names(self) -> list[str]:
+        try:
+            return [m.model for m in self._list_models().models or []]
+        except Exception as e:  # pragma: no cover - network errors
+            logging.debug(f"failed to list models: {e}")
+            return []
+
+    def model_digest(self, model: str) -> Optional[str]:
+        names = {model} if ":" in model else {model, f"{model}:latest"}
+        for entry in self._list_models().models or []:
+            if entry.model in names:
+                return entry.digest
+        return None
+
+    def _fetch_model_info(self, model: str) -> ModelInfo:
+        info = self._request(lambda client: client.show(model))
         context_length = None
         for key in info.modelinfo:
             if "context_length" in key or "num_ctx" in key:
@@ -56,42 +163,114 @@ class OllamaProvider(Provider):
 
         return ModelInfo(
             name=model,
-            supports_thinking="thinking" in info.capabilities,
+            supports_thinking="thinking" in (info.capabilities or []),
             context_length=context_length,
         )
 
-    def chat(
+    async def achat(
         self, messages: list[dict[str, Any]], tools: list[Any], thinking: bool, model: str, context_window: Optional[int],
-    ) -> Iterable[dict[str, Any]]:
+    ) -> AsyncIterator[dict[str, Any]]:
         opts = {}
 
         if context_window is not None:
             opts["num_ctx"] = context_window
 
-        for chunk in self._client_obj().chat(
-            model=model,
-            messages=messages,
-            tools=[t.describe() for t in tools],
-            stream=True,
-            think=thinking,
-            options=opts,
-        ):
-            yield chunk
+        await self._check_hosts()
+        tried: list[Host] = []
+        while True:
+            host = self._pool.choose(model, exclude=tried)
+            if host is None:
+                raise ConnectionError(
+                    f"No Ollama host could serve the request (tried {', '.join(h.url for h in tried)})"
+                )
+            streamed = False
+            try:
+                with self._pool.busy(host, model):
+                    stream = restart_until_first(
+                        lambda: self._async_client(host).chat(
+                            model=model,
+                            messages=messages,
+                            tools=[t.describe() for t in tools],
+                            stream=True,
+                            think=thinking,
+                            options=opts,
+                            keep_alive=_keep_alive(),
+                        ),
+                        _RESTARTABLE,
+                        host.url,
+                    )
+                    async for chunk in stream:
+                        streamed = True
+                        yield chunk
+                return
+            except (ConnectionError, httpx.TransportError, ollama.ResponseError) as e:
+                server_error = (
+                    not isinstance(e, ollama.ResponseError) or e.status_code >= 500
+                )
+                if streamed or not server_error or len(self._pool.hosts) < 2:
+                    raise
+                # Nothing was streamed yet, so the next host can take over.
+                self._pool.failed(host, f"{type(e).__name__}: {e}")
+                tried.append(host)
+
+    async def aconnect(self, model: str) -> None:
+        if len(self._pool.hosts) > 1:
+            await self._check_hosts()  # which connects to each of them
+            return
+        # Any cheap request leaves a connection open in the client's pool.
+        await asyncio.wait_for(
+            self._async_client(self._pool.hosts[0]).ps(), HEALTH_TIMEOUT
+        )
+
+    async def aload(self, model: str, context_window: Optional[int]) -> bool:
+        # A generate request without a prompt just loads the model. It has to
+        # ask for the num_ctx chats will, or the first chat reloads it.
+        opts = {} if context_window is None else {"num_ctx": context_window}
+        await self._check_hosts()
+        host = self._pool.choose(model)
+        with self._pool.busy(host, model):
+            await self._async_client(host).generate(
+                model=model, options=opts, keep_alive=_keep_alive()
+            )
+        return True
+
+    async def aunload(self, model: str) -> bool:
+        async def unload(host: Host) -> None:
+            await self._async_client(host).generate(model=model, keep_alive=0)
+            self._pool.unloaded(host, model)
+
+        hosts = self._pool.hosts
+        results = await asyncio.gather(
+            *(unload(h) for h in hosts), return_exceptions=True
+        )
+        failed = [(h, e) for h, e in zip(hosts, results) if isinstance(e, Exception)]
+        for host, e in failed:
+            logging.debug(f"failed to unload {model} on {host.url}: {e}")
+        if len(failed) == len(hosts):
+            raise failed[0][1]
+        return True
 
     def available_models(self) -> list[ModelInfo]:
+        return list(self.iter_available_models())
+
+    def iter_available_models(self) -> Iterator[ModelInfo]:
         try:
-            data = self._client_obj().list()
+            data = self._list_models()
         except Exception as e:  # pragma: no cover - network errors
             logging.debug(f"failed to list models: {e}")
-            return []
+            return
 
-        out = []
-
-        for model in data.models or []:
-            try:
-                out.append(self.model_info(model.model))
-            except Exception as e:  # pragma: no cover - network errors
-                logging.debug(f"failed to query model info: {e}")
-                continue
+        names = [model.model for model in data.models or []]
+        if not names:
+            return
 
-        return out
\ No newline at end of file
+        # Each model needs its own `show()` request; issue them concurrently.
+        with ThreadPoolExecutor(
+            max_workers=min(_MODEL_INFO_WORKERS, len(names))
+        ) as pool:
+            futures = [pool.submit(self.model_info, name) for name in names]
+            for future in as_completed(futures):
+                try:
+                    yield future.result()
+                except Exception as e:  # pragma: no cover - network errors
+                    logging.debug(f"failed to query model info: {e}")
@@ -1,16 +1,35 @@
 from __future__ import annotations
 
+import importlib
 import os, logging
-from typing import Iterable, Any, Optional
+from typing import AsyncIterator, Iterator, Any, Dict, Optional
 
 from ollama import ChatResponse, Message
-from openai import OpenAI, NotFoundError
+from openai import (
+    APIConnectionError,
+    AsyncOpenAI,
+    DefaultAsyncHttpxClient,
+    NotFoundError,
+    OpenAI,
+)
 
 from . import Provider, ModelInfo
 from ocla.tools import Tool
 from ..config import OPENAI_API_KEY
+from .transport import async_transport, restart_until_first
 import json
 
+# The httpx module openai's clients are built on: httpx itself, or the httpx2
+# fork in newer releases.
+_httpx = importlib.import_module(
+    next(
+        c for c in DefaultAsyncHttpxClient.__mro__ if c.__name__ == "AsyncClient"
+    ).__module__.partition(".")[0]
+)
+
+# Errors while reading a chat stream that are worth opening it again for.
+_RESTARTABLE = (APIConnectionError, _httpx.ReadError, _httpx.RemoteProtocolError)
+
 class ModelNotFound(RuntimeError):
     pass
 
@@ -25,6 +44,12 @@ class OpenAIProvider(Provider):
             or None
         )
 
+    def endpoint(self) -> str:
+        return os.environ.get("OPENAI_BASE_URL") or "https://api.openai.com/v1"
+
+    def connection_settings(self) -> tuple:
+        return (self.endpoint(), self._resolve_api_key())
+
     def _client_obj(self):
         if self._client is None:
             self._client = OpenAI(api_key=self._resolve_api_key())
@@ -43,10 +68,9 @@ class OpenAIProvider(Provider):
         except Exception as e:
             raise RuntimeError(f"Failed to find OpenAI model info for '{model}': {e}")
 
-    def chat(
-        self, messages: list[dict[str, Any]], tools: list[Tool], thinking: bool, model: str, context_window: Optional[int]
-    ) -> Iterable[ChatResponse]:  # pragma: no cover - placeholder
-
+    def _build_request(
+        self, messages: list[dict[str, Any]], tools: list[Tool], model: str
+    ) -> Dict[str, Any]:
         # Fix JSON encoding of tools' arguments back to openai
         for msg in messages:
             if "tool_calls" not in msg:  # key check, not hasattr
@@ -58,7 +82,7 @@ class OpenAIProvider(Provider):
                     tc["function"]["arguments"] = json.dumps(args, separators=(",", ":"))
 
         request: Dict[str, Any] = {
-            "model": model or self._default_model,
+            "model": model,
             "messages": [
                 m
                 for m
@@ -78,52 +102,97 @@ class OpenAIProvider(Provider):
                     }
                 })
 
+        return request
+
+    def _translate_chunk(
+        self, chunk: Any, tool_call_json: dict[int, dict[str, str]]
+    ) -> Iterator[Any]:
+        """Turn one streamed OpenAI chunk into ollama-style message chunks.
+
+        Tool call fragments are accumulated in *tool_call_json* until the
+        model finishes the call.
+        """
+        delta = chunk.choices[0].delta  # type: ignore[attr-defined]
+
+        for tc in getattr(delta, "tool_calls", []) or []:
+            logging.debug(tc)
+            if tc.index not in tool_call_json:
+                tool_call_json[tc.index] = {"name": None, "args": "", "id": ""}
+            logging.debug(tool_call_json)
+            if tc.function.name:
+                tool_call_json[tc.index]["name"] = tc.function.name
+            if tc.function.arguments:
+                tool_call_json[tc.index]["args"] += tc.function.arguments
+            if tc.id:
+                tool_call_json[tc.index]["id"] += tc.id
+
+        if len(tool_call_json) > 0 and chunk.choices[0].finish_reason in [
+            "tool_calls",
+            "stop",
+        ]:
+            yield {
+                "message": {
+                    "role": "assistant",
+                    "content": "",
+                    "tool_calls": [
+                        {
+                            "id": tc["id"],
+                            "type": "function",
+                            "function": {
+                                "name": tc["name"],
+                                "arguments": json.loads(tc["args"]),
+                            },
+                        }
+                        for tc in tool_call_json.values()
+                    ],
+                }
+            }
+            tool_call_json.clear()
+
+        # Emit only meaningful deltas (text or function-call updates).
+        if delta.content:
+            yield ChatResponse(
+                message={
+                    "role": "assistant",
+                    "content": delta.content or "",
+                },
+            )
+
+    def _async_client(self) -> AsyncOpenAI:
+        return self._loop_local(
+            lambda: AsyncOpenAI(
+                api_key=self._resolve_api_key(),
+                # Retries happen in the transport instead.
+                max_retries=0,
+                http_client=DefaultAsyncHttpxClient(transport=async_transport(_httpx)),
+            )
+        )
+
+    async def aconnect(self, model: str) -> None:  # pragma: no cover - network I/O
+        # Looking the model up is free, and leaves a connection in the pool.
+        await self._async_client().models.retrieve(model)
+
+    async def achat(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[Tool],
+        thinking: bool,
+        model: str,
+        context_window: Optional[int],
+    ) -> AsyncIterator[Any]:  # pragma: no cover - network I/O
+        request = self._build_request(messages, tools, model)
+        client = self._async_client()
+
         try:
             tool_call_json: dict[int, dict[str, str]] = {}
-            for chunk in self._client.chat.completions.create(stream=True, **request):
-                delta = chunk.choices[0].delta  # type: ignore[attr-defined]
-
-                for tc in (getattr(delta, "tool_calls", []) or []):
-                    logging.debug(tc)
-                    if tc.index not in tool_call_json:
-                        tool_call_json[tc.index] = {"name": None, "args": "", "id": ""}
-                    logging.debug(tool_call_json)
-                    if tc.function.name:
-                        tool_call_json[tc.index]["name"] = tc.function.name
-                    if tc.function.arguments:
-                        tool_call_json[tc.index]["args"] += tc.function.arguments
-                    if tc.id:
-                        tool_call_json[tc.index]["id"] += tc.id
-
-                if len(tool_call_json) > 0 and chunk.choices[0].finish_reason in ["tool_calls", "stop"]:
-                    yield {
-                        "message": {
-                            "role": "assistant",
-                            "content": "",
-                            "tool_calls": [
-                                {
-                                    "id": tc["id"],
-                                    "type": "function",
-                                    "function": {
-                                        "name": tc["name"],
-                                        "arguments": json.loads(tc["args"]),
-                                    }
-                                }
-                                for tc
-                                in tool_call_json.values()
-                            ]
-                        }
-                    }
-                    tool_call_json.clear()
-
-                # Emit only meaningful deltas (text or function-call updates).
-                if delta.content:
-                    yield ChatResponse(
-                        message={
-                            "role": "assistant",
-                            "content": delta.content or "",
-                        },
-                    )
+            stream = restart_until_first(
+                lambda: client.chat.completions.create(stream=True, **request),
+                _RESTARTABLE,
+                self.endpoint(),
+            )
+            async for chunk in stream:
+                for out in self._translate_chunk(chunk, tool_call_json):
+                    yield out
         except Exception as exc:  # pragma: no cover – network I/O
             raise RuntimeError(f"OpenAI streaming chat failed: {exc}") from exc
 
@@ -136,7 +205,7 @@ class OpenAIProvider(Provider):
         # `response.data` is a list of `Model` objects; each has an `id` attribute.
         return [ModelInfo(name=model.id) for model in response.data]
 
-    def model_info(self, model: str) -> ModelInfo:
+    def _fetch_model_info(self, model: str) -> ModelInfo:
         try:
             data = self._client_obj().models.retrieve(model)
         except NotFoundError:
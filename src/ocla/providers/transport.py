@@ -0,0 +1,296 @@
+"""Resilient HTTP transport shared by the providers' chat clients.
+
+Both client libraries sit on httpx (newer openai releases on its httpx2 fork,
+an API-compatible copy under another name), so the same transport serves
+both; the httpx module to build it for is passed in.
+It provides:
+
+* a keep-alive connection pool whose idle connections outlive the pause
+  between two turns, so a session doesn't reconnect for every request;
+* retries (PROVIDER_RETRIES) after dropped connections and 429/502/503/504
+  responses, with jittered exponential backoff, honouring ``Retry-After``;
+* a circuit breaker per host: after `_BREAKER_THRESHOLD` failures in a row,
+  requests to the host fail straight away for `_BREAKER_COOLDOWN` seconds,
+  after which one request is let through to probe it.
+
+Retrying a request only helps until the response starts. `restart_until_first`
+covers the rest of that window for streamed chats: if the stream breaks before
+its first chunk, the request is made again.
+
+Counts of requests, retries, restarts and failures, and response latency, are
+kept per host; see `stats`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+import email.utils
+import functools
+import logging
+import random
+import threading
+import time
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+)
+
+from ocla.config import PROVIDER_RETRIES
+
+T = TypeVar("T")
+
+_RETRY_STATUSES = {429, 502, 503, 504}
+# Backoff before retry n (from 0) is uniform in [0, min(_BACKOFF_MAX, _BACKOFF_BASE * 2**n)].
+_BACKOFF_BASE = 0.5
+_BACKOFF_MAX = 20.0
+# Longer Retry-After values are capped to this many seconds.
+_RETRY_AFTER_MAX = 60.0
+_BREAKER_THRESHOLD = 5
+_BREAKER_COOLDOWN = 30.0
+_MAX_CONNECTIONS = 20
+_MAX_KEEPALIVE_CONNECTIONS = 10
+# Seconds an idle connection is kept; long enough to span a tool call or two.
+_KEEPALIVE_EXPIRY = 120.0
+
+
+@dataclasses.dataclass
+class HostStats:
+    requests: int = 0
+    # Requests made again after a failure, and streams restarted.
+    retries: int = 0
+    restarts: int = 0
+    # Failed attempts, and requests refused because the circuit was open.
+    failures: int = 0
+    rejected: int = 0
+    # Seconds from sending a request to receiving the response headers.
+    latency_total: float = 0.0
+    latency_max: float = 0.0
+
+    @property
+    def latency_avg(self) -> float:
+        return self.latency_total / self.requests if self.requests else 0.0
+
+
+_stats: Dict[str, HostStats] = {}
+_lock = threading.Lock()
+
+
+def stats() -> Dict[str, HostStats]:
+    """A copy of the counters for each host talked to so far."""
+    with _lock:
+        return {host: dataclasses.replace(s) for host, s in _stats.items()}
+
+
+def _record(host: str, *, latency: Optional[float] = None, **counts: int) -> None:
+    with _lock:
+        s = _stats.setdefault(host, HostStats())
+        for name, n in counts.items():
+            setattr(s, name, getattr(s, name) + n)
+        if latency is not None:
+            s.latency_total += latency
+            s.latency_max = max(s.latency_max, latency)
+
+
+class _Breaker:
+    def __init__(self) -> None:
+        self.failures = 0
+        self.opened: Optional[float] = None
+        self.probing = False
+
+    def allow(self) -> bool:
+        with _lock:
+            if self.opened is None:
+                return True
+            if not self.probing and time.monotonic() - self.opened >= _BREAKER_COOLDOWN:
+                self.probing = True  # half open: let one request find out
+                return True
+            return False
+
+    def success(self) -> None:
+        with _lock:
+            self.failures = 0
+            self.opened = None
+            self.probing = False
+
+    def failure(self, host: str) -> None:
+        with _lock:
+            self.failures += 1
+            opening = self.probing or (
+                self.opened is None and self.failures >= _BREAKER_THRESHOLD
+            )
+            if opening:
+                self.opened = time.monotonic()
+            self.probing = False
+        if opening:
+            logging.info(
+                f"transport: opening circuit for {host} after {self.failures} failures"
+            )
+
+
+_breakers: Dict[str, _Breaker] = {}
+
+
+def _breaker(host: str) -> _Breaker:
+    with _lock:
+        return _breakers.setdefault(host, _Breaker())
+
+
+def backoff(attempt: int) -> float:
+    """Seconds to wait before retry number *attempt* (counting from 0)."""
+    return random.uniform(0, min(_BACKOFF_MAX, _BACKOFF_BASE * 2**attempt))
+
+
+def retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds asked for by a ``Retry-After`` header, in seconds or as a date."""
+    if not value:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            when = email.utils.parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        seconds = when.timestamp() - time.time()
+    return min(max(seconds, 0.0), _RETRY_AFTER_MAX)
+
+
+def _gave_up(e: BaseException) -> bool:
+    # Whether the transport already retried the request that raised *e*.
+    seen = set()
+    while e is not None and id(e) not in seen:
+        if getattr(e, "_ocla_retried", False):
+            return True
+        seen.add(id(e))
+        e = e.__cause__ or e.__context__
+    return False
+
+
+@functools.lru_cache(maxsize=None)
+def _transport_class(module: Any) -> type:
+    retryable = (
+        module.NetworkError,
+        module.RemoteProtocolError,
+        module.ConnectTimeout,
+        module.PoolTimeout,
+    )
+
+    class RetryingTransport(module.AsyncBaseTransport):
+        def __init__(self, inner: Any, retries: Optional[int]) -> None:
+            self._inner = inner
+            self._retries = retries
+
+        async def handle_async_request(self, request: Any) -> Any:
+            host = f"{request.url.scheme}://{request.url.host}:{request.url.port or ''}".rstrip(
+                ":"
+            )
+            retries = (
+                int(PROVIDER_RETRIES.get()) if self._retries is None else self._retries
+            )
+            breaker = _breaker(host)
+            attempt = 0
+            while True:
+                if not breaker.allow():
+                    _record(host, rejected=1)
+                    raise module.ConnectError(
+                        f"{host} failed repeatedly; not retrying for {_BREAKER_COOLDOWN:.0f}s",
+                        request=request,
+                    )
+                _record(host, requests=1)
+                started = time.monotonic()
+                try:
+                    response = await self._inner.handle_async_request(request)
+                except retryable as e:
+                    breaker.failure(host)
+                    _record(host, failures=1)
+                    if attempt >= retries:
+                        e._ocla_retried = True
+                        raise
+                    reason, delay = f"{type(e).__name__}: {e}", backoff(attempt)
+                else:
+                    _record(host, latency=time.monotonic() - started)
+                    status = response.status_code
+                    if status not in _RETRY_STATUSES:
+                        breaker.success()
+                        return response
+                    if status == 429:
+                        breaker.success()  # busy, but there
+                    else:
+                        breaker.failure(host)
+                        _record(host, failures=1)
+                    if attempt >= retries:
+                        return response
+                    reason = f"HTTP {status}"
+                    delay = retry_after(response.headers.get("Retry-After"))
+                    if delay is None:
+                        delay = backoff(attempt)
+                    await response.aclose()
+
+                attempt += 1
+                _record(host, retries=1)
+                logging.info(
+                    f"transport: {request.method} {request.url} failed ({reason}); "
+                    f"retry {attempt}/{retries} in {delay:.1f}s"
+                )
+                await asyncio.sleep(delay)
+
+        async def aclose(self) -> None:
+            await self._inner.aclose()
+
+    return RetryingTransport
+
+
+def async_transport(module: Any, retries: Optional[int] = None) -> Any:
+    """A pooled, retrying async transport for *module* (httpx or httpx2).
+
+    *retries* overrides PROVIDER_RETRIES, e.g. when failing over to another
+    host beats retrying the same one.
+    """
+    limits = module.Limits(
+        max_connections=_MAX_CONNECTIONS,
+        max_keepalive_connections=_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=_KEEPALIVE_EXPIRY,
+    )
+    return _transport_class(module)(module.AsyncHTTPTransport(limits=limits), retries)
+
+
+async def restart_until_first(
+    open_stream: Callable[[], Awaitable[AsyncIterator[T]]],
+    retryable: Tuple[Type[BaseException], ...],
+    host: str,
+) -> AsyncIterator[T]:
+    """Items of the stream *open_stream* makes, opening it again if it fails
+    with one of *retryable* before producing anything."""
+    retries = int(PROVIDER_RETRIES.get())
+    attempt = 0
+    while True:
+        try:
+            stream = await open_stream()
+            first = await stream.__anext__()
+        except StopAsyncIteration:
+            return
+        except retryable as e:
+            if attempt >= retries or _gave_up(e):
+                raise
+            delay = backoff(attempt)
+            attempt += 1
+            _record(host, restarts=1)
+            logging.info(
+                f"transport: stream from {host} failed before its first chunk "
+                f"({type(e).__name__}: {e}); restart {attempt}/{retries} in {delay:.1f}s"
+            )
+            await asyncio.sleep(delay)
+            continue
+        break
+
+    yield first
+    async for item in stream:
+        yield item
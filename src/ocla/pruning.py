@@ -0,0 +1,189 @@
+"""Rule-based pruning of stale tool results before the history is sent.
+
+Old tool output (whole files, diffs, directory listings) makes up most of a
+long session, yet the model rarely needs it again verbatim. Before each
+request, tool results that are older than PRUNE_TOOL_RESULTS_AFTER prompts, or
+that a later call has superseded (the same call made again, or a write to a
+file that was read), are replaced by a short stub. Only the copy sent to
+the model is pruned; the stored session keeps everything.
+
+Some results refer back to the previous result of the same call instead of
+repeating it (see `ocla.read_cache`). The result they refer to is never
+pruned while they are sent, and the message number in them is rewritten to
+match the history as it is sent, since compaction renumbers messages.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import json
+import os
+import re
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from ocla.session import _message_tokens
+
+# Tools whose results depend only on the contents of the file at "path".
+_FILE_TOOLS = {"read_file", "write_file"}
+
+# Start of a result that refers back to the previous result of the same call.
+_BACK_REFERENCE = re.compile(r"^\[(unchanged|changed) since message #(\d+)")
+
+
+def back_reference(kind: str, index: int) -> str:
+    """Opening of a result that is *kind* ("unchanged" or "changed") since message #*index*."""
+    return f"[{kind} since message #{index}"
+
+
+@dataclasses.dataclass
+class PruneResult:
+    messages: List[Dict[str, Any]]
+    # Indices into the original history of the results that were stubbed.
+    pruned: List[int]
+    tokens_saved: int
+
+
+def _arguments(call: Dict[str, Any]) -> Dict[str, Any]:
+    args = call.get("function", {}).get("arguments") or {}
+    if isinstance(args, str):
+        try:
+            args = json.loads(args)
+        except ValueError:
+            return {"raw": args}
+    return args if isinstance(args, dict) else {"raw": args}
+
+
+def _file_path(call: Dict[str, Any]) -> Optional[str]:
+    args = _arguments(call)
+    if call.get("function", {}).get("name") in _FILE_TOOLS and "path" in args:
+        return os.path.normpath(str(args["path"]))
+    return None
+
+
+def _resource(call: Dict[str, Any]) -> Tuple[str, ...]:
+    """What a call looked at; a later call on the same resource supersedes it."""
+    name = call.get("function", {}).get("name") or ""
+    args = _arguments(call)
+    path = _file_path(call)
+    if path is not None:
+        # Different windows of the same file are different resources.
+        rest = {k: v for k, v in args.items() if k != "path"}
+        return (name, path, json.dumps(rest, sort_keys=True, default=str))
+    return (name, json.dumps(args, sort_keys=True, default=str))
+
+
+def tool_results(
+    messages: List[Dict[str, Any]],
+) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """Pair each tool result with the call that produced it, as (index, call)."""
+    calls: List[Dict[str, Any]] = []
+    for i, m in enumerate(messages):
+        role = m.get("role")
+        if role == "assistant":
+            calls = list(m.get("tool_calls") or [])
+        elif role == "tool":
+            if calls:
+                yield i, calls.pop(0)
+        else:
+            calls = []
+
+
+def _stub(message: Dict[str, Any], call: Dict[str, Any], reason: str) -> Dict[str, Any]:
+    name = call.get("function", {}).get("name") or message.get("name")
+    args = json.dumps(_arguments(call), sort_keys=True, default=str)
+    stub = dict(message)
+    stub["content"] = (
+        f"[output of {name} {args} pruned: {reason}. Call the tool again if you need it.]"
+    )
+    return stub
+
+
+def prune_history(
+    messages: List[Dict[str, Any]],
+    message_tokens: List[int],
+    after_turns: int,
+    model: Optional[str] = None,
+) -> PruneResult:
+    """Return the history to send to the model, with stale tool results stubbed.
+
+    An *after_turns* of 0 disables pruning; back references are still fixed up.
+    """
+    # Prompt number each message belongs to.
+    turn = 0
+    turns = []
+    for m in messages:
+        if m.get("role") == "user":
+            turn += 1
+        turns.append(turn)
+
+    results = list(tool_results(messages))
+    latest: Dict[Tuple[str, ...], int] = {}
+    writes: Dict[str, int] = {}
+    # Back references, mapped to the result they refer to (None if it is gone).
+    refers_to: Dict[int, Optional[int]] = {}
+    previous: Dict[Tuple[str, ...], int] = {}
+    for i, call in results:
+        resource = _resource(call)
+        if _BACK_REFERENCE.match(str(messages[i].get("content") or "")):
+            refers_to[i] = previous.get(resource)
+        else:
+            latest[resource] = i
+        previous[resource] = i
+        path = _file_path(call)
+        if path is not None and call.get("function", {}).get("name") == "write_file":
+            writes[path] = i
+
+    # A back reference is kept unless a full result supersedes it, and then
+    # so is what it refers to; walk newest first to follow chains of them.
+    protected = set()
+    for i, call in reversed(results):
+        target = refers_to.get(i, None)
+        if target is not None and (
+            latest.get(_resource(call), -1) < i or i in protected
+        ):
+            protected.add(target)
+
+    pruned = list(messages)
+    indices = []
+    saved = 0
+    for i, call in results:
+        if i in refers_to and refers_to[i] is None:
+            # What it refers to was compacted away, so it means nothing now.
+            pruned[i] = _stub(messages[i], call, "the result it refers to is gone")
+            indices.append(i)
+            saved += max(0, message_tokens[i] - _message_tokens(pruned[i], model))
+            continue
+        if i in refers_to:
+            content = str(messages[i]["content"])
+            m = _BACK_REFERENCE.match(content)
+            if int(m.group(2)) != refers_to[i]:
+                pruned[i] = dict(messages[i])
+                pruned[i]["content"] = (
+                    back_reference(m.group(1), refers_to[i]) + content[m.end() :]
+                )
+
+        if after_turns <= 0 or i in protected:
+            continue
+        newer = latest.get(_resource(call), -1)
+        path = _file_path(call)
+        if path is not None and writes.get(path, -1) > newer:
+            newer = writes[path]
+        if newer > i:
+            reason = f"superseded by the result in message #{newer}"
+        elif turn - turns[i] >= after_turns:
+            reason = f"more than {after_turns} prompts old"
+        else:
+            continue
+
+        stub = _stub(messages[i], call, reason)
+        delta = message_tokens[i] - _message_tokens(stub, model)
+        if delta <= 0:
+            continue  # already smaller than its stub
+
+        pruned[i] = stub
+        indices.append(i)
+        saved += delta
+
+    if pruned == messages:
+        pruned = messages  # nothing to change
+    return PruneResult(messages=pruned, pruned=indices, tokens_saved=saved)
@@ -0,0 +1,186 @@
+"""Session-scoped cache of the read_file results the model has already seen.
+
+Models often read the same file several times in one session, and every copy
+is sent again with each request. The cache remembers, for each read_file call
+(path plus window arguments), the content last returned along with the file's
+mtime, size and a hash of that content. When the same call is made again:
+
+* if the file's mtime and size are unchanged, the file is not read at all
+  and the result is a short "[unchanged since message #k ...]" reference;
+* if the file was touched but reads the same, the result is that reference too;
+* if it changed, the result is a unified diff against the cached content,
+  unless the full content is shorter.
+
+References are only handed out while message #k is still sent to the model
+as-is. `ocla.pruning` keeps the results references point to and renumbers them
+after compaction; see `back_reference` there.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import difflib
+import hashlib
+import logging
+import os
+import threading
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from ocla.config import DEDUPE_FILE_READS
+from ocla.pruning import _file_path, _resource, back_reference
+
+# Lines of context around each change in a diff.
+_DIFF_CONTEXT = 2
+
+# Whether message #index, which was *message* when stored, is still sent as-is.
+Visible = Callable[[int, Dict[str, Any]], bool]
+
+
+@dataclasses.dataclass
+class _Entry:
+    content: str
+    mtime_ns: int
+    size: int
+    digest: str
+    # The latest result message for the call, once it has been added.
+    index: int = -1
+    message: Optional[Dict[str, Any]] = None
+
+
+def _stat(path: str) -> Optional[Tuple[int, int]]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def _digest(content: str) -> str:
+    return hashlib.sha256(content.encode("utf-8", errors="surrogatepass")).hexdigest()
+
+
+class ReadCache:
+    """What read_file returned earlier in one session.
+
+    `execute` runs a call (possibly skipping the read); `record` must then be
+    called with the message its output was stored in, for every read_file
+    call, so the cache's idea of "the previous result" matches the history.
+    """
+
+    def __init__(self) -> None:
+        self._entries: Dict[Tuple[str, ...], _Entry] = {}
+        # Keyed by id() of calls that have run but are not recorded yet.
+        self._pending: Dict[int, Tuple[Tuple[str, ...], Optional[_Entry]]] = {}
+        self._lock = threading.Lock()
+
+    def execute(
+        self,
+        call: Dict[str, Any],
+        execute: Callable[[Dict[str, Any]], str],
+        visible: Visible,
+    ) -> str:
+        path = _file_path(call)
+        if call.get("function", {}).get("name") != "read_file" or path is None:
+            return execute(call)
+
+        key = _resource(call)
+        with self._lock:
+            entry = self._entries.get(key)
+            # Another read of the same window in this batch: it will be the
+            # previous result, so don't refer past it.
+            duplicate = any(k == key for k, _ in self._pending.values())
+        if entry is not None and not visible(entry.index, entry.message):
+            logging.debug(
+                f"read cache: dropped {path}, message #{entry.index} is no longer sent as-is"
+            )
+            entry = None
+        if duplicate or DEDUPE_FILE_READS.get() != "ENABLED":
+            entry = None
+
+        before = _stat(path)
+        if entry is not None and before == (entry.mtime_ns, entry.size):
+            logging.debug(f"read cache: {path} unchanged since message #{entry.index}")
+            self._hold(call, key, dataclasses.replace(entry))
+            return self._unchanged(path, entry)
+
+        output = execute(call)
+        after = _stat(path)
+        if before is None or after != before:
+            # Missing, or changed while it was read: don't cache it.
+            self._hold(call, key, None)
+            return output
+
+        fresh = _Entry(output, after[0], after[1], _digest(output))
+        self._hold(call, key, fresh)
+        if entry is None:
+            return output
+        if entry.digest == fresh.digest:
+            logging.debug(
+                f"read cache: {path} was touched but its content is unchanged"
+            )
+            return self._unchanged(path, entry)
+
+        logging.debug(
+            f"read cache: invalidated {path} "
+            f"(mtime {entry.mtime_ns} -> {after[0]}, size {entry.size} -> {after[1]})"
+        )
+        diff = "".join(
+            difflib.unified_diff(
+                entry.content.splitlines(keepends=True),
+                output.splitlines(keepends=True),
+                fromfile=f"message #{entry.index}",
+                tofile="now",
+                n=_DIFF_CONTEXT,
+            )
+        )
+        header = (
+            back_reference("changed", entry.index)
+            + f": {path} was modified. Apply this diff to the result there.]\n"
+        )
+        if len(header) + len(diff) < len(output):
+            return header + diff
+        return output
+
+    def record(self, call: Dict[str, Any], index: int, message: Dict[str, Any]) -> None:
+        """Note that *call*'s result was added to the history as message #*index*."""
+        if (
+            call.get("function", {}).get("name") != "read_file"
+            or _file_path(call) is None
+        ):
+            return
+        with self._lock:
+            key, entry = self._pending.pop(id(call), (_resource(call), None))
+            if entry is None:
+                # Not run, or not cacheable: whatever it returned is now the
+                # previous result, so nothing can refer back past it.
+                if self._entries.pop(key, None) is not None:
+                    logging.debug(
+                        f"read cache: invalidated {key[1]}, its last read was not cached"
+                    )
+                return
+            entry.index, entry.message = index, message
+            self._entries[key] = entry
+
+    def _hold(
+        self, call: Dict[str, Any], key: Tuple[str, ...], entry: Optional[_Entry]
+    ) -> None:
+        with self._lock:
+            self._pending[id(call)] = (key, entry)
+
+    @staticmethod
+    def _unchanged(path: str, entry: _Entry) -> str:
+        return (
+            back_reference("unchanged", entry.index)
+            + f": {path} reads the same as it did there.]"
+        )
+
+
+_caches: Dict[str, ReadCache] = {}
+
+
+def session_cache(name: str) -> ReadCache:
+    """The read cache for the session called *name*."""
+    cache = _caches.get(name)
+    if cache is None:
+        cache = _caches[name] = ReadCache()
+    return cache
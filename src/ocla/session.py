@@ -3,10 +3,11 @@ import json
 import gzip
 import logging
 import os
+import sqlite3
 import sys
 import time
+import typing
 
-import tiktoken
 from datetime import timezone
 from dataclasses import dataclass, field
 from typing import List, Dict, Any, Optional
@@ -16,14 +17,29 @@ from .config import (
     SESSION_STORAGE_MODE,
     SESSION_STORAGE_MODE_PLAIN,
     SESSION_STORAGE_MODE_COMPRESS,
+    SESSION_STORAGE_MODE_JOURNAL,
+    SESSION_STORAGE_MODE_JOURNAL_COMPRESS,
     CONTEXT_WINDOW,
     PROVIDER,
+    MODEL,
 )
 
 from datetime import datetime
 from pathlib import Path
 
+from ocla.journal import (
+    is_journal,
+    read_journal,
+    append_journal,
+    write_journal,
+    append_record,
+    reset_record,
+)
 from ocla.state import load_state, save_state
+from ocla import catalog
+
+if typing.TYPE_CHECKING:
+    import tiktoken
 
 DEFAULT_SYSTEM_PROMPT = """
 You are a software development agent named OCLA, helping users understand, write and debug code.
@@ -61,6 +77,20 @@ def _encode_data(data: bytes, mode: str) -> bytes:
     raise ValueError(f"Unknown SESSION_STORAGE_MODE: {mode}")
 
 
+_JOURNAL_MODES = (SESSION_STORAGE_MODE_JOURNAL, SESSION_STORAGE_MODE_JOURNAL_COMPRESS)
+
+# A journal is compacted once it holds more dead records (superseded by a reset)
+# than live ones, and at least this many.
+_JOURNAL_COMPACT_MIN_DEAD = 32
+
+
+def _detect_mode(data: bytes) -> str:
+    """Work out how a non-journal session file was encoded from its contents."""
+    if data[:2] == b"\x1f\x8b":  # gzip magic
+        return SESSION_STORAGE_MODE_COMPRESS
+    return SESSION_STORAGE_MODE_PLAIN
+
+
 def _decode_data(data: bytes, mode: str) -> bytes:
     """Reverse of :func:`_encode_data` for the given *mode*."""
     if mode == SESSION_STORAGE_MODE_PLAIN:
@@ -71,7 +101,10 @@ def _decode_data(data: bytes, mode: str) -> bytes:
 
 
 @functools.lru_cache(maxsize=None)
-def _get_token_encoder(model: str | None) -> tiktoken.Encoding | None:
+def _get_token_encoder(model: str | None) -> "tiktoken.Encoding | None":
+    # tiktoken is slow to import; only load it once we need to count tokens.
+    import tiktoken
+
     if model:
         try:
             return tiktoken.encoding_for_model(model)
@@ -102,24 +135,51 @@ def _estimate_tokens(text: str, model: str | None = None) -> int:
         return len(text.split())
 
 
+def _tokenizer_key(model: str | None) -> str:
+    """Identify the tokenizer used for *model* so stale ledgers can be detected."""
+    enc = _get_token_encoder(model)
+    return f"{model}:{enc.name if enc is not None else 'words'}"
+
+
+def _message_tokens(message: Dict[str, Any], model: str | None) -> int:
+    content = message.get("content", "")
+    if not content:
+        return 0
+    return _estimate_tokens(str(content), model)
+
+
 @dataclass
 class Session:
     name: str
     path: str = field(init=False)
     meta_path: str = field(init=False)
+    # Messages removed by compaction, one JSON line per compaction.
+    archive_path: str = field(init=False)
     messages: List[Dict[str, Any]] = field(default_factory=list)
     storage_mode: str = field(init=False)
     provider: str = field(init=False)
     tokens: int = field(init=False, default=0)
+    # Token count of each entry in `messages`, computed once on append.
+    message_tokens: List[int] = field(init=False, default_factory=list)
+    tokenizer: str = field(init=False, default="")
+    compactions: int = field(init=False, default=0)
+    # Journal bookkeeping: messages/records already on disk, and whether the
+    # in-memory history no longer extends what was journaled.
+    _journaled: int = field(init=False, default=0, repr=False)
+    _journal_records: int = field(init=False, default=0, repr=False)
+    _history_replaced: bool = field(init=False, default=False, repr=False)
 
     def __post_init__(self):
         # file locations
         self.path = os.path.join(SESSION_DIR.get(), f"{self.name}.session")
         self.meta_path = os.path.join(SESSION_DIR.get(), f"{self.name}.meta")
+        self.archive_path = os.path.join(SESSION_DIR.get(), f"{self.name}.archive")
 
         # (1) load metadata (if any) so we know how to decode the session file
         now_iso = datetime.now(timezone.utc).isoformat()
         self.provider = PROVIDER.get()
+        self.tokenizer = _tokenizer_key(MODEL.get())
+        stored_tokenizer = None
         update_meta = False
         if os.path.exists(self.meta_path):
             with open(self.meta_path, "r", encoding="utf-8") as f:
@@ -127,7 +187,8 @@ class Session:
             self.created = meta.get("created", now_iso)
             self.used = meta.get("used", now_iso)
             self.storage_mode = meta.get("storage_mode", SESSION_STORAGE_MODE.get())
-            self.tokens = int(meta.get("tokens", 0))
+            stored_tokenizer = meta.get("tokenizer")
+            self.compactions = int(meta.get("compactions", 0))
             meta_provider = meta.get("provider")
             if meta_provider:
                 if meta_provider != self.provider:
@@ -146,8 +207,32 @@ class Session:
         if os.path.exists(self.path):
             with open(self.path, "rb") as f:
                 raw = f.read()
-            decoded = _decode_data(raw, self.storage_mode)
-            self.messages = json.loads(decoded.decode("utf-8")).get("messages", [])
+            if is_journal(raw):
+                journal = read_journal(self.path, raw)
+                self.messages = journal.messages
+                ledger = journal.message_tokens
+                self._journaled = len(journal.messages)
+                self._journal_records = journal.records
+            else:
+                # The file format is detected rather than trusted from .meta so
+                # that a crash part way through a migration can still be read.
+                decoded = _decode_data(raw, _detect_mode(raw))
+                data = json.loads(decoded.decode("utf-8"))
+                self.messages = data.get("messages", [])
+                ledger = data.get("message_tokens")
+            if (
+                stored_tokenizer == self.tokenizer
+                and isinstance(ledger, list)
+                and len(ledger) == len(self.messages)
+                and all(isinstance(x, int) for x in ledger)
+            ):
+                self.message_tokens = [int(x) for x in ledger]
+                self.tokens = sum(self.message_tokens)
+            else:
+                # Legacy session, or the model/tokenizer changed since it was saved.
+                self.recount_tokens()
+                self._history_replaced = True
+                update_meta = True
 
         if len(self.messages) == 0:
             self.add({"role": "system", "content": DEFAULT_SYSTEM_PROMPT})
@@ -170,63 +255,154 @@ class Session:
                     f"project context file {PROJECT_CONTEXT_FILE.get()} could not be read"
                 )
 
-        self.tokens = self.token_count()
         if update_meta:
             self._write_meta()
 
     def _write_meta(self) -> None:
         os.makedirs(SESSION_DIR.get(), exist_ok=True)
+        meta = {
+            "created": self.created,
+            "used": self.used,
+            "storage_mode": self.storage_mode,
+            "tokens": self.tokens,
+            "tokenizer": self.tokenizer,
+            "provider": self.provider,
+            "compactions": self.compactions,
+        }
         with open(self.meta_path, "w", encoding="utf-8") as f:
-            json.dump(
-                {
-                    "created": self.created,
-                    "used": self.used,
-                    "storage_mode": self.storage_mode,
-                    "tokens": self.token_count(),
-                    "provider": self.provider,
-                },
-                f,
-                indent=2,
-            )
+            json.dump(meta, f, indent=2)
+        catalog.record(self.name, meta)
 
     def save(self) -> None:
         """Persist messages and bump 'used' timestamp."""
         os.makedirs(SESSION_DIR.get(), exist_ok=True)
-        self.storage_mode = SESSION_STORAGE_MODE.get()
-        data = json.dumps({"messages": self.messages}, indent=2).encode("utf-8")
-        encoded = _encode_data(data, self.storage_mode)
-        with open(self.path, "wb") as f:
-            f.write(encoded)
+        mode = SESSION_STORAGE_MODE.get()
+        if mode in _JOURNAL_MODES:
+            self._save_journal(mode)
+        else:
+            data = json.dumps(
+                {"messages": self.messages, "message_tokens": self.message_tokens},
+                indent=2,
+            ).encode("utf-8")
+            encoded = _encode_data(data, mode)
+            with open(self.path, "wb") as f:
+                f.write(encoded)
+            self._journaled = self._journal_records = 0
+        self.storage_mode = mode
 
         self.used = datetime.now(timezone.utc).isoformat()
-        self.tokens = self.token_count()
         self._write_meta()
 
     def add(self, message: Dict[str, Any]) -> None:
         """Append a message and immediately save the session."""
+        count = _message_tokens(message, MODEL.get())
         self.messages.append(message)
+        self.message_tokens.append(count)
+        self.tokens += count
 
-        if self.token_count() > int(CONTEXT_WINDOW.get()):
+        if self.tokens > int(CONTEXT_WINDOW.get()):
             raise ContextWindowExceededError(
-                f"Context window exceeded ({self.token_count()} / {CONTEXT_WINDOW.get()}). Please start a new session"
+                f"Context window exceeded ({self.tokens} / {CONTEXT_WINDOW.get()}). Please start a new session"
             )
 
         self.save()
 
+    def _save_journal(self, mode: str) -> None:
+        compress = mode == SESSION_STORAGE_MODE_JOURNAL_COMPRESS
+        dead = self._journal_records - self._journaled
+
+        if (
+            self.storage_mode != mode
+            or not os.path.exists(self.path)
+            or (dead > len(self.messages) and dead >= _JOURNAL_COMPACT_MIN_DEAD)
+        ):
+            # Migrating from another storage mode, or compacting.
+            self.compact_storage(mode)
+            return
+
+        if self._history_replaced or self._journaled > len(self.messages):
+            records = [reset_record()]
+            start = 0
+        else:
+            records = []
+            start = self._journaled
+
+        records.extend(
+            append_record(m, t)
+            for m, t in zip(self.messages[start:], self.message_tokens[start:])
+        )
+        append_journal(self.path, records, compress)
+        self._journal_records += len(records)
+        self._journaled = len(self.messages)
+        self._history_replaced = False
+
+    def compact_storage(self, mode: str | None = None) -> None:
+        """Rewrite the session journal so it only holds the current messages."""
+        mode = mode or SESSION_STORAGE_MODE.get()
+        if mode not in _JOURNAL_MODES:
+            raise ValueError(f"Cannot compact session in storage mode {mode}")
+
+        write_journal(
+            self.path,
+            [append_record(m, t) for m, t in zip(self.messages, self.message_tokens)],
+            mode == SESSION_STORAGE_MODE_JOURNAL_COMPRESS,
+        )
+        self._journaled = self._journal_records = len(self.messages)
+        self._history_replaced = False
+
+    def replace_messages(self, messages: List[Dict[str, Any]]) -> None:
+        """Replace the whole history; the next save rewrites it on disk."""
+        self.messages = list(messages)
+        self.recount_tokens()
+        self._history_replaced = True
+
+    def compact(self, start: int, end: int, summary: Dict[str, Any]) -> None:
+        """Replace messages[start:end] with *summary*, archiving the originals."""
+        os.makedirs(SESSION_DIR.get(), exist_ok=True)
+        record = {
+            "compacted_at": datetime.now(timezone.utc).isoformat(),
+            "messages": self.messages[start:end],
+            "message_tokens": self.message_tokens[start:end],
+            "summary": summary,
+        }
+        with open(self.archive_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+        self.messages[start:end] = [summary]
+        self.message_tokens[start:end] = [_message_tokens(summary, MODEL.get())]
+        self.tokens = sum(self.message_tokens)
+        self._history_replaced = True
+        self.compactions += 1
+        self.save()
+
+    def archived_messages(self) -> List[Dict[str, Any]]:
+        """Messages removed by earlier compactions, oldest first."""
+        if not os.path.exists(self.archive_path):
+            return []
+
+        messages = []
+        with open(self.archive_path, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    messages.extend(json.loads(line)["messages"])
+        return messages
+
     def token_count(self) -> int:
         """Estimate how many tokens are contained in this session."""
-        from .config import MODEL
+        return self.tokens
 
-        total = 0
-        for m in self.messages:
-            content = m.get("content", "")
-            if content:
-                total += _estimate_tokens(str(content), MODEL.get())
-        return total
+    def recount_tokens(self) -> None:
+        """Rebuild the per-message token ledger with the current tokenizer."""
+        model = MODEL.get()
+        self.tokenizer = _tokenizer_key(model)
+        self.message_tokens = [_message_tokens(m, model) for m in self.messages]
+        self.tokens = sum(self.message_tokens)
 
 
 def _ensure_dirs() -> None:
-    os.makedirs(SESSION_DIR.get(), exist_ok=True)
+    os.makedirs(SESSION_DIR.get() or ".", exist_ok=True)
 
 
 @dataclass
@@ -270,23 +446,73 @@ def load_session_meta(name: str) -> SessionInfo | None:
     )
 
 
-def list_sessions() -> List[SessionInfo]:
-    _ensure_dirs()
+def _info_from_catalog(row) -> SessionInfo:
+    return SessionInfo(
+        name=row["name"],
+        created=datetime.fromisoformat(row["created"].replace("Z", "+00:00")),
+        used=datetime.fromisoformat(row["used"].replace("Z", "+00:00")),
+        tokens=row["tokens"],
+        provider=row["provider"] or PROVIDER.get(),
+    )
 
-    infos = []
 
+def _sessions_from_meta() -> List[SessionInfo]:
+    # What the catalog would list, read from the .meta files instead.
+    infos = []
     for f in os.listdir(SESSION_DIR.get() or "."):
         if not f.endswith(".meta"):
             continue
+        try:
+            infos.append(load_session_meta(f.removesuffix(".meta")))
+        except (OSError, ValueError, KeyError) as e:
+            logging.warning(f"Skipping unreadable session metadata {f}: {e}")
+    return sorted(infos, key=lambda i: (-i.used.timestamp(), i.name))
+
+
+def list_sessions(limit: int | None = None, offset: int = 0) -> List[SessionInfo]:
+    """Sessions from the catalog, most recently used first."""
+    _ensure_dirs()
 
-        if info := load_session_meta(f.removesuffix(".meta")):
-            infos.append(info)
+    try:
+        return [_info_from_catalog(row) for row in catalog.rows(limit, offset)]
+    except sqlite3.Error as e:
+        logging.warning(f"Failed to read session catalog, reading .meta files: {e}")
+    infos = _sessions_from_meta()[offset:]
+    return infos if limit is None else infos[:limit]
 
-    return sorted(infos, key=lambda s: [s.used], reverse=True)
+
+def count_sessions() -> int:
+    _ensure_dirs()
+
+    try:
+        return catalog.count()
+    except sqlite3.Error as e:
+        logging.warning(f"Failed to read session catalog, reading .meta files: {e}")
+    return len(_sessions_from_meta())
+
+
+def reindex_sessions() -> int:
+    """Rebuild the session catalog from the .meta files on disk."""
+    _ensure_dirs()
+
+    return catalog.rebuild()
 
 
 def session_exists(name: str) -> bool:
-    return any([x for x in list_sessions() if x.name == name])
+    _ensure_dirs()
+
+    # The catalog may have drifted (e.g. sessions copied in or deleted by
+    # hand), so the .meta file decides.
+    meta_path = os.path.join(SESSION_DIR.get(), name + ".meta")
+    if not os.path.exists(meta_path):
+        if catalog.get(name) is not None:
+            catalog.forget(name)
+        return False
+
+    if catalog.get(name) is None:
+        with open(meta_path, "r", encoding="utf-8") as fp:
+            catalog.record(name, json.load(fp))
+    return True
 
 
 def get_current_session_name() -> Optional[str]:
@@ -0,0 +1,450 @@
+"""Persistent index of the functions, classes and methods in the workspace.
+
+Python files are parsed with `ast`; other languages fall back to a handful of
+regular expressions per file type. The index lives in SQLite at
+SYMBOL_INDEX_FILE and is brought up to date incrementally: only files whose
+mtime or size changed since they were last indexed are parsed again, and the
+list of files from a recent directory walk is reused.
+"""
+
+import ast
+import dataclasses
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from .config import SYMBOL_INDEX_FILE
+from .walker import walk
+
+# Bump when extraction changes so existing indexes are rebuilt.
+_INDEX_VERSION = 1
+
+# Larger files are most likely generated, and not worth indexing.
+_MAX_FILE_SIZE = 1 << 20
+
+# For this many seconds after walking a directory, updates only stat the files
+# that walk found, so files created since are picked up a little later.
+_WALK_MAX_AGE = 10.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS symbols (
+    path TEXT NOT NULL REFERENCES files (path) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    line INTEGER NOT NULL,
+    end_line INTEGER,
+    parent TEXT,
+    signature TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS symbols_name ON symbols (name COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS symbols_path ON symbols (path, line);
+"""
+
+
+@dataclasses.dataclass
+class Symbol:
+    name: str
+    kind: str
+    line: int
+    signature: str
+    end_line: Optional[int] = None
+    # Name of the enclosing class or function, if any.
+    parent: Optional[str] = None
+    path: str = ""
+
+    def qualified_name(self) -> str:
+        return f"{self.parent}.{self.name}" if self.parent else self.name
+
+
+def _python_symbols(text: str) -> List[Symbol]:
+    tree = ast.parse(text)
+    out: List[Symbol] = []
+
+    def visit(node: ast.AST, parent: Optional[str], in_class: bool) -> None:
+        for child in ast.iter_child_nodes(node):
+            if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                prefix = (
+                    "async def" if isinstance(child, ast.AsyncFunctionDef) else "def"
+                )
+                signature = f"{prefix} {child.name}({ast.unparse(child.args)})"
+                if child.returns is not None:
+                    signature += f" -> {ast.unparse(child.returns)}"
+                kind = "method" if in_class else "function"
+            elif isinstance(child, ast.ClassDef):
+                bases = ", ".join(ast.unparse(b) for b in child.bases)
+                signature = (
+                    f"class {child.name}({bases})" if bases else f"class {child.name}"
+                )
+                kind = "class"
+            else:
+                visit(child, parent, in_class)
+                continue
+
+            out.append(
+                Symbol(
+                    name=child.name,
+                    kind=kind,
+                    line=child.lineno,
+                    end_line=child.end_lineno,
+                    parent=parent,
+                    signature=signature,
+                )
+            )
+            qualified = f"{parent}.{child.name}" if parent else child.name
+            visit(child, qualified, kind == "class")
+
+    visit(tree, None, False)
+    return out
+
+
+_C_LIKE = [
+    (
+        re.compile(
+            r"^\s*(?:public |private |protected |internal |abstract |final |static |sealed |export |default )*(?:class|interface|enum|struct|record)\s+(\w+)",
+            re.M,
+        ),
+        "class",
+    ),
+]
+
+_REGEX_SYMBOLS: Dict[str, List[Tuple[re.Pattern, str]]] = {
+    # Only used for Python files that don't parse.
+    "py": [
+        (re.compile(r"^\s*(?:async\s+)?def\s+(\w+)", re.M), "function"),
+        (re.compile(r"^\s*class\s+(\w+)", re.M), "class"),
+    ],
+    "js": [
+        (
+            re.compile(
+                r"^\s*(?:export\s+)?(?:default\s+)?(?:async\s+)?function\s*\*?\s*(\w+)",
+                re.M,
+            ),
+            "function",
+        ),
+        (
+            re.compile(
+                r"^\s*(?:export\s+)?(?:default\s+)?(?:abstract\s+)?class\s+(\w+)", re.M
+            ),
+            "class",
+        ),
+        (
+            re.compile(
+                r"^\s*(?:export\s+)?(?:const|let|var)\s+(\w+)\s*=\s*(?:async\s*)?(?:\([^)]*\)|\w+)\s*=>",
+                re.M,
+            ),
+            "function",
+        ),
+        (
+            re.compile(r"^\s*(?:export\s+)?(?:interface|type|enum)\s+(\w+)", re.M),
+            "class",
+        ),
+    ],
+    "go": [
+        (re.compile(r"^func\s+(?:\([^)]*\)\s*)?(\w+)", re.M), "function"),
+        (re.compile(r"^type\s+(\w+)\s+(?:struct|interface)", re.M), "class"),
+    ],
+    "rs": [
+        (
+            re.compile(
+                r"^\s*(?:pub(?:\([^)]*\))?\s+)?(?:async\s+)?(?:unsafe\s+)?fn\s+(\w+)",
+                re.M,
+            ),
+            "function",
+        ),
+        (
+            re.compile(
+                r"^\s*(?:pub(?:\([^)]*\))?\s+)?(?:struct|enum|trait|union)\s+(\w+)",
+                re.M,
+            ),
+            "class",
+        ),
+    ],
+    "rb": [
+        (re.compile(r"^\s*def\s+(?:self\.)?(\w+[?!=]?)", re.M), "function"),
+        (re.compile(r"^\s*(?:class|module)\s+(\w+)", re.M), "class"),
+    ],
+    "php": [
+        (
+            re.compile(
+                r"^\s*(?:(?:public|private|protected|static|abstract|final)\s+)*function\s+(\w+)",
+                re.M,
+            ),
+            "function",
+        ),
+        (
+            re.compile(
+                r"^\s*(?:abstract\s+|final\s+)?(?:class|interface|trait)\s+(\w+)", re.M
+            ),
+            "class",
+        ),
+    ],
+    "c": _C_LIKE
+    + [
+        (
+            re.compile(
+                r"^[A-Za-z_][\w\s\*&:<>,]*?\b(\w+)\s*\([^;{]*\)\s*(?:const\s*)?\{", re.M
+            ),
+            "function",
+        ),
+    ],
+}
+
+_LANGUAGES = {
+    ".js": "js",
+    ".jsx": "js",
+    ".mjs": "js",
+    ".cjs": "js",
+    ".ts": "js",
+    ".tsx": "js",
+    ".go": "go",
+    ".rs": "rs",
+    ".rb": "rb",
+    ".php": "php",
+    ".c": "c",
+    ".h": "c",
+    ".cc": "c",
+    ".cpp": "c",
+    ".hpp": "c",
+    ".cs": "c",
+    ".java": "c",
+    ".kt": "c",
+    ".swift": "c",
+    ".scala": "c",
+}
+
+# Keywords that the C-like function pattern would otherwise pick up.
+_NOT_FUNCTIONS = {"if", "for", "while", "switch", "catch", "return", "sizeof", "else"}
+
+
+def _regex_symbols(text: str, language: str) -> List[Symbol]:
+    out = []
+    seen = set()
+    for regex, kind in _REGEX_SYMBOLS[language]:
+        for m in regex.finditer(text):
+            name = m.group(1)
+            if name in _NOT_FUNCTIONS:
+                continue
+            line = text.count("\n", 0, m.start(1)) + 1
+            if (name, line) in seen:
+                continue
+            seen.add((name, line))
+            end = text.find("\n", m.start(1))
+            signature = text[m.start() : end if end != -1 else len(text)].strip()
+            out.append(
+                Symbol(name=name, kind=kind, line=line, signature=signature[:200])
+            )
+    return sorted(out, key=lambda s: s.line)
+
+
+def extract_symbols(path: str, text: str) -> List[Symbol]:
+    """Symbols defined in *text*, the contents of the file at *path*."""
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".py":
+        try:
+            return _python_symbols(text)
+        except (SyntaxError, ValueError, RecursionError):
+            return _regex_symbols(text, "py")
+    if ext in _LANGUAGES:
+        return _regex_symbols(text, _LANGUAGES[ext])
+    return []
+
+
+def is_indexable(path: str) -> bool:
+    ext = os.path.splitext(path)[1].lower()
+    return ext == ".py" or ext in _LANGUAGES
+
+
+@dataclasses.dataclass
+class UpdateStats:
+    files: int = 0
+    parsed: int = 0
+    removed: int = 0
+
+
+_local = threading.local()
+# One update at a time; concurrent tool calls would only repeat the work.
+_update_lock = threading.Lock()
+# (index file, working directory, root) -> (when it was walked, what was found)
+_walked: Dict[Tuple[str, str, str], Tuple[float, List[Tuple[str, str]]]] = {}
+
+
+def _connect() -> sqlite3.Connection:
+    path = os.path.abspath(SYMBOL_INDEX_FILE.get())
+    conns = getattr(_local, "conns", None)
+    if conns is None:
+        conns = _local.conns = {}
+
+    conn = conns.get(path)
+    if conn is not None and os.path.exists(path):
+        return conn
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    conn = sqlite3.connect(path, timeout=10)
+    conn.row_factory = sqlite3.Row
+    # The index can always be rebuilt, so trade durability for write speed.
+    conn.execute("PRAGMA synchronous=OFF")
+    conn.execute("PRAGMA foreign_keys=ON")
+    if conn.execute("PRAGMA user_version").fetchone()[0] != _INDEX_VERSION:
+        conn.executescript("DROP TABLE IF EXISTS symbols; DROP TABLE IF EXISTS files;")
+        conn.execute(f"PRAGMA user_version={_INDEX_VERSION}")
+    conn.executescript(_SCHEMA)
+    conns[path] = conn
+    return conn
+
+
+def _index_path(path: str) -> str:
+    """How *path* is keyed in the index: relative to the working directory."""
+    return os.path.relpath(path) if os.path.isabs(path) else os.path.normpath(path)
+
+
+def _indexable_files(root: str) -> List[Tuple[str, str]]:
+    """(index path, filesystem path) of each indexable file at or under *root*."""
+    if os.path.isfile(root):
+        return [(_index_path(root), root)] if is_indexable(root) else []
+
+    key = (os.path.abspath(SYMBOL_INDEX_FILE.get()), os.getcwd(), _index_path(root))
+    now = time.monotonic()
+    walked = _walked.get(key)
+    if walked is not None and now - walked[0] < _WALK_MAX_AGE:
+        return walked[1]
+
+    files = [
+        (_index_path(os.path.join(root, entry.rel)), entry.path)
+        for entry in walk(root)
+        if not entry.is_dir and is_indexable(entry.rel)
+    ]
+    _walked[key] = (now, files)
+    return files
+
+
+def update_index(root: str = ".") -> UpdateStats:
+    """Bring the index up to date with the file or directory at *root*."""
+    stats = UpdateStats()
+    with _update_lock:
+        conn = _connect()
+        known = {
+            row["path"]: (row["mtime_ns"], row["size"])
+            for row in conn.execute("SELECT path, mtime_ns, size FROM files")
+        }
+        seen = set()
+
+        with conn:
+            for path, fs_path in _indexable_files(root):
+                try:
+                    st = os.stat(fs_path)
+                except OSError:
+                    continue
+                if st.st_size > _MAX_FILE_SIZE:
+                    continue
+                seen.add(path)
+                stats.files += 1
+                if known.get(path) == (st.st_mtime_ns, st.st_size):
+                    continue
+
+                try:
+                    with open(fs_path, "r", encoding="utf-8", errors="replace") as f:
+                        symbols = extract_symbols(path, f.read())
+                except OSError as e:
+                    logging.debug(f"could not index {path}: {e}")
+                    continue
+
+                conn.execute("DELETE FROM files WHERE path = ?", (path,))
+                conn.execute(
+                    "INSERT INTO files (path, mtime_ns, size) VALUES (?, ?, ?)",
+                    (path, st.st_mtime_ns, st.st_size),
+                )
+                conn.executemany(
+                    "INSERT INTO symbols (path, name, kind, line, end_line, parent, signature)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    [
+                        (
+                            path,
+                            s.name,
+                            s.kind,
+                            s.line,
+                            s.end_line,
+                            s.parent,
+                            s.signature,
+                        )
+                        for s in symbols
+                    ],
+                )
+                stats.parsed += 1
+
+            # Forget files under root that were deleted, or are now ignored.
+            prefix = _index_path(root)
+            gone = [
+                p
+                for p in known
+                if p not in seen
+                and (prefix == "." or p == prefix or p.startswith(prefix + os.sep))
+            ]
+            conn.executemany("DELETE FROM files WHERE path = ?", [(p,) for p in gone])
+            stats.removed = len(gone)
+
+    return stats
+
+
+def _symbol(row: sqlite3.Row) -> Symbol:
+    return Symbol(
+        name=row["name"],
+        kind=row["kind"],
+        line=row["line"],
+        end_line=row["end_line"],
+        parent=row["parent"],
+        signature=row["signature"],
+        path=row["path"],
+    )
+
+
+def find_symbols(
+    name: str, kind: Optional[str] = None, limit: int = 50
+) -> List[Symbol]:
+    """Symbols called *name*; if there are none, those whose name contains it.
+
+    *name* may be qualified with its class, e.g. "Session.save".
+    """
+    parent = None
+    if "." in name:
+        parent, name = name.rsplit(".", 1)
+
+    where = ""
+    args: list = []
+    if kind:
+        where += " AND kind = ?"
+        args.append(kind)
+    if parent:
+        where += " AND (parent = ? OR parent LIKE ?)"
+        args += [parent, f"%.{parent}"]
+
+    conn = _connect()
+    rows = conn.execute(
+        f"SELECT * FROM symbols WHERE name = ? COLLATE NOCASE{where}"
+        " ORDER BY name != ?, path, line LIMIT ?",
+        [name, *args, name, limit],
+    ).fetchall()
+    if not rows:
+        escaped = name.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        rows = conn.execute(
+            f"SELECT * FROM symbols WHERE name LIKE ? ESCAPE '\\'{where}"
+            " ORDER BY length(name), path, line LIMIT ?",
+            [f"%{escaped}%", *args, limit],
+        ).fetchall()
+    return [_symbol(r) for r in rows]
+
+
+def file_symbols(path: str) -> List[Symbol]:
+    """Symbols in the file at *path*, in the order they appear."""
+    rows = _connect().execute(
+        "SELECT * FROM symbols WHERE path = ? ORDER BY line", (_index_path(path),)
+    )
+    return [_symbol(r) for r in rows]
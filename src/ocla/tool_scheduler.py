@@ -0,0 +1,90 @@
+"""Run the tool calls from a single model turn, overlapping safe ones.
+
+Calls that may run unattended (read-only tools that don't need the user's
+permission) are started on a worker pool as soon as they are reached. Any other
+call acts as a barrier: the user is asked for permission straight away, but the
+call only executes once every earlier call has finished, and later calls wait
+for it in turn. Results are always returned in the original call order.
+"""
+
+import dataclasses
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional
+
+SKIPPED_OUTPUT = "skipped tool execution because the user did not allow it"
+
+
+@dataclasses.dataclass
+class ToolRun:
+    call: Dict[str, Any]
+    output: str = ""
+    # Seconds spent executing this call, excluding any permission prompt.
+    elapsed: float = 0.0
+    concurrent: bool = False
+
+
+@dataclasses.dataclass
+class ToolBatch:
+    runs: List[ToolRun]
+    # Wall-clock seconds for the whole batch.
+    elapsed: float
+
+    @property
+    def sequential_elapsed(self) -> float:
+        """Roughly how long the batch would take running one call at a time."""
+        return sum(r.elapsed for r in self.runs)
+
+
+def _timed(run: ToolRun, execute: Callable[[Dict[str, Any]], str]) -> ToolRun:
+    start = time.monotonic()
+    run.output = execute(run.call)
+    run.elapsed = time.monotonic() - start
+    return run
+
+
+def run_tool_calls(
+    calls: List[Dict[str, Any]],
+    *,
+    runs_unattended: Callable[[Dict[str, Any]], bool],
+    confirm: Callable[[Dict[str, Any]], bool],
+    execute: Callable[[Dict[str, Any]], str],
+    max_workers: int,
+) -> ToolBatch:
+    start = time.monotonic()
+    runs = [ToolRun(call=c) for c in calls]
+    pending: List[Future] = []
+    pool: Optional[ThreadPoolExecutor] = None
+
+    try:
+        for run in runs:
+            if max_workers > 1 and runs_unattended(run.call):
+                if not confirm(run.call):
+                    run.output = SKIPPED_OUTPUT
+                    continue
+                if pool is None:
+                    pool = ThreadPoolExecutor(max_workers=max_workers)
+                run.concurrent = True
+                pending.append(pool.submit(_timed, run, execute))
+                continue
+
+            allowed = confirm(run.call)
+
+            # Barrier: earlier calls must finish before this one runs.
+            wait(pending)
+            for f in pending:
+                f.result()
+            pending = []
+
+            if allowed:
+                _timed(run, execute)
+            else:
+                run.output = SKIPPED_OUTPUT
+
+        for f in pending:
+            f.result()
+    finally:
+        if pool is not None:
+            pool.shutdown(wait=True)
+
+    return ToolBatch(runs=runs, elapsed=time.monotonic() - start)
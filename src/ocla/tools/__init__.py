@@ -1,13 +1,16 @@
 import abc
 import enum
+import importlib
 import inspect
 import json
 import typing
-from ollama import Message, Tool as OllamaTool
-from ollama._utils import convert_function_to_tool
+from collections.abc import Mapping
 
 from ..util import pascal_to_snake, format_tool_arguments, truncate
 
+if typing.TYPE_CHECKING:
+    from ollama import Tool as OllamaTool
+
 
 class ToolSecurity(enum.Enum):
     PERMISSIBLE = "permissible"
@@ -26,7 +29,9 @@ class Tool(abc.ABC):
             self.__class__.__name__
         )
 
-    def describe(self) -> OllamaTool:
+    def describe(self) -> "OllamaTool":
+        from ollama._utils import convert_function_to_tool
+
         out = convert_function_to_tool(self.execute)
         out.function.name = self.name
         assert self.description, f"tool {type(self)} does not have a description"
@@ -45,17 +50,45 @@ class Tool(abc.ABC):
         return self.execute(*args, **kwargs)
 
 
-# Import concrete tool implementations after defining the base class to avoid
-# circular imports.
-from .file_system import ListFiles, ReadFile, WriteFile
-from .git import GitShowChanges, GitCommit, GitLog
+class _ToolRegistry(Mapping):
+    """Tool instances by name, importing each tool's module on first access."""
+
+    def __init__(self, specs: dict[str, tuple[str, str]]) -> None:
+        self._specs = specs
+        self._tools: dict[str, Tool] = {}
+
+    def __getitem__(self, name: str) -> Tool:
+        if name not in self._tools:
+            module, cls = self._specs[name]
+            tool_cls = getattr(importlib.import_module(module, __name__), cls)
+            self._tools[name] = tool_cls()
+        return self._tools[name]
+
+    def __iter__(self):
+        return iter(self._specs)
 
+    def __len__(self) -> int:
+        return len(self._specs)
 
-ALL: dict[str, Tool] = {
-    "list_files": ListFiles(),
-    "read_file": ReadFile(),
-    "write_file": WriteFile(),
-    "git_show_changes": GitShowChanges(),
-    "git_commit": GitCommit(),
-    "git_log": GitLog(),
+
+_TOOL_CLASSES: dict[str, tuple[str, str]] = {
+    "list_files": (".file_system", "ListFiles"),
+    "read_file": (".file_system", "ReadFile"),
+    "write_file": (".file_system", "WriteFile"),
+    "search_code": (".search", "SearchCode"),
+    "find_symbol": (".symbols", "FindSymbol"),
+    "file_outline": (".symbols", "FileOutline"),
+    "git_show_changes": (".git", "GitShowChanges"),
+    "git_commit": (".git", "GitCommit"),
+    "git_log": (".git", "GitLog"),
 }
+
+ALL: Mapping[str, Tool] = _ToolRegistry(_TOOL_CLASSES)
+
+
+def __getattr__(name: str):
+    # Keep concrete tool classes importable from this package.
+    for module, cls in _TOOL_CLASSES.values():
+        if cls == name:
+            return getattr(importlib.import_module(module, __name__), cls)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
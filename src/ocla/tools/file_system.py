@@ -1,49 +1,210 @@
 import io
+import mmap
 from pathlib import Path
 from difflib import unified_diff
 from ocla.cli_io import info
 from rich.syntax import Syntax
 from rich.console import Console
+from ocla.config import READ_FILE_MAX_BYTES, LIST_FILES_MAX_ENTRIES
 from ocla.util import can_access_path
+from ocla.walker import walk
 
 from . import Tool, ToolSecurity
 
 
 class ListFiles(Tool):
     security = ToolSecurity.PERMISSIBLE
-    description = "List all files and folders in the requested path"
+    description = (
+        "List the files and folders in the requested path. Hidden and gitignored "
+        "entries are left out, and long listings are cut off."
+    )
 
-    def execute(self, path: str = ".", recursive: bool = False) -> (list[str], str):
+    def execute(
+        self,
+        path: str = ".",
+        recursive: bool = False,
+        max_depth: int = 0,
+        pattern: str = "",
+        limit: int = 0,
+    ) -> (list[str], str):
+        """
+        Args:
+            path: the directory to list
+            recursive: whether to list the contents of sub-folders too
+            max_depth: when recursive, how many levels of folders to descend; 0 for no limit
+            pattern: only list entries whose name (or path, if it contains a /) matches this glob
+            limit: the most entries to return; 0 uses the configured maximum
+        """
         root = Path(path)
         if not can_access_path(root):
             return [], f"OCLA cannot access: {path}"
         if not root.is_dir():
             return [], f"{path} is not a directory"
-
         try:
-            entries = []
-            paths = root.rglob("*") if recursive else root.iterdir()
-            for p in paths:
-                if can_access_path(p):
-                    entries.append(
-                        p.relative_to(root).as_posix() if recursive else p.name
-                    )
-            return sorted(entries), ""
-        except PermissionError as e:
-            return [], f"Access denied while scanning: {e}"
+            max_depth, limit = int(max_depth), int(limit)
+        except (TypeError, ValueError):
+            return [], "max_depth and limit must be integers"
+
+        cap = int(LIST_FILES_MAX_ENTRIES.get())
+        limit = min(limit, cap) if limit > 0 else cap
+        depth = (max_depth or None) if recursive else 1
+
+        entries = []
+        truncated = False
+        for entry in walk(root, max_depth=depth, pattern=pattern or None):
+            if len(entries) == limit:
+                truncated = True
+                break
+            entries.append(entry.rel)
+
+        entries.sort()
+        if truncated:
+            entries.append(
+                f"[listing stopped after {limit} entries; narrow it with path, pattern or max_depth]"
+            )
+        return entries, ""
+
+
+# Files at least this large are memory-mapped rather than read into memory.
+_MMAP_MIN_SIZE = 1 << 20
+# Bytes inspected when deciding whether a file is binary.
+_BINARY_SNIFF_SIZE = 8192
+# Newlines are counted a block at a time when seeking to a line.
+_SCAN_BLOCK = 1 << 20
+
+
+def _line_start(buf, line: int) -> int:
+    """Byte offset at which 1-based *line* starts, or -1 if the file is shorter."""
+    pos = 0
+    remaining = line - 1
+    while remaining:
+        block = buf[pos : pos + _SCAN_BLOCK]
+        if not block:
+            return -1
+        newlines = block.count(b"\n")
+        if newlines < remaining:
+            remaining -= newlines
+            pos += len(block)
+            continue
+        for _ in range(remaining):
+            pos = buf.find(b"\n", pos) + 1
+        remaining = 0
+    return pos if pos < len(buf) else -1
+
+
+def _ascii_compatible(encoding: str) -> bool:
+    """Whether *encoding* writes newlines and plain ASCII as single bytes."""
+    return "\n~".encode(encoding) == b"\n~"
+
+
+def _read_window(buf, start: int, limit: int, max_bytes: int) -> bytes:
+    """Up to *limit* lines (0 for no limit) from byte *start*, at most *max_bytes* long."""
+    end = min(len(buf), start + max_bytes)
+    chunk = buf[start:end]
+
+    if limit:
+        pos = 0
+        for _ in range(limit):
+            nl = chunk.find(b"\n", pos)
+            if nl == -1:
+                pos = len(chunk)
+                break
+            pos = nl + 1
+        chunk = chunk[:pos]
+
+    if start + len(chunk) < len(buf) and not chunk.endswith(b"\n"):
+        # Hit the byte cap mid-line; stop at the last whole line if there is one.
+        nl = chunk.rfind(b"\n")
+        if nl != -1:
+            chunk = chunk[: nl + 1]
+
+    return chunk
 
 
 class ReadFile(Tool):
     security = ToolSecurity.PERMISSIBLE
-    description = "Read the contents of a single file"
+    description = (
+        "Read the contents of a single file. Long files are returned one window of "
+        "lines at a time; use offset and limit to page through them."
+    )
 
-    def execute(self, path: str = ".", encoding: str = "utf-8") -> (str, str):
+    def execute(
+        self, path: str = ".", encoding: str = "utf-8", offset: int = 1, limit: int = 0
+    ) -> (str, str):
+        """
+        Args:
+            path: the file to read
+            encoding: the text encoding of the file
+            offset: the line to start reading from, counting from 1
+            limit: the most lines to return; 0 returns as many as fit
+        """
         file_path = Path(path)
         if not can_access_path(file_path):
             return "", f"OCLA cannot access: {path}"
         if not file_path.is_file():
             return "", f"File not found: {path}"
-        return file_path.read_text(encoding=encoding) or "this file has no content", ""
+        try:
+            offset, limit = int(offset), int(limit)
+        except (TypeError, ValueError):
+            return "", "offset and limit must be integers"
+        if offset < 1 or limit < 0:
+            return "", "offset must be at least 1 and limit must not be negative"
+
+        size = file_path.stat().st_size
+        if size == 0:
+            return "this file has no content", ""
+
+        with open(file_path, "rb") as f:
+            if size >= _MMAP_MIN_SIZE:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+                    return self._read(buf, path, encoding, offset, limit)
+            return self._read(f.read(), path, encoding, offset, limit)
+
+    def _read(
+        self, buf, path: str, encoding: str, offset: int, limit: int
+    ) -> (str, str):
+        try:
+            if not _ascii_compatible(encoding):
+                # Lines are found by their b"\n" bytes, so work on a UTF-8 copy.
+                buf = bytes(buf).decode(encoding, errors="replace").encode("utf-8")
+                encoding = "utf-8"
+        except LookupError:
+            return "", f"Unknown encoding: {encoding}"
+
+        if b"\0" in buf[:_BINARY_SNIFF_SIZE]:
+            return "", f"{path} is a binary file ({len(buf)} bytes) and cannot be shown"
+
+        start = _line_start(buf, offset)
+        if start == -1:
+            return "", f"{path} has fewer than {offset} lines"
+
+        max_bytes = int(READ_FILE_MAX_BYTES.get())
+        chunk = _read_window(buf, start, limit, max_bytes)
+        text = chunk.decode(encoding, errors="replace")
+
+        if start + len(chunk) >= len(buf):
+            return text, ""
+
+        last = offset + chunk.count(b"\n") - 1
+        if not chunk.endswith(b"\n"):
+            last += 1
+            return (
+                text
+                + (
+                    f"\n[line {last} is longer than {max_bytes} bytes and was cut off. "
+                    f"{path} is {len(buf)} bytes; call read_file with offset={last + 1} to continue after it.]"
+                ),
+                "",
+            )
+
+        return (
+            text
+            + (
+                f"[showing lines {offset}-{last} of {path} ({len(buf)} bytes). "
+                f"Call read_file with offset={last + 1} to read more.]"
+            ),
+            "",
+        )
 
 
 class WriteFile(Tool):
@@ -1,7 +1,5 @@
 from pathlib import Path
 
-from git import Repo, GitCommandError
-
 from . import Tool, ToolSecurity
 from ..util import can_access_path
 
@@ -16,6 +14,9 @@ class GitShowChanges(Tool):
         repo = Path(".")
         if not can_access_path(repo):
             return "", f"OCLA cannot access: {repo}"
+        # GitPython is slow to import, so only load it once a git tool runs.
+        from git import Repo, GitCommandError
+
         try:
             repo_obj = Repo(repo)
             status = repo_obj.git.status("--porcelain")
@@ -40,6 +41,8 @@ class GitCommit(Tool):
         repo = Path(".")
         if not can_access_path(repo, for_write=True):
             return "", f"OCLA cannot access: {repo}"
+        from git import Repo, GitCommandError
+
         try:
             repo_obj = Repo(repo)
             out = repo_obj.git.commit("-am", message)
@@ -60,6 +63,8 @@ class GitLog(Tool):
         repo = Path(".")
         if not can_access_path(repo):
             return "", f"OCLA cannot access: {repo}"
+        from git import Repo, GitCommandError
+
         try:
             repo_obj = Repo(repo)
             out = repo_obj.git.log("--oneline", f"-n{n}")
@@ -0,0 +1,224 @@
+import atexit
+import multiprocessing
+import os
+import re
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import Optional
+
+from ocla.config import SEARCH_MAX_RESULTS
+from ocla.util import can_access_path, truncate
+from ocla.walker import walk
+
+from . import Tool, ToolSecurity
+
+# Below this many files, searching in-process beats starting worker processes.
+_POOL_MIN_FILES = 200
+# Files handed to a worker process at a time.
+_CHUNK_SIZE = 64
+_MAX_WORKERS = 8
+# Bytes inspected when deciding whether a file is binary.
+_BINARY_SNIFF_SIZE = 8192
+# Matched and context lines are cut to this many characters.
+_MAX_LINE_CHARS = 300
+
+# (line number, text, is the matching line) for one match and its context.
+_Hit = list[tuple[int, str, bool]]
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    """Worker processes shared by every search, started on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # ocla runs an event loop thread, so don't fork.
+            _pool = ProcessPoolExecutor(
+                max_workers=min(os.cpu_count() or 1, _MAX_WORKERS),
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+            atexit.register(_pool.shutdown, wait=False, cancel_futures=True)
+        return _pool
+
+
+def _search_file(path: str, regex: re.Pattern, context: int, limit: int) -> list[_Hit]:
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError:
+        return []
+    if b"\0" in data[:_BINARY_SNIFF_SIZE]:
+        return []
+
+    text = data.decode("utf-8", errors="replace")
+    lines = None
+    hits = []
+    line, pos, last_line = 0, 0, -1
+    for m in regex.finditer(text):
+        line += text.count("\n", pos, m.start())
+        pos = m.start()
+        if line == last_line:
+            continue  # one hit per line
+        last_line = line
+        if lines is None:
+            lines = text.splitlines()
+        start, end = max(0, line - context), min(len(lines), line + context + 1)
+        hits.append(
+            [
+                (i + 1, truncate(lines[i], _MAX_LINE_CHARS), i == line)
+                for i in range(start, end)
+            ]
+        )
+        if len(hits) == limit:
+            break
+    return hits
+
+
+def _search_files(
+    paths: list[str], pattern: str, flags: int, context: int, limit: int
+) -> list[tuple[str, list[_Hit]]]:
+    """Search *paths* in order, stopping once *limit* matching lines are found."""
+    regex = re.compile(pattern, flags)
+    found = []
+    for path in paths:
+        hits = _search_file(path, regex, context, limit)
+        if hits:
+            found.append((path, hits))
+            limit -= len(hits)
+            if limit <= 0:
+                break
+    return found
+
+
+def _format(rel: str, hits: list[_Hit]) -> list[str]:
+    # Merge overlapping context between hits, like grep.
+    merged: dict[int, tuple[str, bool]] = {}
+    for hit in hits:
+        for number, text, is_match in hit:
+            seen = merged.get(number)
+            merged[number] = (text, is_match or (seen is not None and seen[1]))
+
+    out = []
+    previous = None
+    for number in sorted(merged):
+        if previous is not None and number > previous + 1:
+            out.append("--")
+        text, is_match = merged[number]
+        sep = ":" if is_match else "-"
+        out.append(f"{rel}{sep}{number}{sep}{text}")
+        previous = number
+    return out
+
+
+class SearchCode(Tool):
+    security = ToolSecurity.PERMISSIBLE
+    description = (
+        "Search the contents of files in the project for a regular expression or "
+        "literal text. Returns matching lines with their line numbers and surrounding "
+        "context. Hidden and gitignored files are not searched."
+    )
+
+    def execute(
+        self,
+        pattern: str,
+        path: str = ".",
+        literal: bool = False,
+        ignore_case: bool = False,
+        glob: str = "",
+        context: int = 2,
+        max_results: int = 0,
+    ) -> (str, str):
+        """
+        Args:
+            pattern: the regular expression (or text, if literal is true) to search for
+            path: the directory or file to search in
+            literal: treat pattern as plain text rather than a regular expression
+            ignore_case: match regardless of case
+            glob: only search files whose name (or path, if it contains a /) matches this glob, e.g. *.py
+            context: how many lines to show before and after each match
+            max_results: the most matching lines to return; 0 uses the configured maximum
+        """
+        root = Path(path)
+        if not can_access_path(root):
+            return "", f"OCLA cannot access: {path}"
+        if not root.exists():
+            return "", f"Path not found: {path}"
+        try:
+            context, max_results = max(0, int(context)), int(max_results)
+        except (TypeError, ValueError):
+            return "", "context and max_results must be integers"
+
+        source = re.escape(pattern) if literal else pattern
+        flags = re.MULTILINE | (re.IGNORECASE if ignore_case else 0)
+        try:
+            re.compile(source, flags)
+        except re.error as e:
+            return "", f"Invalid regular expression: {e}"
+
+        cap = int(SEARCH_MAX_RESULTS.get())
+        limit = min(max_results, cap) if max_results > 0 else cap
+
+        # The worker processes outlive this call and may have been started in
+        # another directory, so they are given absolute paths.
+        if root.is_file():
+            files = [(path, os.path.abspath(root))]
+        else:
+            files = [
+                (os.path.normpath(os.path.join(path, e.rel)), os.path.abspath(e.path))
+                for e in walk(root, pattern=glob or None)
+                if not e.is_dir and can_access_path(e.path)
+            ]
+
+        rel_of = {p: rel for rel, p in files}
+        paths = [p for _, p in files]
+        lines = []
+        matches = 0
+        truncated = False
+        # Ask for one more than the limit to tell whether anything was left out.
+        for found in self._search(paths, source, flags, context, limit + 1):
+            for file_path, hits in found:
+                shown = hits[: limit - matches]
+                lines.extend(_format(rel_of[file_path], shown))
+                matches += len(shown)
+                if len(shown) < len(hits):
+                    truncated = True
+                    break
+            if truncated:
+                lines.append(
+                    f"[stopped after {limit} matches; narrow the search with pattern, path or glob]"
+                )
+                break
+
+        if not lines:
+            return f"no matches in {len(paths)} files", ""
+        return "\n".join(lines), ""
+
+    @staticmethod
+    def _search(paths: list[str], pattern: str, flags: int, context: int, limit: int):
+        """Yield results a chunk of files at a time, in *paths* order."""
+        if len(paths) < _POOL_MIN_FILES:
+            yield _search_files(paths, pattern, flags, context, limit)
+            return
+
+        pool = _get_pool()
+        futures: list[Future] = [
+            pool.submit(
+                _search_files,
+                paths[i : i + _CHUNK_SIZE],
+                pattern,
+                flags,
+                context,
+                limit,
+            )
+            for i in range(0, len(paths), _CHUNK_SIZE)
+        ]
+        try:
+            for future in futures:
+                yield future.result()
+        finally:
+            # Stop chunks that haven't started once enough matches are in.
+            for future in futures:
+                future.cancel()
@@ -0,0 +1,82 @@
+from pathlib import Path
+
+from ocla.symbols import Symbol, file_symbols, find_symbols, is_indexable, update_index
+from ocla.util import can_access_path
+
+from . import Tool, ToolSecurity
+
+_KINDS = ("function", "method", "class")
+
+
+def _describe(symbol: Symbol, with_path: bool) -> str:
+    lines = f"{symbol.line}-{symbol.end_line}" if symbol.end_line else str(symbol.line)
+    where = f"{symbol.path}:{lines}" if with_path else lines
+    owner = f" (in {symbol.parent})" if symbol.parent else ""
+    return f"{where} {symbol.kind}{owner}: {symbol.signature}"
+
+
+class FindSymbol(Tool):
+    security = ToolSecurity.PERMISSIBLE
+    description = (
+        "Find where functions, classes and methods are defined in the project. "
+        "Much cheaper than searching or reading files to locate a definition."
+    )
+
+    def execute(self, name: str, kind: str = "", limit: int = 20) -> (str, str):
+        """
+        Args:
+            name: the symbol to look for; qualify methods with their class, e.g. Session.save
+            kind: only find symbols of this kind: function, method or class
+            limit: the most definitions to return
+        """
+        if kind and kind not in _KINDS:
+            return "", f"kind must be one of: {', '.join(_KINDS)}"
+        try:
+            limit = max(1, int(limit))
+        except (TypeError, ValueError):
+            return "", "limit must be an integer"
+
+        update_index()
+        found = [
+            s
+            for s in find_symbols(name, kind or None, limit)
+            if can_access_path(s.path)
+        ]
+        if not found:
+            return f"no symbol named {name}", ""
+        return "\n".join(_describe(s, with_path=True) for s in found), ""
+
+
+class FileOutline(Tool):
+    security = ToolSecurity.PERMISSIBLE
+    description = (
+        "List the functions, classes and methods defined in a file, with their "
+        "line ranges, without reading the whole file"
+    )
+
+    def execute(self, path: str) -> (str, str):
+        """
+        Args:
+            path: the file to outline
+        """
+        file_path = Path(path)
+        if not can_access_path(file_path):
+            return "", f"OCLA cannot access: {path}"
+        if not file_path.is_file():
+            return "", f"File not found: {path}"
+        if not is_indexable(path):
+            return (
+                "",
+                f"Outlines are not supported for {file_path.suffix or 'this kind of'} files",
+            )
+
+        update_index(path)
+        symbols = file_symbols(path)
+        if not symbols:
+            return f"no functions or classes found in {path}", ""
+
+        out = []
+        for s in symbols:
+            depth = s.parent.count(".") + 1 if s.parent else 0
+            out.append("  " * depth + _describe(s, with_path=False))
+        return "\n".join(out), ""
@@ -3,6 +3,8 @@ import re
 import fnmatch, glob, os
 from pathlib import Path
 
+from ocla.path_policy import current_policy
+
 
 def pascal_to_snake(name: str) -> str:
     """
@@ -33,23 +35,8 @@ def format_tool_arguments(call: dict) -> str:
 
 
 def can_access_path(path: Path | str, *, for_write: bool = False) -> bool:
-    """True if *path* (after expanding `~` and resolving symlinks) stays inside CWD."""
-    cwd = Path.cwd().resolve()
-
-    # Expand user home, then make absolute relative to cwd, finally resolve symlinks
-    try:
-        original = Path(path).expanduser()
-        resolved = (original if original.is_absolute() else cwd / original).resolve()
-    except OSError:  # bad symlink or permission error while resolving
-        return False
+    """True if *path* (after expanding `~` and resolving symlinks) stays inside CWD.
 
-    # 1. Must live under cwd
-    if cwd not in resolved.parents and resolved != cwd:
-        return False
-
-    # 2. Reject hidden components anywhere in the *unresolved* path
-    if any(part.startswith(".") and part not in (".", "..") for part in original.parts):
-        return False
-
-    # 3. Ignore existence so long as path stays within cwd
-    return True
+    Hidden paths are rejected unless allowed by PATH_ALLOW; see `PathPolicy`.
+    """
+    return current_policy().allows(path, for_write=for_write)
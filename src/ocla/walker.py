@@ -0,0 +1,212 @@
+"""Walk a directory tree inside the project, skipping what the agent can't see.
+
+Hidden entries and anything matched by a `.gitignore` are pruned before they
+are descended into, so large ignored trees (`.git`, `node_modules`, `.venv`)
+cost nothing. So is anything the path policy denies (see `PathPolicy`), which
+also keeps symlinks to outside the working directory out; symlinks are never
+followed.
+"""
+
+from __future__ import annotations
+
+import collections
+import dataclasses
+import fnmatch
+import os
+import re
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+
+from ocla.path_policy import current_policy
+
+GITIGNORE = ".gitignore"
+
+
+@dataclasses.dataclass
+class _Rule:
+    regex: re.Pattern
+    negate: bool
+    dir_only: bool
+    # Anchored rules match the path relative to their .gitignore; the others
+    # match an entry's name at any depth.
+    anchored: bool
+
+
+def _translate(glob: str) -> str:
+    out = []
+    i = 0
+    while i < len(glob):
+        if glob.startswith("**/", i):
+            out.append("(?:.*/)?")
+            i += 3
+        elif glob.startswith("**", i):
+            out.append(".*")
+            i += 2
+        elif glob[i] == "*":
+            out.append("[^/]*")
+            i += 1
+        elif glob[i] == "?":
+            out.append("[^/]")
+            i += 1
+        elif glob[i] == "[" and "]" in glob[i + 1 :]:
+            end = glob.index("]", i + 1)
+            body = glob[i + 1 : end].replace("\\", "\\\\")
+            if body.startswith("!"):
+                body = "^" + body[1:]
+            out.append(f"[{body}]")
+            i = end + 1
+        elif glob[i] == "\\" and i + 1 < len(glob):
+            out.append(re.escape(glob[i + 1]))
+            i += 2
+        else:
+            out.append(re.escape(glob[i]))
+            i += 1
+    return "".join(out)
+
+
+def _parse_rule(line: str) -> Optional[_Rule]:
+    line = line.rstrip("\n").rstrip()
+    if not line or line.startswith("#"):
+        return None
+
+    negate = line.startswith("!")
+    if negate:
+        line = line[1:]
+    elif line.startswith("\\"):
+        line = line[1:]
+
+    dir_only = line.endswith("/")
+    line = line.rstrip("/")
+    anchored = "/" in line
+    line = line.lstrip("/")
+    if not line:
+        return None
+
+    return _Rule(
+        regex=re.compile(_translate(line) + r"\Z"),
+        negate=negate,
+        dir_only=dir_only,
+        anchored=anchored,
+    )
+
+
+def _load_rules(directory: str) -> List[_Rule]:
+    try:
+        with open(os.path.join(directory, GITIGNORE), "r", encoding="utf-8") as f:
+            return [r for r in map(_parse_rule, f) if r is not None]
+    except (OSError, UnicodeDecodeError):
+        return []
+
+
+# A .gitignore's rules, paired with its directory relative to the working
+# directory ("" for the working directory itself).
+_Layer = Tuple[str, List[_Rule]]
+
+
+def _ignored(layers: Tuple[_Layer, ...], rel: str, is_dir: bool) -> bool:
+    """Whether *rel* (relative to the working directory) is ignored; last match wins."""
+    name = rel.rsplit("/", 1)[-1]
+    ignored = False
+    for base, rules in layers:
+        local = rel[len(base) + 1 :] if base else rel
+        for rule in rules:
+            if rule.dir_only and not is_dir:
+                continue
+            if rule.regex.match(local if rule.anchored else name):
+                ignored = not rule.negate
+    return ignored
+
+
+@dataclasses.dataclass
+class WalkEntry:
+    # Path relative to the walk root, with "/" separators.
+    rel: str
+    path: str
+    is_dir: bool
+    depth: int
+
+
+def _cwd_relative(root: str) -> Optional[str]:
+    """*root* relative to the working directory, or None if it is outside."""
+    try:
+        rel = Path(root).resolve().relative_to(Path.cwd().resolve())
+    except (OSError, ValueError):
+        return None
+    return "" if rel == Path(".") else rel.as_posix()
+
+
+def _ancestor_layers(prefix: str) -> Tuple[_Layer, ...]:
+    """Rules from the .gitignore files from the working directory down to *prefix*."""
+    layers = []
+    base = ""
+    for part in [""] + (prefix.split("/") if prefix else []):
+        base = f"{base}/{part}" if base else part
+        if base == prefix:
+            break  # the walk root's own rules are loaded by walk()
+        rules = _load_rules(base or ".")
+        if rules:
+            layers.append((base, rules))
+    return tuple(layers)
+
+
+def walk(
+    root: str | os.PathLike = ".",
+    *,
+    max_depth: Optional[int] = None,
+    pattern: Optional[str] = None,
+    respect_gitignore: bool = True,
+) -> Iterator[WalkEntry]:
+    """Yield entries below *root*, breadth first and sorted within a directory.
+
+    *max_depth* of 1 lists only the entries directly in *root*. *pattern* is a glob matched
+    against the relative path, or against the name if it contains no "/";
+    directories are still descended into when they don't match it.
+    """
+    root = os.fspath(root)
+    prefix = _cwd_relative(root) if respect_gitignore else None
+    layers = _ancestor_layers(prefix) if prefix is not None else ()
+    policy = current_policy()
+    queue = collections.deque([("", root, 1, layers)])
+
+    while queue:
+        rel_dir, directory, depth, layers = queue.popleft()
+        if prefix is not None:
+            rules = _load_rules(directory)
+            if rules:
+                layers = layers + ((_join(prefix, rel_dir), rules),)
+
+        try:
+            with os.scandir(directory) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except (PermissionError, FileNotFoundError, NotADirectoryError):
+            continue
+
+        for entry in entries:
+            if entry.name.startswith("."):
+                continue
+            rel = _join(rel_dir, entry.name)
+            try:
+                is_dir = entry.is_dir(follow_symlinks=False)
+            except OSError:
+                continue
+            if prefix is not None and _ignored(layers, _join(prefix, rel), is_dir):
+                continue
+            # Denied directories are pruned along with everything in them.
+            if not policy.allows(entry.path):
+                continue
+
+            if pattern is None or _matches(pattern, rel):
+                yield WalkEntry(rel=rel, path=entry.path, is_dir=is_dir, depth=depth)
+
+            if is_dir and (max_depth is None or depth < max_depth):
+                queue.append((rel, entry.path, depth + 1, layers))
+
+
+def _join(base: str, name: str) -> str:
+    return f"{base}/{name}" if base and name else base or name
+
+
+def _matches(pattern: str, rel: str) -> bool:
+    if "/" in pattern:
+        return fnmatch.fnmatchcase(rel, pattern)
+    return fnmatch.fnmatchcase(rel.rsplit("/", 1)[-1], pattern)
@@ -4,6 +4,8 @@ import urllib.request
 
 import pytest
 
+from ocla.config import reload_config
+
 WIREMOCK_BASE_URL = os.environ.get("WIREMOCK_BASE_URL", "http://localhost:8080")
 os.environ["OLLAMA_HOST"] = WIREMOCK_BASE_URL
 
@@ -53,5 +55,13 @@ def _wiremock_reset(_wiremock_ready):
 
 
 @pytest.fixture(autouse=True)
-def _set_env(monkeypatch):
+def _set_env(monkeypatch, tmp_path):
     monkeypatch.setenv("OCLA_DISABLE_INIT_CHECK", "1")
+    monkeypatch.setenv("OCLA_CACHE_DIR", str(tmp_path / "cache"))
+
+
+@pytest.fixture(autouse=True)
+def _reload_config(_set_env):
+    """Start each test from a config snapshot of the test's environment."""
+    reload_config()
+    yield
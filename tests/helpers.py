@@ -1,6 +1,8 @@
 import json
+import threading
 import typing
 import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from urllib.request import Request, urlopen
 
 import pytest
@@ -94,3 +96,56 @@ def mock_ollama_responses(
         pass
 
     return scenario
+
+
+class StubOllama:
+    """A local Ollama server that records the /api/generate and /api/chat
+    requests it answers, and the paths of all requests."""
+
+    def __init__(self):
+        self.requests = []
+        self.paths = []
+        self.generated = threading.Event()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _send(self, reply):
+                data = json.dumps(reply).encode() + b"\n"
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                stub.paths.append(self.path)
+                self._send({"models": []})
+
+            def do_POST(self):
+                stub.paths.append(self.path)
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                if self.path == "/api/show":
+                    reply = {"model_info": {"num_ctx": 8192}, "capabilities": []}
+                elif self.path == "/api/generate":
+                    stub.requests.append((self.path, body))
+                    reply = {"model": body["model"], "response": "", "done": True}
+                    stub.generated.set()
+                else:
+                    stub.requests.append((self.path, body))
+                    reply = {
+                        "model": body["model"],
+                        "message": {"role": "assistant", "content": "pong"},
+                        "done": True,
+                    }
+                self._send(reply)
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
@@ -0,0 +1,79 @@
+import asyncio
+
+import ocla.cli
+from ocla.config import reload_config
+from ocla.providers import Provider, ModelInfo
+from ocla.session import Session
+
+
+class _StreamingProvider(Provider):
+    name = "streaming"
+
+    def __init__(self, parts):
+        super().__init__()
+        self.parts = parts
+
+    def initialization_check(self, model):
+        pass
+
+    def endpoint(self):
+        return "http://stub"
+
+    def _fetch_model_info(self, model):
+        return ModelInfo(name=model, context_length=4096, supports_thinking=False)
+
+    async def achat(self, messages, tools, thinking, model, context_window):
+        for part in self.parts:
+            # Give other tasks on the loop a chance to run mid-stream.
+            await asyncio.sleep(0.01)
+            yield {"message": {"role": "assistant", "content": part}}
+
+    def available_models(self):
+        return []
+
+
+def test_sync_chat_wraps_achat():
+    provider = _StreamingProvider(["a", "b", "c"])
+    chunks = list(
+        provider.chat(
+            messages=[], tools=[], thinking=False, model="m", context_window=None
+        )
+    )
+    assert [c["message"]["content"] for c in chunks] == ["a", "b", "c"]
+
+
+def test_ado_chat_overlaps_with_other_tasks(monkeypatch, tmp_path):
+    monkeypatch.setenv("OCLA_SESSION_DIR", str(tmp_path))
+    monkeypatch.setenv("OCLA_THINKING", "disabled")
+    reload_config()
+    provider = _StreamingProvider(["hel", "lo"])
+    monkeypatch.setattr("ocla.cli.get_provider", lambda: provider)
+    ticks = []
+
+    async def ticker():
+        while True:
+            ticks.append(len(ticks))
+            await asyncio.sleep(0.005)
+
+    async def run():
+        task = asyncio.create_task(ticker())
+        try:
+            return await ocla.cli.ado_chat(Session("async"), "hi")
+        finally:
+            task.cancel()
+
+    assert asyncio.run(run()) == "hello"
+    assert len(ticks) > 1
+
+    s = Session("async")
+    assert [m["role"] for m in s.messages][-2:] == ["user", "assistant"]
+    assert s.messages[-1]["content"] == "hello"
+
+
+def test_do_chat_runs_on_background_loop(monkeypatch, tmp_path):
+    monkeypatch.setenv("OCLA_SESSION_DIR", str(tmp_path))
+    monkeypatch.setenv("OCLA_THINKING", "disabled")
+    reload_config()
+    monkeypatch.setattr("ocla.cli.get_provider", lambda: _StreamingProvider(["ok"]))
+
+    assert ocla.cli.do_chat(Session("sync"), "hi") == "ok"
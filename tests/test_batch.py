@@ -0,0 +1,76 @@
+import io
+import json
+
+import pytest
+
+from ocla.batch import BatchFileError, read_jobs, run_batch
+from ocla.config import reload_config
+from ocla.session import Session
+
+from .helpers import assert_scenario_completed, content, mock_ollama_responses
+
+
+def test_read_jobs(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    lines = [
+        '{"prompt": "one", "session": "s", "model": "m", "workdir": "repo"}',
+        "",
+        '{"prompt": "two"}',
+    ]
+
+    jobs = read_jobs(lines, "batch-x")
+
+    assert [(j.index, j.session, j.model) for j in jobs] == [
+        (1, "s", "m"),
+        (3, "batch-x-3", None),
+    ]
+    assert jobs[0].workdir == str(tmp_path / "repo")
+    assert jobs[1].workdir == str(tmp_path)
+
+    with pytest.raises(BatchFileError, match="line 2"):
+        read_jobs(['{"prompt": "ok"}', '{"session": "no prompt"}'], "b")
+
+
+def test_run_batch(monkeypatch, tmp_path):
+    monkeypatch.setenv("OCLA_BATCH_CONCURRENCY", "2")
+    reload_config()
+    scenario = mock_ollama_responses(*[content("done")] * 3)
+    for repo in ("a", "b"):
+        (tmp_path / repo).mkdir()
+    lines = [
+        json.dumps(
+            {"prompt": "first", "session": "shared", "workdir": str(tmp_path / "a")}
+        ),
+        json.dumps(
+            {"prompt": "other", "workdir": str(tmp_path / "b"), "model": "qwen3:8b"}
+        ),
+        json.dumps(
+            {"prompt": "second", "session": "shared", "workdir": str(tmp_path / "a")}
+        ),
+    ]
+    out = io.StringIO()
+
+    failed = run_batch(read_jobs(lines, "batch-t"), [], out)
+
+    results = {r["job"]: r for r in map(json.loads, out.getvalue().splitlines())}
+    assert failed == 0
+    assert sorted(results) == [1, 2, 3]
+    assert all(r["ok"] and r["reply"] == "done" for r in results.values())
+    assert results[2]["model"] == "qwen3:8b"
+    assert results[3]["tokens"] > results[1]["tokens"] > 0
+    # Job 3 followed job 1 in its chain, but never waited for a free slot.
+    assert results[3]["waited"] < results[1]["elapsed"]
+    assert results[3]["tokens_added"] > 0
+    assert results[3]["elapsed"] >= 0
+
+    # Jobs on the same session ran in order, and the sessions were stored.
+    monkeypatch.chdir(tmp_path / "a")
+    reload_config()
+    assert [
+        m["content"] for m in Session("shared").messages if m["role"] == "user"
+    ] == [
+        "first",
+        "second",
+    ]
+    assert (tmp_path / "b" / ".ocla" / "sessions" / "batch-t-2.meta").exists()
+    assert_scenario_completed(scenario)
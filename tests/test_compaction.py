@@ -0,0 +1,143 @@
+import asyncio
+
+import ocla.cli
+from ocla.compaction import SUMMARY_PREFIX, compact_session, plan_compaction
+from ocla.config import reload_config
+from ocla.providers import Provider, ModelInfo
+from ocla.session import Session
+
+
+class _SummarizingProvider(Provider):
+    name = "summarizing"
+
+    def __init__(self, reply="all good"):
+        super().__init__()
+        self.reply = reply
+        self.requests = []
+
+    def initialization_check(self, model):
+        pass
+
+    def endpoint(self):
+        return "http://stub"
+
+    def _fetch_model_info(self, model):
+        return ModelInfo(name=model, context_length=4096, supports_thinking=False)
+
+    async def achat(self, messages, tools, thinking, model, context_window):
+        self.requests.append(list(messages))
+        if not tools:
+            yield {"message": {"role": "assistant", "content": "summary of work"}}
+        else:
+            yield {"message": {"role": "assistant", "content": self.reply}}
+
+    def available_models(self):
+        return []
+
+
+def _turn(n):
+    return [
+        {"role": "user", "content": f"prompt {n}"},
+        {
+            "role": "assistant",
+            "content": "",
+            "tool_calls": [
+                {"function": {"name": "read_file", "arguments": {"path": f"f{n}"}}}
+            ],
+        },
+        {"role": "tool", "name": "read_file", "content": f"contents of file {n} " * 20},
+        {"role": "assistant", "content": f"answer {n}"},
+    ]
+
+
+def test_plan_keeps_system_and_recent_turns():
+    messages = [{"role": "system", "content": "sys"}] + _turn(1) + _turn(2) + _turn(3)
+
+    plan = plan_compaction(messages, keep_turns=2)
+
+    assert (plan.start, plan.end) == (1, 5)
+    assert messages[plan.end]["content"] == "prompt 2"
+
+
+def test_plan_keeps_unresolved_tool_calls():
+    messages = [{"role": "system", "content": "sys"}] + _turn(1)
+    messages += [
+        {"role": "user", "content": "prompt 2"},
+        {
+            "role": "assistant",
+            "content": "",
+            "tool_calls": [
+                {"function": {"name": "a", "arguments": {}}},
+                {"function": {"name": "b", "arguments": {}}},
+            ],
+        },
+        {"role": "tool", "name": "a", "content": "only one result so far"},
+    ]
+
+    # A single turn to keep would cut inside the pending call otherwise.
+    plan = plan_compaction(messages, keep_turns=5)
+
+    assert plan.end == len(messages) - 2
+    assert messages[plan.end]["tool_calls"]
+
+
+def test_plan_nothing_to_compact():
+    messages = [{"role": "system", "content": "sys"}, {"role": "user", "content": "hi"}]
+    assert plan_compaction(messages, keep_turns=1) is None
+
+
+def test_compact_session_archives_originals(monkeypatch, tmp_path):
+    monkeypatch.setenv("OCLA_SESSION_DIR", str(tmp_path))
+    monkeypatch.setenv("OCLA_COMPACTION_KEEP_TURNS", "1")
+    reload_config()
+    s = Session("c1")
+    original = list(s.messages)
+    for n in range(3):
+        for m in _turn(n):
+            s.add(m)
+
+    result = asyncio.run(compact_session(s, _SummarizingProvider(), "m"))
+
+    assert result.messages == 8
+    assert result.tokens_after < result.tokens_before
+    assert s.messages[: len(original)] == original
+    assert s.messages[len(original)]["content"] == SUMMARY_PREFIX + "summary of work"
+    assert s.messages[len(original) + 1]["content"] == "prompt 2"
+    assert sum(s.message_tokens) == s.token_count()
+
+    reloaded = Session("c1")
+    assert reloaded.messages == s.messages
+    assert reloaded.compactions == 1
+    assert [m["content"] for m in reloaded.archived_messages()][::4] == [
+        "prompt 0",
+        "prompt 1",
+    ]
+
+
+def test_chat_compacts_instead_of_failing(monkeypatch, tmp_path):
+    monkeypatch.setenv("OCLA_SESSION_DIR", str(tmp_path))
+    monkeypatch.setenv("OCLA_THINKING", "disabled")
+    monkeypatch.setenv("OCLA_PROJECT_CONTEXT_FILE", str(tmp_path / "missing.md"))
+    monkeypatch.setenv("OCLA_COMPACTION_KEEP_TURNS", "1")
+    reload_config()
+    s = Session("c2")
+    for n in range(3):
+        for m in _turn(n):
+            s.add(m)
+
+    # Shrink the window so the session is already past the high-water mark.
+    monkeypatch.setenv("OCLA_CONTEXT_WINDOW", str(s.token_count() + 20))
+    reload_config()
+    provider = _SummarizingProvider()
+    monkeypatch.setattr("ocla.cli.get_provider", lambda: provider)
+
+    assert asyncio.run(ocla.cli.ado_chat(s, "next")) == "all good"
+
+    # The history was summarized before the model saw the new prompt.
+    assert len(provider.requests) > 1
+    assert provider.requests[-1][-1] == {"role": "user", "content": "next"}
+    assert s.compactions == 1
+    assert s.messages[-2:] == [
+        {"role": "user", "content": "next"},
+        {"role": "assistant", "content": "all good"},
+    ]
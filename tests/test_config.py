@@ -0,0 +1,84 @@
+import json
+import sys
+from io import StringIO
+
+from ocla.config import (
+    CONTEXT_WINDOW,
+    MODEL,
+    PROMPT_MODE,
+    THINKING,
+    config_file_reads,
+    reload_config,
+)
+from .helpers import mock_ollama_responses, content, assert_scenario_completed
+import ocla.cli
+
+
+def _write_config(path, **values):
+    path.write_text(json.dumps(values))
+
+
+def test_config_file_read_once(monkeypatch, tmp_path):
+    config_file = tmp_path / "config.json"
+    _write_config(config_file, model="from-file", contextWindow="1234")
+    monkeypatch.setenv("OCLA_CONFIG_FILE", str(config_file))
+
+    before = config_file_reads()
+    reload_config([])
+    assert config_file_reads() == before + 1
+
+    for _ in range(10):
+        assert MODEL.get() == "from-file"
+        assert CONTEXT_WINDOW.get() == "1234"
+    assert config_file_reads() == before + 1
+
+    # Changes are only picked up on an explicit reload.
+    _write_config(config_file, model="changed")
+    assert MODEL.get() == "from-file"
+    reload_config([])
+    assert MODEL.get() == "changed"
+
+
+def test_config_precedence(monkeypatch, tmp_path):
+    config_file = tmp_path / "config.json"
+    _write_config(config_file, model="from-file")
+    monkeypatch.setenv("OCLA_CONFIG_FILE", str(config_file))
+    monkeypatch.setenv("OCLA_MODEL", "from-env")
+
+    assert reload_config([]).values["model"] == "from-env"
+    assert reload_config(["-m", "from-cli"]).values["model"] == "from-cli"
+    assert reload_config(["--model=from-cli"]).values["model"] == "from-cli"
+
+
+def test_config_validated_at_snapshot(monkeypatch):
+    monkeypatch.setenv("OCLA_CONTEXT_WINDOW", "lots")
+    monkeypatch.setenv("OCLA_THINKING", "enabled")
+    snapshot = reload_config([])
+
+    assert "context_window" in snapshot.errors
+    assert CONTEXT_WINDOW.validate() == "must be a positive integer"
+    assert THINKING.is_valid()
+
+
+def test_no_config_reads_during_chat_turn(monkeypatch, tmp_path, capsys):
+    scenario = mock_ollama_responses(content("pong"))
+    monkeypatch.setenv("OCLA_SESSION_DIR", str(tmp_path))
+    monkeypatch.setenv("OCLA_STATE_FILE", str(tmp_path / "state.json"))
+    monkeypatch.setenv(PROMPT_MODE.env, "oneshot")
+    monkeypatch.setenv(THINKING.env, "disabled")
+    monkeypatch.setattr(sys, "stdin", StringIO("ping"))
+
+    reads = []
+    real_do_chat = ocla.cli.do_chat
+
+    def counting_do_chat(session, prompt):
+        before = config_file_reads()
+        out = real_do_chat(session, prompt)
+        reads.append(config_file_reads() - before)
+        return out
+
+    monkeypatch.setattr("ocla.cli.do_chat", counting_do_chat)
+
+    ocla.cli.main([])
+    assert reads == [0]
+    assert_scenario_completed(scenario)
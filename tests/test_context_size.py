@@ -0,0 +1,62 @@
+import pytest
+
+from ocla import context_size
+from ocla.config import reload_config
+from ocla.context_size import buckets, context_window, needed_tokens
+
+
+@pytest.fixture(autouse=True)
+def fresh_sizes(monkeypatch):
+    monkeypatch.setattr(context_size, "_chosen", {})
+
+
+def _configure(monkeypatch, sizing, window="16384"):
+    monkeypatch.setenv("OCLA_CONTEXT_SIZING", sizing)
+    monkeypatch.setenv("OCLA_CONTEXT_WINDOW", window)
+    reload_config()
+
+
+def test_buckets():
+    assert buckets(16384) == [2048, 4096, 8192, 16384]
+    assert buckets(10000) == [2048, 4096, 8192, 10000]
+    assert buckets(1000) == [1000]
+
+
+def test_fixed_always_sends_configured_window(monkeypatch):
+    _configure(monkeypatch, "fixed")
+
+    assert context_window("qwen3", 100, []) == 16384
+
+
+def test_adaptive_picks_smallest_fitting_bucket(monkeypatch):
+    _configure(monkeypatch, "adaptive")
+
+    assert context_window("qwen3", 500, []) == 2048
+    assert needed_tokens(1500, []) > 2048
+    assert context_window("qwen3", 1500, []) == 4096
+    assert context_window("qwen3", 12000, []) == 16384
+    # Never more than configured, even if the session doesn't fit.
+    assert context_window("other", 50000, []) == 16384
+
+
+def test_adaptive_counts_tool_schemas(monkeypatch):
+    _configure(monkeypatch, "adaptive")
+
+    class Big:
+        def describe(self):
+            return {"description": "x" * 8000}
+
+    assert context_window("qwen3", 0, [Big()]) == 4096
+
+
+def test_adaptive_size_does_not_shrink(monkeypatch):
+    _configure(monkeypatch, "adaptive")
+
+    assert context_window("qwen3", 3000, []) == 8192
+    # The session was compacted; keep the model loaded as it is.
+    assert context_window("qwen3", 100, []) == 8192
+    assert context_window("llama3", 100, []) == 2048
+
+    # A smaller configured window still caps it.
+    _configure(monkeypatch, "adaptive", window="4096")
+    assert context_window("qwen3", 100, []) == 4096
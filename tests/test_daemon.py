@@ -0,0 +1,94 @@
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+from ocla.client import forward
+
+from .helpers import assert_scenario_completed, content, mock_ollama_responses
+
+_SRC = os.path.join(os.path.dirname(os.path.dirname(__file__)), "src")
+
+
+def _env(tmp_path):
+    env = dict(os.environ, OCLA_DISABLE_INIT_CHECK="1")
+    env["OCLA_CACHE_DIR"] = str(tmp_path / "cache")
+    env["PYTHONPATH"] = os.pathsep.join([_SRC, env.get("PYTHONPATH", "")])
+    return env
+
+
+def _ocla(tmp_path, *args, stdin=""):
+    return subprocess.run(
+        [sys.executable, "-c", "from ocla.client import main; main()", *args],
+        cwd=tmp_path,
+        env=_env(tmp_path),
+        input=stdin,
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+
+
+@pytest.fixture
+def daemon(tmp_path):
+    proc = subprocess.Popen(
+        [sys.executable, "-c", "from ocla.client import main; main()", "serve"],
+        cwd=tmp_path,
+        env=_env(tmp_path),
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+    )
+    socket_path = tmp_path / ".ocla" / "daemon.sock"
+    for _ in range(100):
+        if socket_path.exists():
+            break
+        time.sleep(0.1)
+    else:
+        proc.kill()
+        pytest.fail(f"ocla serve did not start: {proc.communicate()[0]}")
+    yield proc
+    proc.terminate()
+    proc.wait(timeout=10)
+    assert not socket_path.exists()
+
+
+def test_no_daemon_runs_in_process(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    assert forward(["session", "list"]) is None
+
+    out = _ocla(tmp_path, "session", "new", "here")
+    assert out.returncode == 0
+    assert out.stdout.strip() == "here"
+
+
+def test_commands_forwarded(daemon, tmp_path):
+    out = _ocla(tmp_path, "session", "new", "warm")
+    assert (out.returncode, out.stdout.strip()) == (0, "warm")
+    assert (tmp_path / ".ocla" / "sessions" / "warm.meta").exists()
+
+    # Argument errors come back with their exit code.
+    out = _ocla(tmp_path, "session", "bogus")
+    assert out.returncode == 2
+    assert "invalid choice" in out.stderr
+
+    out = _ocla(tmp_path, "serve")
+    assert out.returncode == 1
+    assert "already serving" in out.stdout
+
+    assert daemon.poll() is None
+
+
+def test_oneshot_prompt_forwarded(daemon, tmp_path):
+    scenario = mock_ollama_responses(content("pong"), content("pong again"))
+
+    out = _ocla(tmp_path, "-pm", "oneshot", stdin="ping")
+    assert out.returncode == 0, out.stderr
+    assert out.stdout.splitlines()[0] == "pong"
+
+    # The second prompt reuses the session the daemon kept loaded.
+    out = _ocla(tmp_path, "-pm", "oneshot", stdin="ping again")
+    assert out.stdout.splitlines()[0] == "pong again"
+    assert_scenario_completed(scenario)
@@ -0,0 +1,82 @@
+import pytest
+
+import ocla.cli
+from ocla.config import reload_config
+
+
+class _FakeProvider:
+    name = "fake"
+
+    def __init__(self):
+        self.checks = 0
+
+    def endpoint(self):
+        return "http://fake"
+
+    def initialization_check(self, model):
+        self.checks += 1
+
+    def model_digest(self, model):
+        return "sha256:abc"
+
+    def model_info(self, model):
+        return ocla.cli.ModelInfo(name=model, context_length=None)
+
+    def available_models(self):
+        return []
+
+    def iter_available_models(self):
+        return iter(self.available_models())
+
+
+@pytest.mark.parametrize(
+    "argv", [["config"], ["tools"], ["session", "list"], ["model", "list"]]
+)
+def test_local_commands_skip_init_check(monkeypatch, tmp_path, argv):
+    monkeypatch.setenv("OCLA_SESSION_DIR", str(tmp_path))
+    monkeypatch.setattr(
+        "ocla.cli._initialization_check",
+        lambda: pytest.fail("initialization check should not run"),
+    )
+    monkeypatch.setattr("ocla.cli.get_provider", _FakeProvider)
+    ocla.cli.main(argv)
+
+
+def _run_checks(
+    monkeypatch, tmp_path, ttl: str, runs: int, provider=None
+) -> _FakeProvider:
+    provider = provider or _FakeProvider()
+    monkeypatch.delenv("OCLA_DISABLE_INIT_CHECK", raising=False)
+    monkeypatch.setenv("OCLA_CACHE_DIR", str(tmp_path))
+    monkeypatch.setenv("OCLA_INIT_CHECK_TTL", ttl)
+    reload_config([])
+    monkeypatch.setattr("ocla.cli.get_provider", lambda: provider)
+
+    for _ in range(runs):
+        ocla.cli._initialization_check()
+    return provider
+
+
+def test_init_check_cached(monkeypatch, tmp_path):
+    assert _run_checks(monkeypatch, tmp_path, "3600", 3).checks == 1
+
+
+def test_init_check_cache_disabled(monkeypatch, tmp_path):
+    assert _run_checks(monkeypatch, tmp_path, "0", 3).checks == 3
+
+
+def test_init_check_repeated_when_digest_changes(monkeypatch, tmp_path):
+    provider = _run_checks(monkeypatch, tmp_path, "3600", 2)
+    assert provider.checks == 1
+
+    # The model was pulled again under the same tag.
+    provider.model_digest = lambda model: "sha256:def"
+    _run_checks(monkeypatch, tmp_path, "3600", 2, provider)
+    assert provider.checks == 2
+
+
+def test_context_warnings_on_cached_runs(monkeypatch, tmp_path, caplog):
+    _run_checks(monkeypatch, tmp_path, "3600", 3)
+
+    warnings = [r for r in caplog.records if "context limit" in r.getMessage()]
+    assert len(warnings) == 3
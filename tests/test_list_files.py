@@ -0,0 +1,124 @@
+import os
+
+import pytest
+
+import ocla.walker
+from ocla.config import reload_config
+from ocla.tools.file_system import ListFiles
+
+
+@pytest.fixture
+def tree(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    for rel in [
+        "README.md",
+        "src/app.py",
+        "src/util.py",
+        "src/gen/out.py",
+        "src/gen/keep.py",
+        "node_modules/pkg/index.js",
+        "build/x.o",
+        ".git/HEAD",
+        "docs/guide/intro.md",
+    ]:
+        path = tmp_path / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("x")
+    (tmp_path / ".gitignore").write_text("node_modules/\n/build\n*.log\n")
+    (tmp_path / "src" / ".gitignore").write_text("gen/*\n!gen/keep.py\n")
+    return tmp_path
+
+
+def test_non_recursive_skips_hidden_and_ignored(tree):
+    entries, err = ListFiles().execute(".")
+
+    assert err == ""
+    assert entries == ["README.md", "docs", "src"]
+
+
+def test_recursive_applies_nested_gitignore(tree):
+    entries, _ = ListFiles().execute(".", recursive=True)
+
+    assert entries == [
+        "README.md",
+        "docs",
+        "docs/guide",
+        "docs/guide/intro.md",
+        "src",
+        "src/app.py",
+        "src/gen",
+        "src/gen/keep.py",
+        "src/util.py",
+    ]
+
+
+def test_ignored_directories_not_descended(monkeypatch, tree):
+    scanned = []
+    real_scandir = os.scandir
+    monkeypatch.setattr(
+        ocla.walker.os,
+        "scandir",
+        lambda p: scanned.append(os.fspath(p)) or real_scandir(p),
+    )
+
+    ListFiles().execute(".", recursive=True)
+
+    assert not any("node_modules" in p or ".git" in p or "build" in p for p in scanned)
+
+
+def test_subdirectory_uses_parent_gitignore(tree):
+    (tree / "src" / "debug.log").write_text("x")
+
+    entries, _ = ListFiles().execute("src", recursive=True)
+
+    assert "debug.log" not in entries
+    assert "gen/out.py" not in entries
+    assert "gen/keep.py" in entries
+
+
+def test_depth_pattern_and_limit(monkeypatch, tree):
+    assert ListFiles().execute(".", recursive=True, max_depth=2)[0] == [
+        "README.md",
+        "docs",
+        "docs/guide",
+        "src",
+        "src/app.py",
+        "src/gen",
+        "src/util.py",
+    ]
+    assert ListFiles().execute(".", recursive=True, pattern="*.py")[0] == [
+        "src/app.py",
+        "src/gen/keep.py",
+        "src/util.py",
+    ]
+
+    monkeypatch.setenv("OCLA_LIST_FILES_MAX_ENTRIES", "2")
+    reload_config()
+    entries, _ = ListFiles().execute(".", recursive=True, limit=50)
+    assert entries[:2] == ["README.md", "docs"]
+    assert entries[2].startswith("[listing stopped after 2 entries")
+
+
+def test_symlink_outside_cwd_skipped(tree, tmp_path_factory):
+    outside = tmp_path_factory.mktemp("outside")
+    (tree / "escape").symlink_to(outside, target_is_directory=True)
+    (tree / "inside").symlink_to(tree / "src", target_is_directory=True)
+
+    entries, _ = ListFiles().execute(".")
+
+    assert "escape" not in entries
+    assert "inside" in entries
+
+
+def test_path_deny_applied(monkeypatch, tree):
+    (tree / "secrets").mkdir()
+    (tree / "secrets" / "key.txt").write_text("x")
+    monkeypatch.setenv("OCLA_PATH_DENY", "secrets/**,docs")
+    reload_config()
+
+    entries, _ = ListFiles().execute(".", recursive=True)
+
+    assert "secrets/key.txt" not in entries
+    assert not any(e.startswith("docs") for e in entries)
+    assert "src/app.py" in entries
+    assert ListFiles().execute("secrets") == ([], "")
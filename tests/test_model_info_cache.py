@@ -0,0 +1,92 @@
+import time
+
+from ocla.config import reload_config
+from ocla.providers import Provider, ModelInfo
+
+
+class _CountingProvider(Provider):
+    name = "counting"
+
+    def __init__(self, digest="sha256:1"):
+        super().__init__()
+        self.digest = digest
+        self.fetches = 0
+
+    def initialization_check(self, model):
+        pass
+
+    def endpoint(self):
+        return "http://stub"
+
+    def model_digest(self, model):
+        return self.digest
+
+    def _fetch_model_info(self, model):
+        self.fetches += 1
+        return ModelInfo(name=model, context_length=4096, supports_thinking=True)
+
+    async def achat(self, messages, tools, thinking, model, context_window):
+        return
+        yield
+
+    def available_models(self):
+        return []
+
+
+def test_model_info_memoized(monkeypatch):
+    p = _CountingProvider()
+    for _ in range(20):
+        assert p.model_info("m").context_length == 4096
+    assert p.fetches == 1
+
+
+def test_model_info_disk_cache_shared(monkeypatch):
+    _CountingProvider().model_info("m")
+
+    p = _CountingProvider()
+    assert p.model_info("m") == ModelInfo("m", 4096, True)
+    assert p.fetches == 0
+
+
+def test_model_info_expired_digest_unchanged(monkeypatch):
+    monkeypatch.setenv("OCLA_MODEL_INFO_TTL", "60")
+    reload_config([])
+    _CountingProvider().model_info("m")
+
+    real_time = time.time
+    monkeypatch.setattr("time.time", lambda: real_time() + 120)
+
+    p = _CountingProvider()
+    p.model_info("m")
+    assert p.fetches == 0
+
+    monkeypatch.setattr("time.time", lambda: real_time() + 240)
+    p = _CountingProvider(digest="sha256:2")
+    p.model_info("m")
+    assert p.fetches == 1
+
+
+def test_model_info_disk_cache_disabled(monkeypatch):
+    monkeypatch.setenv("OCLA_MODEL_INFO_TTL", "0")
+    reload_config([])
+    _CountingProvider().model_info("m")
+
+    p = _CountingProvider()
+    p.model_info("m")
+    assert p.fetches == 1
+
+
+def test_model_info_refetched_when_digest_changes(monkeypatch):
+    monkeypatch.setenv("OCLA_MODEL_INFO_TTL", "3600")
+    reload_config([])
+    p = _CountingProvider()
+    p.model_info("m")
+
+    # The model is pulled again while its info is still fresh.
+    p.digest = "sha256:2"
+    p.model_info("m")
+    assert p.fetches == 2
+
+    p = _CountingProvider(digest="sha256:2")
+    p.model_info("m")
+    assert p.fetches == 0
@@ -0,0 +1,67 @@
+import threading
+import time
+
+from ollama import ListResponse, ShowResponse
+
+import ocla.cli
+from ocla.providers.ollama_provider import OllamaProvider
+
+
+class _SlowClient:
+    """Stand-in for ollama.Client where every `show()` takes a while."""
+
+    def __init__(self, names, delay=0.2):
+        self.names = names
+        self.delay = delay
+        self.list_calls = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def list(self):
+        self.list_calls += 1
+        return ListResponse(
+            models=[ListResponse.Model(model=n, digest=f"sha-{n}") for n in self.names]
+        )
+
+    def show(self, model):
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(self.delay)
+        with self._lock:
+            self.in_flight -= 1
+        return ShowResponse(model_info={"llama.context_length": 2048}, capabilities=[])
+
+
+def _provider(client) -> OllamaProvider:
+    provider = OllamaProvider()
+    provider._sync_client = lambda host: client
+    return provider
+
+
+def test_model_details_fetched_concurrently():
+    client = _SlowClient([f"m{i}" for i in range(8)])
+    provider = _provider(client)
+
+    start = time.monotonic()
+    models = provider.available_models()
+    elapsed = time.monotonic() - start
+
+    assert sorted(m.name for m in models) == sorted(client.names)
+    assert all(m.context_length == 2048 for m in models)
+    assert client.max_in_flight > 1
+    assert elapsed < client.delay * len(client.names) / 2
+    # Digest lookups reuse the single listing.
+    assert client.list_calls == 1
+
+
+def test_cli_model_list_lists_once(monkeypatch, capsys):
+    client = _SlowClient(["alpha", "beta"], delay=0)
+    monkeypatch.setattr("ocla.cli.get_provider", lambda: _provider(client))
+
+    ocla.cli.main(["model", "list"])
+
+    out = capsys.readouterr().out
+    assert "alpha" in out and "beta" in out
+    assert client.list_calls == 1
@@ -0,0 +1,87 @@
+from io import StringIO
+
+import pytest
+
+import ocla.cli
+from ocla.cli import main as cli_main
+from ocla.config import reload_config
+
+from .helpers import StubOllama
+
+
+@pytest.fixture
+def stub(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    server = StubOllama()
+    monkeypatch.setenv("OCLA_OLLAMA_HOST", server.url)
+    monkeypatch.setenv("OCLA_MODEL", "qwen3")
+    monkeypatch.setenv("OCLA_CONTEXT_WINDOW", "8192")
+    reload_config()
+    yield server
+    server.close()
+
+
+def test_model_warm_and_unload(monkeypatch, stub, capsys):
+    monkeypatch.setenv("OCLA_KEEP_ALIVE", "30m")
+
+    cli_main(["model", "warm"])
+    cli_main(["model", "unload"])
+
+    (_, warm), (_, unload) = stub.requests
+    assert warm["model"] == "qwen3"
+    assert warm["options"]["num_ctx"] == 8192
+    assert warm["keep_alive"] == "30m"
+    assert "prompt" not in warm
+    assert unload["keep_alive"] == 0
+    out = capsys.readouterr().out
+    assert "Loaded qwen3" in out
+    assert "Unloaded qwen3" in out
+
+
+def test_chat_sends_keep_alive(monkeypatch, stub):
+    monkeypatch.setenv("OCLA_KEEP_ALIVE", "600")
+    monkeypatch.setenv("OCLA_PROMPT_MODE", "oneshot")
+    monkeypatch.setattr("sys.stdin", StringIO("ping"))
+
+    cli_main([])
+
+    [(path, body)] = stub.requests
+    assert path == "/api/chat"
+    assert body["keep_alive"] == 600
+
+
+def test_keep_alive_validated(monkeypatch):
+    monkeypatch.setenv("OCLA_KEEP_ALIVE", "forever")
+    reload_config()
+
+    with pytest.raises(SystemExit):
+        cli_main(["model", "warm"])
+
+
+def test_warms_up_while_prompting(monkeypatch, stub):
+    monkeypatch.setenv("OCLA_PROMPT_MODE", "interactive")
+    monkeypatch.setattr("sys.stdin", StringIO(""))
+
+    def prompt(message):
+        # The model is being loaded before anything has been typed.
+        assert stub.generated.wait(5)
+        return "q"
+
+    monkeypatch.setattr(ocla.cli, "interactive_prompt", prompt)
+
+    cli_main([])
+
+    [(path, body)] = stub.requests
+    assert path == "/api/generate"
+    assert body["options"]["num_ctx"] == 8192
+
+
+def test_warm_up_disabled(monkeypatch, stub):
+    monkeypatch.setenv("OCLA_PROMPT_MODE", "interactive")
+    monkeypatch.setenv("OCLA_WARM_UP", "disabled")
+    monkeypatch.setattr("sys.stdin", StringIO(""))
+    monkeypatch.setattr(ocla.cli, "interactive_prompt", lambda message: "q")
+
+    cli_main([])
+
+    assert not stub.generated.wait(0.2)
@@ -0,0 +1,178 @@
+import json
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from ocla.config import OLLAMA_HOST_OVERRIDE, reload_config
+from ocla.providers.ollama_hosts import HostPool
+from ocla.providers.ollama_provider import OllamaProvider
+
+
+class _StubOllama:
+    """Just enough of the Ollama API: /api/ps and a one-chunk /api/chat."""
+
+    def __init__(self, name, loaded=()):
+        self.name = name
+        self.loaded = list(loaded)
+        self.chats = 0
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _send(self, body):
+                data = json.dumps(body).encode() + b"\n"
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                self._send({"models": [{"model": m, "name": m} for m in stub.loaded]})
+
+            def do_POST(self):
+                self.rfile.read(int(self.headers["Content-Length"]))
+                stub.chats += 1
+                self._send(
+                    {
+                        "model": "qwen3",
+                        "message": {
+                            "role": "assistant",
+                            "content": f"from {stub.name}",
+                        },
+                        "done": True,
+                    }
+                )
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def _dead_url():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return f"http://127.0.0.1:{s.getsockname()[1]}"
+
+
+@pytest.fixture
+def stubs():
+    created = []
+
+    def make(name, loaded=()):
+        stub = _StubOllama(name, loaded)
+        created.append(stub)
+        return stub
+
+    yield make
+    for stub in created:
+        stub.close()
+
+
+def _provider(monkeypatch, *urls):
+    monkeypatch.setenv("OCLA_OLLAMA_HOST", ",".join(urls))
+    reload_config()
+    return OllamaProvider()
+
+
+def _reply(provider):
+    chunks = list(
+        provider.chat([{"role": "user", "content": "hi"}], [], False, "qwen3", None)
+    )
+    return "".join(c.message.content for c in chunks)
+
+
+def test_prefers_host_with_model_loaded(monkeypatch, stubs, caplog):
+    caplog.set_level("INFO")
+    cold, warm = stubs("cold"), stubs("warm", loaded=["qwen3:latest"])
+    provider = _provider(monkeypatch, cold.url, warm.url)
+
+    assert _reply(provider) == "from warm"
+    assert _reply(provider) == "from warm"
+    assert (cold.chats, warm.chats) == (0, 2)
+    assert any(f"qwen3 -> {warm.url}" in r.getMessage() for r in caplog.records)
+
+
+def test_fails_over_to_next_host(monkeypatch, stubs, caplog):
+    caplog.set_level("INFO")
+    up = stubs("up")
+    down = _dead_url()
+    provider = _provider(monkeypatch, down, up.url)
+    # Pretend the dead host looked fine at the last health check.
+    for host in provider._pool.hosts:
+        provider._pool.checked(host, ["qwen3:latest"] if host.url == down else [])
+
+    assert _reply(provider) == "from up"
+    assert not provider._pool.hosts[0].healthy
+    assert any(f"{down} failed" in r.getMessage() for r in caplog.records)
+
+    # Later requests in the session skip it.
+    assert _reply(provider) == "from up"
+    assert up.chats == 2
+
+
+def test_health_check_marks_hosts_down(monkeypatch, stubs):
+    up = stubs("up")
+    provider = _provider(monkeypatch, _dead_url(), up.url)
+
+    assert _reply(provider) == "from up"
+    assert [h.healthy for h in provider._pool.hosts] == [False, True]
+
+
+def test_single_host_unchanged(monkeypatch, stubs):
+    only = stubs("only")
+    provider = _provider(monkeypatch, only.url)
+
+    assert _reply(provider) == "from only"
+    # No health checks for a single host.
+    assert provider._pool.stale() == []
+
+
+def test_least_busy_then_round_robin():
+    pool = HostPool(["a", "b", "c"])
+    a, b, c = pool.hosts
+    a.in_flight, b.in_flight, c.in_flight = 2, 0, 1
+
+    assert pool.choose("m") is b
+
+    b.in_flight = 2
+    assert pool.choose("m") is c
+
+    c.in_flight = 2
+    # All equally busy: the least recently chosen goes next.
+    assert [pool.choose("m").url for _ in range(3)] == ["a", "b", "c"]
+    assert pool.choose("m", exclude=[a]) is b
+    assert pool.choose("m", exclude=pool.hosts) is None
+
+
+def test_model_requests_fail_over(monkeypatch, stubs):
+    up = stubs("up", loaded=["qwen3:latest"])
+    down = _dead_url()
+    provider = _provider(monkeypatch, down, up.url)
+
+    assert provider._model_names() == ["qwen3:latest"]
+    assert not provider._pool.hosts[0].healthy
+
+
+def test_endpoint_independent_of_spelling(monkeypatch):
+    a = _provider(monkeypatch, "http://b:11434", "http://a:11434").endpoint()
+    b = _provider(monkeypatch, " http://a:11434", "http://b:11434 ").endpoint()
+
+    assert a == b == "http://a:11434,http://b:11434"
+
+
+def test_no_hosts_rejected(monkeypatch):
+    monkeypatch.setenv("OCLA_OLLAMA_HOST", " , ")
+    reload_config()
+
+    assert OLLAMA_HOST_OVERRIDE.validate() == "must name at least one host"
+    with pytest.raises(RuntimeError, match="No Ollama hosts"):
+        OllamaProvider()
@@ -0,0 +1,117 @@
+import random
+from pathlib import Path
+
+import pytest
+
+from ocla.config import reload_config
+from ocla.path_policy import PathPolicy
+from ocla.util import can_access_path
+
+
+def _reference_can_access_path(path, *, for_write=False):
+    """can_access_path as it was before PathPolicy, kept to check verdicts match."""
+    cwd = Path.cwd().resolve()
+
+    try:
+        original = Path(path).expanduser()
+        resolved = (original if original.is_absolute() else cwd / original).resolve()
+    except OSError:
+        return False
+
+    if cwd not in resolved.parents and resolved != cwd:
+        return False
+
+    if any(part.startswith(".") and part not in (".", "..") for part in original.parts):
+        return False
+
+    return True
+
+
+_COMPONENTS = [
+    "a",
+    "b",
+    "c.txt",
+    ".hidden",
+    ".",
+    "..",
+    "link_in",
+    "link_out",
+    "dangling",
+    "missing",
+]
+
+
+@pytest.fixture
+def workspace(monkeypatch, tmp_path, tmp_path_factory):
+    outside = tmp_path_factory.mktemp("outside")
+    root = tmp_path / "root"
+    (root / "a" / "b").mkdir(parents=True)
+    (root / "a" / ".hidden").mkdir()
+    (root / "a" / "b" / "c.txt").write_text("x")
+    (root / "link_in").symlink_to(root / "a", target_is_directory=True)
+    (root / "a" / "link_out").symlink_to(outside, target_is_directory=True)
+    (root / "a" / "b" / "dangling").symlink_to(root / "nowhere")
+    (root / "a" / "b" / "link_in").symlink_to("../..", target_is_directory=True)
+    monkeypatch.chdir(root)
+    return root
+
+
+def _random_paths(root, count, seed=1234):
+    rng = random.Random(seed)
+    for _ in range(count):
+        parts = [rng.choice(_COMPONENTS) for _ in range(rng.randint(1, 6))]
+        path = "/".join(parts)
+        prefix = rng.random()
+        if prefix < 0.15:
+            path = f"{root}/{path}"
+        elif prefix < 0.2:
+            path = f"/etc/{path}"
+        elif prefix < 0.25:
+            path = f"{root.parent}/{path}"
+        elif prefix < 0.3:
+            path += "/"
+        yield path
+
+
+def test_verdicts_match_reference(workspace):
+    paths = list(_random_paths(workspace, 3000))
+    policy = PathPolicy(workspace)
+
+    mismatches = [p for p in paths if policy.allows(p) != _reference_can_access_path(p)]
+
+    assert mismatches == []
+    # Both verdicts actually occur.
+    assert {_reference_can_access_path(p) for p in paths} == {True, False}
+
+
+def test_cached_verdicts_match_reference(workspace):
+    # The same paths checked repeatedly through the shared policy.
+    paths = list(_random_paths(workspace, 500, seed=99)) * 3
+
+    assert [can_access_path(p) for p in paths] == [
+        _reference_can_access_path(p) for p in paths
+    ]
+
+
+def test_allow_and_deny_globs(monkeypatch, workspace):
+    monkeypatch.setenv("OCLA_PATH_ALLOW", "a/.hidden, ../*")
+    monkeypatch.setenv("OCLA_PATH_DENY", "a/b/*.txt")
+    reload_config()
+
+    assert can_access_path("a/.hidden/notes.md")
+    assert not can_access_path("a/b/c.txt")
+    assert not can_access_path("link_in/b/c.txt")
+    assert can_access_path("a/b")
+    # Allow globs never reach outside the workspace.
+    assert not can_access_path("../other")
+    assert not can_access_path("a/link_out/x")
+
+
+def test_policy_follows_working_directory(monkeypatch, workspace):
+    assert can_access_path("a/b")
+
+    monkeypatch.chdir(workspace / "a")
+
+    assert not can_access_path("../missing")
+    assert can_access_path("../link_in")
+    assert can_access_path("b/c.txt")
@@ -0,0 +1,81 @@
+import time
+from io import StringIO
+
+import pytest
+
+import ocla.cli
+from ocla.cli import main as cli_main
+from ocla.config import reload_config
+from ocla.session import Session, _get_token_encoder
+from ocla.symbols import find_symbols
+
+from .helpers import StubOllama
+
+
+@pytest.fixture
+def stub(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    server = StubOllama()
+    monkeypatch.setenv("OCLA_OLLAMA_HOST", server.url)
+    monkeypatch.setenv("OCLA_MODEL", "qwen3")
+    monkeypatch.setenv("OCLA_PROMPT_MODE", "oneshot")
+    monkeypatch.setattr("sys.stdin", StringIO(""))
+    reload_config()
+    yield server
+    server.close()
+
+
+def _wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def test_prefetches_while_prompting(monkeypatch, stub, tmp_path, caplog):
+    caplog.set_level("DEBUG")
+    (tmp_path / "shapes.py").write_text("class Square:\n    pass\n")
+    _get_token_encoder.cache_clear()
+
+    def prompt(message):
+        # All of this happens before anything has been typed.
+        assert _wait_for(
+            lambda: {"/api/ps", "/api/show", "/api/generate"} <= set(stub.paths)
+        )
+        assert _wait_for(lambda: _get_token_encoder.cache_info().currsize > 0)
+        assert _wait_for(
+            lambda: any("prefetched session" in r.getMessage() for r in caplog.records)
+        )
+        assert _wait_for(lambda: bool(find_symbols("Square")))
+        return "ping"
+
+    monkeypatch.setattr(ocla.cli, "interactive_prompt", prompt)
+
+    cli_main([])
+
+    assert stub.requests[-1][0] == "/api/chat"
+    assert any("Time to first token" in r.getMessage() for r in caplog.records)
+    # The prefetched session is the one the prompt went to.
+    session = Session(ocla.cli.get_current_session_name())
+    assert [m["content"] for m in session.messages[-2:]] == ["ping", "pong"]
+
+
+def test_prefetch_disabled(monkeypatch, stub):
+    monkeypatch.setenv("OCLA_PREFETCH", "disabled")
+    monkeypatch.setenv("OCLA_WARM_UP", "disabled")
+    reload_config()
+    seen = []
+
+    def prompt(message):
+        time.sleep(0.2)
+        seen.extend(stub.paths)
+        return "ping"
+
+    monkeypatch.setattr(ocla.cli, "interactive_prompt", prompt)
+
+    cli_main([])
+
+    assert seen == []
+    assert stub.requests[-1][0] == "/api/chat"
@@ -0,0 +1,75 @@
+from ocla.pruning import prune_history
+
+
+def _call(name, **args):
+    return {"function": {"name": name, "arguments": args}}
+
+
+def _turn(prompt, call, output):
+    return [
+        {"role": "user", "content": prompt},
+        {"role": "assistant", "content": "", "tool_calls": [call]},
+        {"role": "tool", "name": call["function"]["name"], "content": output},
+        {"role": "assistant", "content": "done"},
+    ]
+
+
+def _tokens(messages):
+    return [len(str(m.get("content") or "").split()) for m in messages]
+
+
+_BIG = "line of file content " * 50
+
+
+def test_old_tool_results_pruned():
+    messages = [{"role": "system", "content": "sys"}]
+    messages += _turn("one", _call("read_file", path="a.py"), _BIG)
+    messages += _turn("two", _call("list_files", path="src"), _BIG)
+    messages += _turn("three", _call("git_log"), _BIG)
+
+    result = prune_history(messages, _tokens(messages), after_turns=2)
+
+    assert result.pruned == [3]
+    assert "pruned" in result.messages[3]["content"]
+    assert result.messages[3]["name"] == "read_file"
+    assert result.messages[7]["content"] == _BIG
+    assert result.tokens_saved > 0
+    # The history itself is untouched.
+    assert messages[3]["content"] == _BIG
+
+
+def test_superseded_file_reads_pruned():
+    messages = [{"role": "system", "content": "sys"}]
+    messages += _turn("one", _call("read_file", path="a.py"), _BIG)
+    messages += _turn("two", _call("read_file", path="./a.py"), _BIG)
+    messages += _turn("three", _call("read_file", path="b.py"), _BIG)
+
+    result = prune_history(messages, _tokens(messages), after_turns=10)
+
+    assert result.pruned == [3]
+    assert "message #7" in result.messages[3]["content"]
+
+
+def test_small_results_and_disabled_pruning_kept():
+    messages = [{"role": "system", "content": "sys"}]
+    messages += _turn("one", _call("write_file", path="a.py", new_content="x"), "ok")
+    messages += _turn("two", _call("read_file", path="a.py"), _BIG)
+
+    assert prune_history(messages, _tokens(messages), after_turns=1).pruned == []
+    assert (
+        prune_history(messages, _tokens(messages), after_turns=0).messages is messages
+    )
+
+
+def test_file_windows_kept_until_file_written():
+    messages = [{"role": "system", "content": "sys"}]
+    messages += _turn("one", _call("read_file", path="a.py", offset=1), _BIG)
+    messages += _turn("two", _call("read_file", path="a.py", offset=200), _BIG)
+
+    assert prune_history(messages, _tokens(messages), after_turns=10).pruned == []
+
+    messages += _turn("three", _call("write_file", path="a.py", new_content="x"), "ok")
+
+    result = prune_history(messages, _tokens(messages), after_turns=10)
+    assert result.pruned == [3, 7]
+    assert "message #11" in result.messages[3]["content"]
@@ -0,0 +1,158 @@
+import os
+
+import pytest
+
+from ocla.config import reload_config
+from ocla.pruning import prune_history
+from ocla.read_cache import ReadCache
+from ocla.tools.file_system import ReadFile
+
+
+def _call(**args):
+    return {"function": {"name": "read_file", "arguments": args}}
+
+
+def _tokens(messages):
+    return [len(str(m.get("content") or "").split()) for m in messages]
+
+
+class _History:
+    """Just enough of ado_chat to drive a ReadCache."""
+
+    def __init__(self):
+        self.cache = ReadCache()
+        self.messages = [{"role": "system", "content": "sys"}]
+        self.reads = 0
+
+    def _execute(self, call):
+        self.reads += 1
+        out, err = ReadFile().execute(**call["function"]["arguments"])
+        return err or out
+
+    def read(self, prompt="read it", **args):
+        self.messages.append({"role": "user", "content": prompt})
+        call = _call(**args)
+        self.messages.append({"role": "assistant", "content": "", "tool_calls": [call]})
+        output = self.cache.execute(call, self._execute, self._visible)
+        result = {"role": "tool", "name": "read_file", "content": output}
+        self.messages.append(result)
+        self.cache.record(call, len(self.messages) - 1, result)
+        return output
+
+    def _visible(self, index, message):
+        return index < len(self.messages) and self.messages[index] is message
+
+
+def _touch(path, content=None):
+    if content is not None:
+        path.write_text(content)
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+
+@pytest.fixture
+def history(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "a.py").write_text("".join(f"line {i}\n" for i in range(1, 41)))
+    return _History()
+
+
+def test_unchanged_reread_refers_back(history, tmp_path):
+    full = history.read(path="a.py")
+    assert "line 40" in full
+
+    assert history.read(path="a.py") == (
+        "[unchanged since message #3: a.py reads the same as it did there.]"
+    )
+    # Served without reading the file again.
+    assert history.reads == 1
+
+    # A touched file is read, but its content is still the same.
+    _touch(tmp_path / "a.py")
+    assert history.read(path="./a.py").startswith("[unchanged since message #6")
+    assert history.reads == 2
+
+    # A different window is a different call.
+    assert history.read(path="a.py", offset=2) != full
+
+
+def test_changed_file_returns_diff(history, tmp_path):
+    history.read(path="a.py")
+    path = tmp_path / "a.py"
+    _touch(path, path.read_text().replace("line 20\n", "line twenty\n"))
+
+    out = history.read(path="a.py")
+
+    lines = out.splitlines()
+    assert lines[0] == (
+        "[changed since message #3: a.py was modified. Apply this diff to the result there.]"
+    )
+    assert "-line 20" in lines and "+line twenty" in lines
+    assert "line 5" not in out
+
+    # A rewrite costs more as a diff than as the file itself.
+    _touch(path, "short\n")
+    assert history.read(path="a.py").strip().endswith("short")
+
+
+def test_invalidations_are_logged(history, tmp_path, caplog):
+    caplog.set_level("DEBUG")
+    history.read(path="a.py")
+    _touch(tmp_path / "a.py", "new\n")
+    history.read(path="a.py")
+
+    assert any("invalidated a.py" in r.getMessage() for r in caplog.records)
+
+
+def test_pruned_result_is_read_again(history, monkeypatch):
+    history.read(path="a.py")
+    # Compaction rewrote the history, so message #3 is not what was stored.
+    history.messages[3] = dict(history.messages[3])
+
+    assert "line 40" in history.read(path="a.py")
+
+    monkeypatch.setenv("OCLA_DEDUPE_FILE_READS", "disabled")
+    reload_config()
+    assert "line 40" in history.read(path="a.py")
+
+
+def test_pruning_keeps_referenced_results(history):
+    history.read("one", path="a.py")
+    history.read("two", path="a.py")
+    history.read("three", path="a.py")
+
+    result = prune_history(history.messages, _tokens(history.messages), after_turns=1)
+
+    # The first read is old, but the references chain back to it.
+    assert result.pruned == []
+    assert "line 40" in result.messages[3]["content"]
+
+    # A full read supersedes the references and what they pointed to.
+    history.messages.append({"role": "user", "content": "four"})
+    history.messages.append(
+        {"role": "assistant", "content": "", "tool_calls": [_call(path="a.py")]}
+    )
+    history.messages.append(
+        {"role": "tool", "name": "read_file", "content": history.messages[3]["content"]}
+    )
+
+    result = prune_history(history.messages, _tokens(history.messages), after_turns=10)
+    assert result.pruned == [3]
+
+
+def test_references_renumbered_after_compaction(history):
+    history.read("one", path="a.py")
+    history.read("two", path="a.py")
+    assert history.messages[-1]["content"].startswith("[unchanged since message #3")
+
+    # Compaction summarised the first prompt away, shifting what followed.
+    compacted = history.messages[:1] + history.messages[2:]
+
+    result = prune_history(compacted, _tokens(compacted), after_turns=0)
+    assert result.messages[-1]["content"].startswith("[unchanged since message #2")
+    assert compacted[-1]["content"].startswith("[unchanged since message #3")
+
+    # Once the referenced result is gone, the reference is stubbed.
+    gone = history.messages[:1] + history.messages[4:]
+    result = prune_history(gone, _tokens(gone), after_turns=0)
+    assert "the result it refers to is gone" in result.messages[-1]["content"]
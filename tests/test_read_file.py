@@ -0,0 +1,85 @@
+import pytest
+
+import ocla.tools.file_system as fs
+from ocla.config import reload_config
+from ocla.tools.file_system import ReadFile
+
+
+@pytest.fixture
+def workdir(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def test_small_file_read_whole(workdir):
+    (workdir / "a.txt").write_text("one\ntwo\n")
+    assert ReadFile().execute("a.txt") == ("one\ntwo\n", "")
+
+
+def test_line_range(workdir):
+    (workdir / "a.txt").write_text("".join(f"line {i}\n" for i in range(1, 11)))
+
+    out, err = ReadFile().execute("a.txt", offset=3, limit=2)
+
+    assert err == ""
+    assert out.startswith("line 3\nline 4\n")
+    assert "offset=5" in out
+
+    assert ReadFile().execute("a.txt", offset=20)[1] == "a.txt has fewer than 20 lines"
+
+
+def test_byte_cap_marks_next_window(monkeypatch, workdir):
+    monkeypatch.setenv("OCLA_READ_FILE_MAX_BYTES", "40")
+    reload_config()
+    (workdir / "a.txt").write_text("".join(f"line {i:02}\n" for i in range(1, 21)))
+
+    out, _ = ReadFile().execute("a.txt")
+
+    # Only whole lines are returned, then the marker says where to continue.
+    assert out.startswith("line 01\nline 02\nline 03\nline 04\nline 05\n[")
+    assert "lines 1-5" in out and "offset=6" in out
+
+    out, _ = ReadFile().execute("a.txt", offset=6)
+    assert out.startswith("line 06\n")
+
+
+def test_overlong_line_cut(monkeypatch, workdir):
+    monkeypatch.setenv("OCLA_READ_FILE_MAX_BYTES", "10")
+    reload_config()
+    (workdir / "a.txt").write_text("x" * 50 + "\nnext\n")
+
+    out, _ = ReadFile().execute("a.txt")
+
+    assert out.startswith("x" * 10 + "\n[line 1 is longer")
+    assert "offset=2" in out
+
+
+def test_binary_file_detected(workdir):
+    (workdir / "a.bin").write_bytes(b"\x89PNG\r\n\x1a\n\0\0\0")
+
+    out, err = ReadFile().execute("a.bin")
+
+    assert out == ""
+    assert "binary" in err
+
+
+def test_large_file_memory_mapped(monkeypatch, workdir):
+    monkeypatch.setattr(fs, "_MMAP_MIN_SIZE", 1)
+    monkeypatch.setattr(fs, "_SCAN_BLOCK", 16)
+    (workdir / "a.txt").write_text("".join(f"line {i}\n" for i in range(1, 1001)))
+
+    out, _ = ReadFile().execute("a.txt", offset=998)
+
+    assert out == "line 998\nline 999\nline 1000\n"
+
+
+def test_utf16_file(workdir):
+    (workdir / "a.txt").write_text(
+        "".join(f"línea {i}\n" for i in range(1, 6)), "utf-16"
+    )
+
+    out, err = ReadFile().execute("a.txt", encoding="utf-16", offset=2, limit=2)
+
+    assert err == ""
+    assert out.startswith("línea 2\nlínea 3\n[")
+    assert ReadFile().execute("a.txt", encoding="nope")[1] == "Unknown encoding: nope"
@@ -0,0 +1,100 @@
+import pytest
+
+import ocla.tools.search as search
+from ocla.config import reload_config
+from ocla.tools.search import SearchCode
+
+
+@pytest.fixture
+def tree(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    files = {
+        "src/app.py": "import os\n\ndef main():\n    return os.getcwd()\n",
+        "src/util.py": "def helper():\n    pass\n\n\ndef Main_loop():\n    pass\n",
+        "build/gen.py": "def main():\n    pass\n",
+        ".venv/lib.py": "def main():\n    pass\n",
+        "notes.md": "call main() from app.py\n",
+    }
+    for rel, content in files.items():
+        (tmp_path / rel).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / rel).write_text(content)
+    (tmp_path / "blob.bin").write_bytes(b"main\0\0\0")
+    (tmp_path / ".gitignore").write_text("build/\n")
+    return tmp_path
+
+
+def test_regex_search_with_context(tree):
+    out, err = SearchCode().execute(r"def \w+\(", path="src", context=1)
+
+    assert err == ""
+    assert out.splitlines() == [
+        "src/app.py-2-",
+        "src/app.py:3:def main():",
+        "src/app.py-4-    return os.getcwd()",
+        "src/util.py:1:def helper():",
+        "src/util.py-2-    pass",
+        "--",
+        "src/util.py-4-",
+        "src/util.py:5:def Main_loop():",
+        "src/util.py-6-    pass",
+    ]
+
+
+def test_literal_ignore_case_and_glob(tree):
+    out, _ = SearchCode().execute("main(", literal=True, ignore_case=True, context=0)
+
+    # Gitignored, hidden and binary files are skipped.
+    assert out.splitlines() == [
+        "notes.md:1:call main() from app.py",
+        "src/app.py:3:def main():",
+    ]
+
+    out, _ = SearchCode().execute("main", glob="*.py", context=0)
+    assert out.splitlines() == ["src/app.py:3:def main():"]
+
+
+def test_results_capped(monkeypatch, tree):
+    monkeypatch.setenv("OCLA_SEARCH_MAX_RESULTS", "2")
+    reload_config()
+
+    out, _ = SearchCode().execute("def|pass", context=0, max_results=10)
+
+    lines = out.splitlines()
+    assert lines[:2] == ["src/app.py:3:def main():", "src/util.py:1:def helper():"]
+    assert lines[2].startswith("[stopped after 2 matches")
+
+
+def test_errors_and_no_matches(monkeypatch, tree):
+    assert SearchCode().execute("(")[1].startswith("Invalid regular expression")
+    assert SearchCode().execute("x", path=".venv")[1] == "OCLA cannot access: .venv"
+    assert SearchCode().execute("nothing here")[0] == "no matches in 4 files"
+
+    monkeypatch.setenv("OCLA_PATH_DENY", "src/util.py")
+    reload_config()
+    assert "util.py" not in SearchCode().execute("def")[0]
+
+
+def test_process_pool_matches_in_process(monkeypatch, tree):
+    for i in range(10):
+        (tree / "src" / f"mod{i}.py").write_text(
+            f"x = {i}\ndef f{i}():\n    return x\n"
+        )
+    expected = SearchCode().execute(r"def f\d", context=1)
+
+    monkeypatch.setattr(search, "_POOL_MIN_FILES", 0)
+    monkeypatch.setattr(search, "_CHUNK_SIZE", 3)
+
+    assert SearchCode().execute(r"def f\d", context=1) == expected
+    assert SearchCode().execute(r"def f\d", max_results=4)[0].count(":def f") == 4
+
+
+def test_process_pool_follows_working_directory(monkeypatch, tmp_path):
+    monkeypatch.setattr(search, "_POOL_MIN_FILES", 0)
+    for project in ("one", "two"):
+        (tmp_path / project).mkdir()
+        (tmp_path / project / "app.py").write_text(f"name = '{project}'\n")
+
+    for project in ("one", "two"):
+        monkeypatch.chdir(tmp_path / project)
+        out, err = SearchCode().execute("name =", context=0)
+        assert (out, err) == (f"app.py:1:name = '{project}'", "")
@@ -0,0 +1,87 @@
+import os
+import sqlite3
+
+import ocla.session
+from ocla.config import reload_config
+from ocla.session import (
+    Session,
+    list_sessions,
+    count_sessions,
+    reindex_sessions,
+    session_exists,
+)
+from ocla.catalog import catalog_path
+
+
+def test_catalog_tracks_saves(monkeypatch, tmp_path):
+    monkeypatch.setenv("OCLA_SESSION_DIR", str(tmp_path))
+    reload_config()
+    for name in ("a", "b", "c"):
+        Session(name).save()
+
+    # Listing and existence checks must not need the .meta files.
+    monkeypatch.setattr(
+        "ocla.session.load_session_meta",
+        lambda name: (_ for _ in ()).throw(AssertionError("scanned .meta")),
+    )
+
+    assert session_exists("b")
+    assert not session_exists("missing")
+    assert [s.name for s in list_sessions()] == ["c", "b", "a"]
+    assert [s.name for s in list_sessions(limit=1, offset=1)] == ["b"]
+    assert count_sessions() == 3
+
+
+def test_catalog_rebuild(monkeypatch, tmp_path):
+    monkeypatch.setenv("OCLA_SESSION_DIR", str(tmp_path))
+    reload_config()
+    Session("a").add({"role": "user", "content": "hi"})
+    Session("b").save()
+
+    os.remove(catalog_path())
+    assert count_sessions() == 2  # missing catalog is rebuilt from .meta files
+
+    # Drift: a session removed by hand is dropped by an explicit reindex.
+    os.remove(tmp_path / "b.meta")
+    assert reindex_sessions() == 1
+    assert [s.name for s in list_sessions()] == ["a"]
+    assert list_sessions()[0].tokens == Session("a").tokens
+
+
+def test_deleted_session_does_not_exist(monkeypatch, tmp_path):
+    monkeypatch.setenv("OCLA_SESSION_DIR", str(tmp_path))
+    reload_config()
+    Session("a").save()
+
+    os.remove(tmp_path / "a.meta")
+
+    assert not session_exists("a")
+    assert count_sessions() == 0  # and the stale entry is gone
+
+
+def test_unreadable_catalog_falls_back_to_meta_files(monkeypatch, tmp_path):
+    monkeypatch.setenv("OCLA_SESSION_DIR", str(tmp_path))
+    reload_config()
+    for name in ("a", "b"):
+        Session(name).save()
+
+    def broken():
+        raise sqlite3.DatabaseError("file is not a database")
+
+    monkeypatch.setattr("ocla.catalog._connect", broken)
+
+    assert session_exists("a")
+    assert not session_exists("missing")
+    assert [s.name for s in list_sessions()] == ["b", "a"]
+    assert [s.name for s in list_sessions(limit=1, offset=1)] == ["a"]
+    assert count_sessions() == 2
+
+
+def test_meta_fallback_with_empty_session_dir(monkeypatch, tmp_path):
+    monkeypatch.setenv("OCLA_SESSION_DIR", str(tmp_path))
+    reload_config()
+    Session("a").save()
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(ocla.session.SESSION_DIR, "get", lambda: "")
+
+    assert [s.name for s in ocla.session._sessions_from_meta()] == ["a"]
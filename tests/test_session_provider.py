@@ -1,5 +1,6 @@
 import os
 import pytest
+from ocla.config import reload_config
 from ocla.session import Session, ProviderMismatchError
 
 
@@ -7,11 +8,13 @@ def test_provider_mismatch(monkeypatch, tmp_path):
     monkeypatch.setenv("OCLA_SESSION_DIR", str(tmp_path))
     # create session with default provider 'ollama'
     monkeypatch.setenv("OCLA_PROVIDER", "ollama")
+    reload_config()
     s = Session("p1")
     s.add({"role": "user", "content": "hi"})
 
     # now switch provider and expect error when loading
     monkeypatch.setenv("OCLA_PROVIDER", "openai")
+    reload_config()
     with pytest.raises(ProviderMismatchError):
         Session("p1")
 
@@ -1,5 +1,7 @@
 import os
 import pytest
+from ocla.config import reload_config
+from ocla.journal import is_journal
 from ocla.session import Session
 
 
@@ -7,12 +9,14 @@ def _roundtrip(monkeypatch, tmp_path, write_mode, read_mode=None):
     """Write a session using *write_mode* then read it back in *read_mode*."""
     monkeypatch.setenv("OCLA_SESSION_DIR", str(tmp_path))
     monkeypatch.setenv("OCLA_SESSION_STORAGE_MODE", write_mode)
+    reload_config()
 
     s = Session("test")
     s.add({"role": "user", "content": "hello"})
 
     if read_mode:
         monkeypatch.setenv("OCLA_SESSION_STORAGE_MODE", read_mode)
+        reload_config()
 
     s2 = Session("test")
     assert s2.messages[-1]["content"] == "hello"
@@ -29,3 +33,80 @@ def test_session_compress(monkeypatch, tmp_path):
 def test_mode_switch(monkeypatch, tmp_path):
     """Sessions encoded in one mode can be read after changing the config."""
     _roundtrip(monkeypatch, tmp_path, "PLAIN", read_mode="COMPRESS")
+
+
+def test_session_journal(monkeypatch, tmp_path):
+    _roundtrip(monkeypatch, tmp_path, "JOURNAL")
+
+
+def test_session_journal_compress(monkeypatch, tmp_path):
+    _roundtrip(monkeypatch, tmp_path, "JOURNAL_COMPRESS")
+
+
+def test_migrate_to_journal(monkeypatch, tmp_path):
+    """Existing COMPRESS sessions are rewritten as a journal on next save."""
+    _roundtrip(monkeypatch, tmp_path, "COMPRESS", read_mode="JOURNAL")
+
+    s = Session("test")
+    s.add({"role": "user", "content": "again"})
+    assert is_journal((tmp_path / "test.session").read_bytes())
+
+    s2 = Session("test")
+    assert [m["content"] for m in s2.messages[-2:]] == ["hello", "again"]
+
+
+def test_journal_appends_only_new_messages(monkeypatch, tmp_path):
+    monkeypatch.setenv("OCLA_SESSION_DIR", str(tmp_path))
+    monkeypatch.setenv("OCLA_SESSION_STORAGE_MODE", "JOURNAL")
+    reload_config()
+
+    s = Session("test")
+    s.add({"role": "user", "content": "hello"})
+    before = (tmp_path / "test.session").read_bytes()
+
+    s.add({"role": "user", "content": "world"})
+    after = (tmp_path / "test.session").read_bytes()
+
+    assert after.startswith(before)
+    assert after[len(before) :].count(b"\n") == 1
+
+
+def test_journal_torn_tail_recovered(monkeypatch, tmp_path):
+    monkeypatch.setenv("OCLA_SESSION_DIR", str(tmp_path))
+    monkeypatch.setenv("OCLA_SESSION_STORAGE_MODE", "JOURNAL")
+    reload_config()
+
+    s = Session("test")
+    s.add({"role": "user", "content": "hello"})
+    path = tmp_path / "test.session"
+    intact = path.read_bytes()
+
+    # Simulate a crash part way through appending a record.
+    with open(path, "ab") as f:
+        f.write(b'{"op":"append","message":{"role":"us')
+
+    s2 = Session("test")
+    assert s2.messages[-1]["content"] == "hello"
+    assert path.read_bytes() == intact
+
+    s2.add({"role": "user", "content": "world"})
+    assert Session("test").messages[-1]["content"] == "world"
+
+
+def test_journal_replace_and_compact(monkeypatch, tmp_path):
+    monkeypatch.setenv("OCLA_SESSION_DIR", str(tmp_path))
+    monkeypatch.setenv("OCLA_SESSION_STORAGE_MODE", "JOURNAL")
+    reload_config()
+
+    s = Session("test")
+    s.add({"role": "user", "content": "hello"})
+    s.replace_messages(s.messages[:1] + [{"role": "user", "content": "replaced"}])
+    s.save()
+
+    s2 = Session("test")
+    assert [m["content"] for m in s2.messages[1:]] == ["replaced"]
+
+    s2.compact_storage()
+    lines = (tmp_path / "test.session").read_bytes().splitlines()
+    assert len(lines) == 1 + len(s2.messages)
+    assert Session("test").messages == s2.messages
@@ -1,9 +1,12 @@
 import os
+import ocla.session
+from ocla.config import reload_config
 from ocla.session import Session, list_sessions
 
 
 def test_session_token_count(monkeypatch, tmp_path):
     monkeypatch.setenv("OCLA_SESSION_DIR", str(tmp_path))
+    reload_config()
     s = Session("t1")
     s.add({"role": "user", "content": "hello world"})
 
@@ -13,3 +16,41 @@ def test_session_token_count(monkeypatch, tmp_path):
 
     infos = list_sessions()
     assert infos[0].tokens == s2.token_count()
+
+
+def test_session_token_ledger_persisted(monkeypatch, tmp_path):
+    monkeypatch.setenv("OCLA_SESSION_DIR", str(tmp_path))
+    reload_config()
+    s = Session("t2")
+    s.add({"role": "user", "content": "hello world"})
+    assert len(s.message_tokens) == len(s.messages)
+    assert sum(s.message_tokens) == s.token_count()
+
+    calls = []
+    real = ocla.session._estimate_tokens
+    monkeypatch.setattr(
+        "ocla.session._estimate_tokens",
+        lambda *a, **kw: calls.append(a) or real(*a, **kw),
+    )
+
+    # Reloading with the same model reuses the stored ledger.
+    s2 = Session("t2")
+    assert calls == []
+    assert s2.message_tokens == s.message_tokens
+
+    # Appending only counts the new message.
+    s2.add({"role": "user", "content": "again"})
+    assert len(calls) == 1
+
+
+def test_session_token_ledger_recounted_on_model_change(monkeypatch, tmp_path):
+    monkeypatch.setenv("OCLA_SESSION_DIR", str(tmp_path))
+    reload_config()
+    s = Session("t3")
+    s.add({"role": "user", "content": "hello world"})
+
+    monkeypatch.setenv("OCLA_MODEL", "some-other-model")
+    reload_config()
+    s2 = Session("t3")
+    assert s2.tokenizer != s.tokenizer
+    assert len(s2.message_tokens) == len(s2.messages)
@@ -0,0 +1,61 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+# Modules that must not be imported by commands that never talk to a model.
+_PROVIDER_MODULES = {"ollama", "openai", "tiktoken", "git", "httpx"}
+
+# (subcommand, modules it must not import, import time budget in milliseconds)
+_BUDGETS = [
+    (["session", "list"], _PROVIDER_MODULES, 400),
+    (["session", "set", "missing"], _PROVIDER_MODULES, 400),
+    (["config"], _PROVIDER_MODULES, 400),
+    (["tools"], {"openai", "tiktoken", "git"}, 1000),
+]
+
+
+def _import_profile(args: list[str], cwd) -> tuple[set[str], float]:
+    """Run `ocla <args>` under -X importtime; return top-level modules & import ms."""
+    env = dict(os.environ, OCLA_DISABLE_INIT_CHECK="1")
+    src = os.path.join(os.path.dirname(os.path.dirname(__file__)), "src")
+    env["PYTHONPATH"] = os.pathsep.join([src, env.get("PYTHONPATH", "")])
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "from ocla.cli import main; main()"]
+        + args,
+        cwd=cwd,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+
+    modules = set()
+    total_us = 0
+    after_site = False
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, _, name = line.removeprefix("import time:").split("|")
+        name = name.strip()
+        modules.add(name.split(".")[0])
+        # Only count imports caused by ocla, not interpreter start up.
+        if after_site:
+            total_us += int(self_us)
+        if name == "site":
+            after_site = True
+
+    return modules, total_us / 1000
+
+
+@pytest.mark.parametrize("args,forbidden,budget_ms", _BUDGETS)
+def test_cold_start_budget(args, forbidden, budget_ms, tmp_path):
+    modules, import_ms = _import_profile(args, tmp_path)
+
+    assert "ocla" in modules
+    assert not (
+        modules & forbidden
+    ), f"ocla {' '.join(args)} imported {modules & forbidden}"
+    assert (
+        import_ms < budget_ms
+    ), f"ocla {' '.join(args)} spent {import_ms:.0f}ms importing"
@@ -0,0 +1,155 @@
+import os
+
+import pytest
+
+import ocla.symbols
+from ocla.config import reload_config
+from ocla.symbols import extract_symbols, find_symbols, update_index
+from ocla.tools.symbols import FileOutline, FindSymbol
+
+_PY = """
+class Session(Base):
+    def save(self) -> None:
+        pass
+
+    class Meta:
+        def load(self):
+            pass
+
+
+async def fetch(url, *, timeout=3):
+    def inner():
+        pass
+"""
+
+
+@pytest.fixture
+def workspace(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv(
+        "OCLA_SYMBOL_INDEX_FILE", str(tmp_path / ".ocla" / "symbols.sqlite3")
+    )
+    reload_config()
+    (tmp_path / "pkg").mkdir()
+    (tmp_path / "pkg" / "session.py").write_text(_PY)
+    (tmp_path / "web.ts").write_text(
+        "export class Store {}\nexport async function loadStore() {}\nconst save = (x) => x\n"
+    )
+    (tmp_path / "ignored").mkdir()
+    (tmp_path / "ignored" / "gen.py").write_text("def save(): pass\n")
+    (tmp_path / ".gitignore").write_text("ignored/\n")
+    return tmp_path
+
+
+def test_python_symbols():
+    symbols = extract_symbols("x.py", _PY)
+
+    assert [(s.qualified_name(), s.kind, s.line) for s in symbols] == [
+        ("Session", "class", 2),
+        ("Session.save", "method", 3),
+        ("Session.Meta", "class", 6),
+        ("Session.Meta.load", "method", 7),
+        ("fetch", "function", 11),
+        ("fetch.inner", "function", 12),
+    ]
+    assert symbols[0].signature == "class Session(Base)"
+    assert symbols[1].signature == "def save(self) -> None"
+    assert symbols[4].signature == "async def fetch(url, *, timeout=3)"
+    assert symbols[0].end_line == 8
+
+
+def test_fallback_symbols():
+    broken = extract_symbols("x.py", "def ok():\n    pass\nclass Broken(:\n")
+    assert [(s.name, s.line) for s in broken] == [("ok", 1), ("Broken", 3)]
+
+    go = extract_symbols(
+        "x.go", "package x\n\nfunc (s *Server) Serve() {}\ntype Server struct {}\n"
+    )
+    assert [(s.name, s.kind) for s in go] == [
+        ("Serve", "function"),
+        ("Server", "class"),
+    ]
+
+
+def test_index_updates_incrementally(workspace):
+    assert update_index().parsed == 2
+    assert update_index().parsed == 0
+
+    path = workspace / "pkg" / "session.py"
+    path.write_text(_PY + "\ndef extra():\n    pass\n")
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    stats = update_index()
+    assert (stats.files, stats.parsed) == (2, 1)
+    assert "pkg/session.py" in FindSymbol().execute("extra")[0]
+
+    (workspace / "web.ts").unlink()
+    assert update_index().removed == 1
+    assert FindSymbol().execute("Store")[0] == "no symbol named Store"
+
+
+def test_find_symbol(workspace):
+    out, err = FindSymbol().execute("save")
+    assert err == ""
+    # The gitignored definition is not indexed.
+    assert out.splitlines() == [
+        "pkg/session.py:3-4 method (in Session): def save(self) -> None",
+        "web.ts:3 function: const save = (x) => x",
+    ]
+
+    assert FindSymbol().execute("Meta.load")[0].startswith("pkg/session.py:7-8 method")
+    assert FindSymbol().execute("save", kind="class")[0] == "no symbol named save"
+    # Falls back to names containing the query.
+    assert FindSymbol().execute("loadst")[0].startswith("web.ts:2 function")
+
+
+def test_file_outline(workspace):
+    out, err = FileOutline().execute("pkg/session.py")
+
+    assert err == ""
+    assert out.splitlines() == [
+        "2-8 class: class Session(Base)",
+        "  3-4 method (in Session): def save(self) -> None",
+        "  6-8 class (in Session): class Meta",
+        "    7-8 method (in Session.Meta): def load(self)",
+        "11-13 function: async def fetch(url, *, timeout=3)",
+        "  12-13 function (in fetch): def inner()",
+    ]
+    assert FileOutline().execute(".gitignore")[1] == "OCLA cannot access: .gitignore"
+
+
+def test_recent_walk_reused(monkeypatch, workspace):
+    walks = []
+    real_walk = ocla.symbols.walk
+    monkeypatch.setattr(
+        ocla.symbols, "walk", lambda root: walks.append(root) or real_walk(root)
+    )
+    clock = [1000.0]
+    monkeypatch.setattr(ocla.symbols.time, "monotonic", lambda: clock[0])
+
+    assert update_index().parsed == 2
+    path = workspace / "pkg" / "session.py"
+    path.write_text(_PY + "\ndef extra():\n    pass\n")
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    (workspace / "new.py").write_text("def fresh(): pass\n")
+
+    # Changes to files already found are picked up without walking again...
+    assert "pkg/session.py" in FindSymbol().execute("extra")[0]
+    assert FindSymbol().execute("fresh")[0] == "no symbol named fresh"
+    assert len(walks) == 1
+
+    # ...and new files once the walk is old enough to repeat.
+    clock[0] += ocla.symbols._WALK_MAX_AGE
+    assert FindSymbol().execute("fresh")[0].startswith("new.py:1-1 function")
+    assert len(walks) == 2
+
+
+def test_file_outline_absolute_path(workspace):
+    path = workspace / "pkg" / "session.py"
+    out, err = FileOutline().execute(str(path))
+
+    assert err == ""
+    assert out.startswith("2-8 class: class Session(Base)")
+    # Indexed under the same path as a walk of the project would use.
+    assert [s.path for s in find_symbols("Session", "class")] == ["pkg/session.py"]
@@ -0,0 +1,69 @@
+import threading
+import time
+
+from ocla.tool_scheduler import run_tool_calls, SKIPPED_OUTPUT
+
+
+def _call(name, arg):
+    return {"id": f"{name}-{arg}", "function": {"name": name, "arguments": {"x": arg}}}
+
+
+def _run(calls, log, delay=0.1, allow=lambda call: True, max_workers=4):
+    lock = threading.Lock()
+
+    def execute(call):
+        name, arg = call["function"]["name"], call["function"]["arguments"]["x"]
+        with lock:
+            log.append(("start", name, arg))
+        time.sleep(delay)
+        with lock:
+            log.append(("end", name, arg))
+        return f"{name}:{arg}"
+
+    return run_tool_calls(
+        calls,
+        runs_unattended=lambda call: call["function"]["name"] == "read",
+        confirm=allow,
+        execute=execute,
+        max_workers=max_workers,
+    )
+
+
+def test_read_only_calls_overlap_and_keep_order():
+    log = []
+    calls = [_call("read", i) for i in range(5)]
+    batch = _run(calls, log)
+
+    assert [r.call["id"] for r in batch.runs] == [c["id"] for c in calls]
+    assert [r.output for r in batch.runs] == [f"read:{i}" for i in range(5)]
+    assert batch.elapsed < batch.sequential_elapsed / 2
+
+
+def test_writes_are_barriers():
+    log = []
+    calls = [_call("read", 0), _call("read", 1), _call("write", 2), _call("read", 3)]
+    batch = _run(calls, log)
+
+    write_start = log.index(("start", "write", 2))
+    write_end = log.index(("end", "write", 2))
+    assert log.index(("end", "read", 0)) < write_start
+    assert log.index(("end", "read", 1)) < write_start
+    assert log.index(("start", "read", 3)) > write_end
+    assert [r.output for r in batch.runs][2] == "write:2"
+
+
+def test_denied_calls_are_skipped():
+    log = []
+    calls = [_call("read", 0), _call("write", 1)]
+    batch = _run(calls, log, allow=lambda call: call["function"]["name"] == "read")
+
+    assert [r.output for r in batch.runs] == ["read:0", SKIPPED_OUTPUT]
+    assert ("start", "write", 1) not in log
+
+
+def test_single_worker_runs_in_turn():
+    log = []
+    calls = [_call("read", i) for i in range(3)]
+    _run(calls, log, delay=0, max_workers=1)
+
+    assert log == [(e, "read", i) for i in range(3) for e in ("start", "end")]
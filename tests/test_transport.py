@@ -0,0 +1,152 @@
+import asyncio
+
+import httpx
+import pytest
+
+from ocla.config import reload_config
+from ocla.providers import transport
+
+
+@pytest.fixture(autouse=True)
+def fresh_state(monkeypatch):
+    monkeypatch.setattr(transport, "_stats", {})
+    monkeypatch.setattr(transport, "_breakers", {})
+    monkeypatch.setattr(transport, "backoff", lambda attempt: 0.0)
+
+
+def _get(handler, retries=3):
+    inner = httpx.MockTransport(handler)
+    client = httpx.AsyncClient(
+        transport=transport._transport_class(httpx)(inner, retries)
+    )
+
+    async def get():
+        async with client:
+            return await client.get("http://model-host:1234/api/chat")
+
+    return asyncio.run(get())
+
+
+def test_retries_busy_host_honouring_retry_after(monkeypatch):
+    slept = []
+
+    async def sleep(delay):
+        slept.append(delay)
+
+    monkeypatch.setattr(transport.asyncio, "sleep", sleep)
+    statuses = iter([503, 429, 200])
+
+    response = _get(
+        lambda request: httpx.Response(next(statuses), headers={"Retry-After": "7"})
+    )
+
+    assert response.status_code == 200
+    assert slept == [7.0, 7.0]
+    s = transport.stats()["http://model-host:1234"]
+    assert (s.requests, s.retries, s.failures) == (3, 2, 1)
+
+
+def test_gives_up_after_retries():
+    attempts = []
+
+    def refuse(request):
+        attempts.append(request)
+        raise httpx.ConnectError("refused", request=request)
+
+    with pytest.raises(httpx.ConnectError) as e:
+        _get(refuse, retries=2)
+
+    assert len(attempts) == 3
+    assert transport._gave_up(e.value)
+
+    # The last status is returned once the retries are used up.
+    assert _get(lambda request: httpx.Response(502), retries=1).status_code == 502
+
+
+def test_circuit_opens_after_repeated_failures(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(transport.time, "monotonic", lambda: clock[0])
+    calls = []
+
+    def fail(request):
+        calls.append(request)
+        return httpx.Response(503)
+
+    _get(fail, retries=transport._BREAKER_THRESHOLD - 1)
+    assert len(calls) == transport._BREAKER_THRESHOLD
+
+    with pytest.raises(httpx.ConnectError, match="failed repeatedly"):
+        _get(fail, retries=0)
+    assert len(calls) == transport._BREAKER_THRESHOLD
+    assert transport.stats()["http://model-host:1234"].rejected == 1
+
+    # After the cooldown, one request probes the host and closes the circuit.
+    clock[0] += transport._BREAKER_COOLDOWN
+    assert _get(lambda request: httpx.Response(200), retries=0).status_code == 200
+    assert _get(lambda request: httpx.Response(200), retries=0).status_code == 200
+
+
+def test_retry_after():
+    assert transport.retry_after("2.5") == 2.5
+    assert transport.retry_after("86400") == transport._RETRY_AFTER_MAX
+    assert transport.retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert transport.retry_after("soon") is None
+    assert transport.retry_after(None) is None
+
+
+class _Broken(Exception):
+    pass
+
+
+def _stream(items, fail_after):
+    async def gen():
+        for i, item in enumerate(items):
+            if i == fail_after:
+                raise _Broken("connection reset")
+            yield item
+        if fail_after == len(items):
+            raise _Broken("connection reset")
+
+    async def open_stream():
+        return gen()
+
+    return open_stream
+
+
+def _collect(opens, monkeypatch, retries="3"):
+    monkeypatch.setenv("OCLA_PROVIDER_RETRIES", retries)
+    reload_config()
+    opens = iter(opens)
+
+    async def open_stream():
+        return await next(opens)()
+
+    async def collect():
+        return [
+            x async for x in transport.restart_until_first(open_stream, (_Broken,), "h")
+        ]
+
+    return asyncio.run(collect())
+
+
+def test_restarts_stream_broken_before_first_chunk(monkeypatch):
+    opens = [_stream(["a"], fail_after=0), _stream(["a", "b"], fail_after=None)]
+
+    assert _collect(opens, monkeypatch) == ["a", "b"]
+    assert transport.stats()["h"].restarts == 1
+
+
+def test_does_not_restart_after_first_chunk(monkeypatch):
+    opens = [_stream(["a", "b"], fail_after=1), _stream(["a", "b"], fail_after=None)]
+
+    with pytest.raises(_Broken):
+        _collect(opens, monkeypatch)
+    assert "h" not in transport.stats()
+
+
+def test_restarts_limited_by_provider_retries(monkeypatch):
+    opens = [_stream(["a"], fail_after=0)] * 2
+
+    with pytest.raises(_Broken):
+        _collect(opens, monkeypatch, retries="1")
+    assert transport.stats()["h"].restarts == 1